@@ -0,0 +1,159 @@
+"""
+Common functions of the benchmarks
+
+Results are stored by suite name in a baseline file. Smaller values are
+better for all metrics (e.g. time or memory), except for the throughput
+units (e.g. MB/s), for which larger values are better.
+"""
+from typing import Callable, Dict, List
+
+import json
+import os
+import platform
+import statistics
+import sys
+
+# Default baseline file
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Minimum differences by unit regarded as regressions
+MIN_DELTAS = {
+    "ms": 10.0,
+    "s": 0.05,
+    "KiB": 16.0,
+    "MB/s": 5.0,
+    "req/s": 20.0,
+}
+
+# Units of the metrics for which larger values are better
+THROUGHPUT_UNITS = ["MB/s", "req/s"]
+
+
+def median(function: Callable, repeat: int) -> float:
+    """Returns median of the values returned by the repeated calls of a function"""
+    return statistics.median(function() for _ in range(repeat))
+
+
+def get_environment() -> Dict:
+    """Returns information of the environment the results are measured in"""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+    }
+
+
+def load_baseline(path: str=BASELINE) -> Dict:
+    try:
+        with open(path, "r") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(suite: str, results: Dict, path: str=BASELINE) -> None:
+    """Saves results of a suite to the baseline file"""
+    baseline = load_baseline(path)
+    results = {name: {"value": round(result["value"], 3), "unit": result["unit"]} for name, result in results.items()}
+    baseline[suite] = {"environment": get_environment(), "results": results}
+    with open(path, "w") as file:
+        json.dump(baseline, file, indent=4, sort_keys=True)
+        file.write("\n")
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Returns regressions of the results against the baseline results.
+
+    Args:
+        results (Dict): Results by metric name, {"value": float, "unit": str}
+        baseline (Dict): Baseline results by metric name
+        tolerance (float): Allowed relative change (e.g. 0.2 for 20%)
+
+    Returns:
+        List of regression messages
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        value = result["value"]
+        base = baseline[name]["value"]
+        min_delta = MIN_DELTAS.get(result["unit"], 0)
+        if result["unit"] in THROUGHPUT_UNITS:
+            regressed = value < base * (1 - tolerance) and base - value > min_delta
+        else:
+            regressed = value > base * (1 + tolerance) and value - base > min_delta
+        if regressed:
+            regressions.append(f"{name}: {value:.2f} {result['unit']} (baseline {base:.2f} {result['unit']})")
+    return regressions
+
+
+def check_budgets(results: Dict, budgets: List[str]) -> List[str]:
+    """Returns metrics exceeding their budgets.
+
+    Args:
+        results (Dict): Results by metric name
+        budgets (List[str]): Budgets as "name=value" in the units of the
+            metrics, minimum values for the throughput units
+
+    Returns:
+        List of budget violation messages
+    """
+    violations = []
+    for budget in budgets or []:
+        name, _, value = budget.partition("=")
+        if name not in results:
+            raise ValueError(f"Unknown metric: {name}")
+        if results[name]["unit"] in THROUGHPUT_UNITS:
+            exceeded = results[name]["value"] < float(value)
+        else:
+            exceeded = results[name]["value"] > float(value)
+        if exceeded:
+            violations.append(f"{name}: {results[name]['value']:.2f} {results[name]['unit']} (budget {value})")
+    return violations
+
+
+def report(suite: str, results: Dict, args) -> int:
+    """Prints results, saves or compares them against the baseline.
+
+    Args:
+        suite (str): Suite name
+        results (Dict): Results by metric name
+        args: Command line arguments (baseline, save, tolerance, budget, output)
+
+    Returns:
+        Exit status, 1 if there are regressions or budget violations
+    """
+    baseline = load_baseline(args.baseline).get(suite, {}).get("results", {})
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"suite": suite, "environment": get_environment(), "results": results}, file, indent=4)
+            file.write("\n")
+
+    for name, result in results.items():
+        line = f"{name:<32}{result['value']:>12.2f} {result['unit']:<6}"
+        if name in baseline and baseline[name]["value"]:
+            change = result["value"] / baseline[name]["value"] - 1
+            line += f"{change:>+10.1%}"
+        print(line)
+
+    if args.save:
+        save_baseline(suite, results, args.baseline)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    failures = compare(results, baseline, args.tolerance) + check_budgets(results, args.budget)
+    for failure in failures:
+        print(f"REGRESSION {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def add_arguments(parser) -> None:
+    """Adds common command line arguments"""
+    parser.add_argument("--repeat", type=int, default=5, help="Number of repetitions of each measurement")
+    parser.add_argument("--baseline", default=BASELINE, help="Path of the baseline file")
+    parser.add_argument("--save", action="store_true", help="Save the results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative change")
+    parser.add_argument("--budget", action="append", help="Maximum (or minimum throughput) value of a metric as name=value")
+    parser.add_argument("--output", help="Path of the JSON file to write the results to")
@@ -0,0 +1,1047 @@
+"""
+Mock HTTP server of the Zenodo and Figshare APIs for benchmarks
+
+The server implements the subset of the APIs used by the clients, including
+depositions, records, versions, licenses, file uploads (multipart uploads of
+Zenodo and part uploads of Figshare) and file downloads with byte ranges.
+Zenodo endpoints are served under ``/zenodo/api/``, Figshare endpoints under
+``/figshare/v2/``, the Figshare upload service under ``/upload/`` and files
+under ``/files/``.
+
+Seeded datasets (1 to N) are published datasets generated from their
+identifiers. Created datasets are drafts kept in memory together with the
+uploaded file contents.
+
+Network conditions are simulated by the following options:
+
+- latency: Delay before each response in seconds
+- bandwidth: Transfer rate of each connection in bytes per second
+- rate_limit: Maximum number of requests in each rate limit window
+- failure_rate: Probability of a 503 Service Unavailable response
+- drop_rate: Probability of closing the connection without a response
+
+JSON responses of the GET requests include an ETag header, and conditional
+requests with a matching If-None-Match header are answered by 304 Not
+Modified.
+
+Usage:
+    python benchmarks/server.py [--port PORT] [--latency SECONDS] [--bandwidth BYTES] ...
+"""
+from typing import Callable, Dict, List, Tuple
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from datetime import datetime
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+
+
+def get_api_url(url: str, client_id: str) -> str:
+    """Returns API URL address of a client at the mock server
+
+    Args:
+        url (str): Base URL address of the server
+        client_id (str): Client identifier ("zenodo" or "figshare")
+    """
+    return {
+        "zenodo": f"{url}zenodo/api/",
+        "figshare": f"{url}figshare/v2/",
+    }[client_id]
+
+
+def create_client(url: str, client_id: str, **kwargs):
+    """Creates a new client object connected to the mock server.
+
+    Args:
+        url (str): Base URL address of the server
+        client_id (str): Client identifier ("zenodo" or "figshare")
+        **kwargs: Other client arguments
+
+    Returns:
+        Client object
+    """
+    import fairly
+
+    # REMARK: A new object is created, because client objects are shared by fairly.client()
+    client = fairly.get_clients()[client_id](**kwargs)
+
+    # REMARK: Local addresses are not accepted as configuration parameters
+    client.config["api_url"] = get_api_url(url, client_id)
+
+    return client
+
+
+def parse_multipart(content_type: str, body: bytes) -> Tuple[str, bytes]:
+    """Returns name and content of the first file of a multipart body"""
+    match = re.search(r"boundary=\"?([^\";]+)\"?", content_type)
+    if not match:
+        return None, None
+    boundary = b"--" + match.group(1).encode("latin-1")
+    for part in body.split(boundary)[1:]:
+        if part.startswith(b"--"):
+            break
+        headers, _, content = part.partition(b"\r\n\r\n")
+        match = re.search(rb"filename=\"([^\"]*)\"", headers)
+        if match:
+            # REMARK: Line break before the next boundary is not a part of the content
+            if content.endswith(b"\r\n"):
+                content = content[:-2]
+            return match.group(1).decode("utf-8"), content
+    return None, None
+
+
+class Request:
+    """Request received by the mock server.
+
+    Attributes:
+        method (str): HTTP method
+        path (str): Path of the URL address
+        query (Dict): Query parameters
+        headers (Mapping): Request headers
+        body (bytes): Request body
+        args (Tuple): Groups of the matched route
+    """
+
+    def __init__(self, method: str, path: str, query: Dict, headers, body: bytes):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.headers = headers
+        self.body = body
+        self.args = ()
+
+
+    def get(self, name: str, default: str=None) -> str:
+        """Returns value of a query parameter"""
+        return self.query.get(name, [default])[0]
+
+
+    def json(self) -> Dict:
+        """Returns JSON body of the request"""
+        return json.loads(self.body) if self.body else {}
+
+
+class Response:
+    """Response of the mock server.
+
+    Attributes:
+        status (int): Status code
+        content: Content as bytes or a JSON serializable object
+        headers (Dict): Response headers
+    """
+
+    def __init__(self, status: int=200, content=None, headers: Dict=None):
+        self.status = status
+        self.content = content
+        self.headers = headers or {}
+
+
+class MockServer:
+    """Mock HTTP server of the repository APIs.
+
+    Attributes:
+        datasets (int): Number of seeded datasets
+        files (int): Number of files of each seeded dataset
+        file_size (int): Size of each seeded file in bytes
+        part_size (int): Part size of the Figshare uploads in bytes
+        latency (float): Delay before each response in seconds
+        bandwidth (float): Transfer rate of each connection in bytes per second, None for no limit
+        rate_limit (int): Maximum number of requests in a rate limit window, None for no limit
+        rate_window (float): Duration of the rate limit window in seconds
+        failure_rate (float): Probability of a 503 response
+        drop_rate (float): Probability of closing the connection without a response
+        fault_pattern (str): Regular expression of the request paths faults are injected into, None for all
+        stats (Dict): Request statistics
+        _created (Dict): Created datasets by identifier
+        _files (Dict): Created files by identifier
+        _uploads (Dict): Incomplete Figshare uploads by upload token
+        _server (ThreadingHTTPServer): HTTP server
+        _thread (Thread): Server thread
+    """
+
+    # Size of the blocks transferred at once while limiting bandwidth
+    BLOCK_SIZE = 2**14
+
+    # First identifier of the created datasets and files
+    CREATED_ID = 10**6
+
+
+    def __init__(self, host: str="127.0.0.1", port: int=0, datasets: int=1000, files: int=3, file_size: int=2**20,
+        part_size: int=2**20, latency: float=0, bandwidth: float=None, rate_limit: int=None, rate_window: float=60,
+        failure_rate: float=0, drop_rate: float=0, fault_pattern: str=None, seed: int=None):
+        """Initializes MockServer object.
+
+        Args:
+            host (str): Host address (default = 127.0.0.1)
+            port (int): Port number, 0 to select a free port (default = 0)
+            datasets (int): Number of seeded datasets (default = 1000)
+            files (int): Number of files of each seeded dataset (default = 3)
+            file_size (int): Size of each seeded file in bytes (default = 1 MiB)
+            part_size (int): Part size of the Figshare uploads in bytes (default = 1 MiB)
+            latency (float): Delay before each response in seconds (default = 0)
+            bandwidth (float): Transfer rate of each connection in bytes per second (optional)
+            rate_limit (int): Maximum number of requests in a rate limit window (optional)
+            rate_window (float): Duration of the rate limit window in seconds (default = 60)
+            failure_rate (float): Probability of a 503 response (default = 0)
+            drop_rate (float): Probability of closing the connection without a response (default = 0)
+            fault_pattern (str): Regular expression of the request paths faults are injected into (default = all)
+            seed (int): Seed of the injected failures (optional)
+        """
+        self.datasets = datasets
+        self.files = files
+        self.file_size = file_size
+        self.part_size = part_size
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.failure_rate = failure_rate
+        self.drop_rate = drop_rate
+        self.fault_pattern = fault_pattern
+
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._created = {}
+        self._files = {}
+        self._uploads = {}
+        self._next_id = self.CREATED_ID
+        self._window = None
+        self._window_count = 0
+        self._content = None
+        self._md5 = None
+        self.reset_stats()
+
+        self._routes = self._get_routes()
+        self._server = ThreadingHTTPServer((host, port), MockHandler)
+        self._server.daemon_threads = True
+        self._server.mock = self
+        self._thread = None
+
+
+    @property
+    def url(self) -> str:
+        """Base URL address of the server"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+
+    def get_api_url(self, client_id: str) -> str:
+        """Returns API URL address of the specified client"""
+        return get_api_url(self.url, client_id)
+
+
+    def create_client(self, client_id: str, **kwargs):
+        """Creates a new client object connected to the server"""
+        return create_client(self.url, client_id, **kwargs)
+
+
+    def start(self) -> "MockServer":
+        """Starts the server in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+
+    def stop(self) -> None:
+        """Stops the server."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+
+    def __enter__(self) -> "MockServer":
+        return self.start()
+
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+
+    def reset_stats(self) -> None:
+        """Resets request statistics."""
+        self.stats = {
+            "requests": 0,
+            "bytes_received": 0,
+            "bytes_sent": 0,
+            "failures": 0,
+            "drops": 0,
+            "throttled": 0,
+            "not_modified": 0,
+        }
+
+
+    def count(self, name: str, val: int=1) -> None:
+        """Increments a request statistic"""
+        with self._lock:
+            self.stats[name] += val
+
+
+    def get_fault(self, path: str) -> str:
+        """Returns the fault injected into a request ("drop", "failure" or None)"""
+        if self.fault_pattern and not re.search(self.fault_pattern, path):
+            return None
+        with self._lock:
+            val = self._random.random()
+        if val < self.drop_rate:
+            return "drop"
+        if val < self.drop_rate + self.failure_rate:
+            return "failure"
+        return None
+
+
+    def check_rate_limit(self) -> Tuple[bool, Dict]:
+        """Counts a request in the current rate limit window.
+
+        Returns:
+            Tuple of the acceptance of the request and the rate limit headers
+        """
+        if not self.rate_limit:
+            return True, {}
+
+        now = time.time()
+        with self._lock:
+            if self._window is None or now >= self._window + self.rate_window:
+                self._window = now
+                self._window_count = 0
+            self._window_count += 1
+            count = self._window_count
+            reset = self._window + self.rate_window
+
+        headers = {
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Remaining": str(max(0, self.rate_limit - count)),
+            "X-RateLimit-Reset": str(int(math.ceil(reset))),
+        }
+        if count > self.rate_limit:
+            headers["Retry-After"] = str(int(math.ceil(reset - now)))
+            return False, headers
+
+        return True, headers
+
+
+    def check_validators(self, headers, response: Response) -> Response:
+        """Sets the entity tag of a JSON response and answers conditional requests.
+
+        Args:
+            headers: Request headers
+            response (Response): Response of the request
+
+        Returns:
+            Response with the entity tag, or 304 response if the entity tag is matched
+        """
+        content = json.dumps(response.content, sort_keys=True).encode("utf-8")
+        etag = f'"{hashlib.md5(content).hexdigest()}"'
+        if headers.get("If-None-Match") == etag:
+            self.count("not_modified")
+            return Response(304, None, {"ETag": etag})
+        response.headers["ETag"] = etag
+        return response
+
+
+    def handle(self, request: Request) -> Response:
+        """Returns response of a request"""
+        for method, pattern, handler in self._routes:
+            if method != request.method and not (method == "GET" and request.method == "HEAD"):
+                continue
+            match = pattern.match(request.path)
+            if match:
+                request.args = match.groups()
+                return handler(request)
+        return Response(404, {"message": "Not found"})
+
+
+    def _get_routes(self) -> List[Tuple[str, "re.Pattern", Callable]]:
+        routes = [
+            # Zenodo
+            ("GET", r"/zenodo/api/deposit/depositions/?", self.zenodo_get_depositions),
+            ("POST", r"/zenodo/api/deposit/depositions/?", self.zenodo_create_deposition),
+            ("GET", r"/zenodo/api/deposit/depositions/(\d+)", self.zenodo_get_deposition),
+            ("PUT", r"/zenodo/api/deposit/depositions/(\d+)", self.zenodo_update_deposition),
+            ("DELETE", r"/zenodo/api/deposit/depositions/(\d+)", self.delete_dataset),
+            ("POST", r"/zenodo/api/deposit/depositions/(\d+)/files", self.zenodo_upload_file),
+            ("DELETE", r"/zenodo/api/deposit/depositions/(\d+)/files/(\d+)", self.delete_file),
+            ("GET", r"/zenodo/api/records/?", self.zenodo_get_records),
+            ("GET", r"/zenodo/api/records/(\d+)", self.zenodo_get_record),
+            ("GET", r"/zenodo/api/licenses/?", self.zenodo_get_licenses),
+            # Figshare
+            ("GET", r"/figshare/v2/account/articles", self.figshare_get_articles),
+            ("POST", r"/figshare/v2/account/articles", self.figshare_create_article),
+            ("GET", r"/figshare/v2/(account/)?articles/(\d+)(?:/versions/\d+)?", self.figshare_get_article),
+            ("GET", r"/figshare/v2/articles/(\d+)/versions", self.figshare_get_versions),
+            ("PUT", r"/figshare/v2/account/articles/(\d+)", self.figshare_update_article),
+            ("DELETE", r"/figshare/v2/account/articles/(\d+)", self.delete_dataset),
+            ("POST", r"/figshare/v2/account/articles/(\d+)/authors", self.figshare_update_article),
+            ("PUT", r"/figshare/v2/account/articles/(\d+)/embargo", self.figshare_update_article),
+            ("DELETE", r"/figshare/v2/account/articles/(\d+)/embargo", self.figshare_update_article),
+            ("POST", r"/figshare/v2/account/articles/(\d+)/files", self.figshare_initiate_upload),
+            ("GET", r"/figshare/v2/account/articles/(\d+)/files/(\d+)", self.figshare_get_file),
+            ("POST", r"/figshare/v2/account/articles/(\d+)/files/(\d+)", self.figshare_complete_upload),
+            ("DELETE", r"/figshare/v2/account/articles/(\d+)/files/(\d+)", self.delete_file),
+            ("GET", r"/figshare/v2/(?:account/)?licenses", self.figshare_get_licenses),
+            ("GET", r"/figshare/v2/(?:account/)?categories", self.figshare_get_categories),
+            # Figshare upload service
+            ("GET", r"/upload/([0-9a-f]+)", self.get_upload),
+            ("PUT", r"/upload/([0-9a-f]+)/(\d+)", self.upload_part),
+            # Files
+            ("GET", r"/files/(\d+)", self.download_file),
+        ]
+        return [(method, re.compile(f"^{pattern}$"), handler) for method, pattern, handler in routes]
+
+
+    @property
+    def content(self) -> bytes:
+        """Content of the seeded files"""
+        if self._content is None:
+            pattern = bytes(range(256))
+            self._content = (pattern * (self.file_size // len(pattern) + 1))[:self.file_size]
+            self._md5 = hashlib.md5(self._content).hexdigest()
+        return self._content
+
+
+    @property
+    def md5(self) -> str:
+        """MD5 checksum of the seeded files"""
+        self.content
+        return self._md5
+
+
+    def get_dataset(self, id: int) -> Dict:
+        """Returns the dataset, None if it does not exist"""
+        if 1 <= id <= self.datasets:
+            return {
+                "id": id,
+                "title": f"Dataset {id}",
+                "metadata": {},
+                "files": [self.get_file(id * 100 + i) for i in range(self.files)],
+                "draft": False,
+                "created": "2022-01-01T00:00:00",
+                "modified": "2022-01-02T00:00:00",
+            }
+        with self._lock:
+            return self._created.get(id)
+
+
+    def get_page(self, request: Request) -> List[Dict]:
+        """Returns the requested page of the seeded and created datasets"""
+        page = int(request.get("page", "1"))
+        size = int(request.get("page_size", "10"))
+        start = (page - 1) * size
+
+        ids = list(range(start + 1, min(start + size, self.datasets) + 1))
+        if len(ids) < size:
+            with self._lock:
+                created = sorted(self._created)
+            offset = max(0, start - self.datasets)
+            ids += created[offset:offset + size - len(ids)]
+
+        return [dataset for dataset in map(self.get_dataset, ids) if dataset]
+
+
+    def get_draft(self, request: Request) -> Dict:
+        """Returns the draft dataset of a request, None if it does not exist"""
+        dataset = self.get_dataset(int(request.args[0]))
+        return dataset if dataset and dataset["draft"] else None
+
+
+    def create_dataset(self, title: str="") -> Dict:
+        now = datetime.utcnow().isoformat()
+        with self._lock:
+            id = self._next_id
+            self._next_id += 1
+            dataset = {
+                "id": id,
+                "title": title,
+                "metadata": {},
+                "files": [],
+                "draft": True,
+                "created": now,
+                "modified": now,
+            }
+            self._created[id] = dataset
+        return dataset
+
+
+    def add_dataset(self, files: Dict[str, bytes], title: str="") -> int:
+        """Adds a published dataset with the specified files.
+
+        Args:
+            files (Dict): File contents by file name
+            title (str): Title of the dataset (optional)
+
+        Returns:
+            Identifier of the dataset
+        """
+        dataset = self.create_dataset(title)
+        for name, content in files.items():
+            self.create_file(dataset, name, content)
+        dataset["draft"] = False
+        return dataset["id"]
+
+
+    def delete_drafts(self) -> None:
+        """Deletes the draft datasets and their uploaded files."""
+        with self._lock:
+            for id, dataset in list(self._created.items()):
+                if dataset["draft"]:
+                    del self._created[id]
+                    for file in dataset["files"]:
+                        self._files.pop(file["id"], None)
+            self._uploads.clear()
+
+
+    def delete_dataset(self, request: Request) -> Response:
+        id = int(request.args[0])
+        with self._lock:
+            dataset = self._created.pop(id, None)
+            if dataset:
+                for file in dataset["files"]:
+                    self._files.pop(file["id"], None)
+        if dataset:
+            return Response(204)
+        if self.get_dataset(id):
+            return Response(403, {"message": "Published datasets cannot be deleted"})
+        return Response(404, {"message": "Dataset not found"})
+
+
+    def get_file(self, id: int) -> Dict:
+        """Returns the file, None if it does not exist"""
+        if id < self.CREATED_ID:
+            dataset_id, index = divmod(id, 100)
+            if 1 <= dataset_id <= self.datasets and index < self.files:
+                return {
+                    "id": id,
+                    "name": f"file_{index}.bin",
+                    "size": self.file_size,
+                    "md5": self.md5,
+                    "content": None,
+                    "complete": True,
+                }
+            return None
+        with self._lock:
+            return self._files.get(id)
+
+
+    def create_file(self, dataset: Dict, name: str, content: bytes=None, size: int=0, md5: str=None) -> Dict:
+        """Creates a file of a draft dataset
+
+        Args:
+            dataset (Dict): Draft dataset
+            name (str): Name of the file
+            content (bytes): Content of the file, None if it is not uploaded yet
+            size (int): Expected size of the file if it is not uploaded yet
+            md5 (str): Expected MD5 checksum of the file if it is not uploaded yet
+
+        Returns:
+            File
+        """
+        if content is not None:
+            size = len(content)
+            md5 = hashlib.md5(content).hexdigest()
+        with self._lock:
+            id = self._next_id
+            self._next_id += 1
+            file = {
+                "id": id,
+                "name": name,
+                "size": size,
+                "md5": md5,
+                "content": content,
+                "complete": content is not None,
+            }
+            self._files[id] = file
+            dataset["files"].append(file)
+            dataset["modified"] = datetime.utcnow().isoformat()
+        return file
+
+
+    def delete_file(self, request: Request) -> Response:
+        dataset = self.get_draft(request)
+        if not dataset:
+            return Response(404, {"message": "Dataset not found"})
+        id = int(request.args[1])
+        with self._lock:
+            file = self._files.pop(id, None)
+            if file:
+                dataset["files"] = [item for item in dataset["files"] if item["id"] != id]
+        if not file:
+            return Response(404, {"message": "File not found"})
+        return Response(204)
+
+
+    def download_file(self, request: Request) -> Response:
+        file = self.get_file(int(request.args[0]))
+        if not file or not file["complete"]:
+            return Response(404, {"message": "File not found"})
+
+        content = self.content if file["content"] is None else file["content"]
+        headers = {"Accept-Ranges": "bytes"}
+
+        # REMARK: Only single byte ranges are supported
+        match = re.match(r"^bytes=(\d+)-(\d*)$", request.headers.get("Range", ""))
+        if not match:
+            return Response(200, content, headers)
+
+        start = int(match.group(1))
+        end = min(int(match.group(2)), len(content) - 1) if match.group(2) else len(content) - 1
+        if start > end:
+            headers["Content-Range"] = f"bytes */{len(content)}"
+            return Response(416, b"", headers)
+
+        headers["Content-Range"] = f"bytes {start}-{end}/{len(content)}"
+        return Response(206, content[start:end + 1], headers)
+
+
+    # Zenodo
+
+    def get_zenodo_file(self, file: Dict) -> Dict:
+        return {
+            "id": str(file["id"]),
+            "filename": file["name"],
+            "filesize": file["size"],
+            "checksum": file["md5"],
+            "links": {"download": f"{self.url}files/{file['id']}"},
+        }
+
+
+    def get_zenodo_record(self, dataset: Dict) -> Dict:
+        id = dataset["id"]
+        metadata = {
+            "upload_type": "dataset",
+            "publication_date": "2022-01-01",
+            "title": dataset["title"],
+            "creators": [{"name": "Doe, Jane", "affiliation": "University"}],
+            "description": "Mock dataset",
+            "access_right": "open",
+            "license": "cc-by-4.0",
+            "keywords": ["mock", "benchmark"],
+            "version": "1",
+        }
+        if not dataset["draft"]:
+            metadata["doi"] = f"10.5281/zenodo.{id}"
+        metadata.update(dataset["metadata"])
+        return {
+            "id": id,
+            "conceptrecid": str(id),
+            "title": metadata["title"],
+            "doi": metadata.get("doi", ""),
+            "state": "unsubmitted" if dataset["draft"] else "done",
+            "submitted": not dataset["draft"],
+            "created": dataset["created"],
+            "modified": dataset["modified"],
+            "links": {"html": f"{self.url}zenodo/records/{id}"},
+            "files": [self.get_zenodo_file(file) for file in dataset["files"]],
+            "metadata": metadata,
+        }
+
+
+    def zenodo_search(self, request: Request) -> List[Dict]:
+        """Returns records of a concept record identifier query"""
+        match = re.search(r"conceptrecid:(\d+)", request.get("q", ""))
+        dataset = self.get_dataset(int(match.group(1))) if match else None
+        if not dataset or int(request.get("page", "1")) > 1:
+            return []
+        return [self.get_zenodo_record(dataset)]
+
+
+    def zenodo_get_depositions(self, request: Request) -> Response:
+        if "q" in request.query:
+            return Response(200, self.zenodo_search(request))
+        return Response(200, [self.get_zenodo_record(dataset) for dataset in self.get_page(request)])
+
+
+    def zenodo_create_deposition(self, request: Request) -> Response:
+        dataset = self.create_dataset()
+        return Response(201, self.get_zenodo_record(dataset))
+
+
+    def zenodo_get_deposition(self, request: Request) -> Response:
+        dataset = self.get_dataset(int(request.args[0]))
+        if not dataset:
+            return Response(404, {"message": "Deposition not found"})
+        return Response(200, self.get_zenodo_record(dataset))
+
+
+    def zenodo_update_deposition(self, request: Request) -> Response:
+        dataset = self.get_draft(request)
+        if not dataset:
+            return Response(404, {"message": "Deposition not found"})
+        metadata = request.json().get("metadata", {})
+        with self._lock:
+            dataset["metadata"] = metadata
+            dataset["title"] = metadata.get("title", "")
+            dataset["modified"] = datetime.utcnow().isoformat()
+        return Response(200, self.get_zenodo_record(dataset))
+
+
+    def zenodo_upload_file(self, request: Request) -> Response:
+        dataset = self.get_draft(request)
+        if not dataset:
+            return Response(404, {"message": "Deposition not found"})
+        name, content = parse_multipart(request.headers.get("Content-Type", ""), request.body)
+        if content is None:
+            return Response(400, {"message": "No file"})
+        file = self.create_file(dataset, name, content)
+        return Response(201, self.get_zenodo_file(file))
+
+
+    def zenodo_get_records(self, request: Request) -> Response:
+        hits = self.zenodo_search(request)
+        return Response(200, {"hits": {"total": len(hits), "hits": hits}})
+
+
+    def zenodo_get_record(self, request: Request) -> Response:
+        # REMARK: Draft datasets are available only as depositions
+        dataset = self.get_dataset(int(request.args[0]))
+        if not dataset or dataset["draft"]:
+            return Response(404, {"message": "Record not found"})
+        return Response(200, self.get_zenodo_record(dataset))
+
+
+    def zenodo_get_licenses(self, request: Request) -> Response:
+        return Response(200, {"hits": {"total": 1, "hits": [
+            {"metadata": {"id": "cc-by-4.0", "title": "CC BY 4.0", "url": "https://creativecommons.org/licenses/by/4.0/"}},
+        ]}})
+
+
+    # Figshare
+
+    @staticmethod
+    def get_upload_token(file: Dict) -> str:
+        return hashlib.md5(str(file["id"]).encode("ascii")).hexdigest()
+
+
+    def get_figshare_file(self, file: Dict) -> Dict:
+        token = self.get_upload_token(file)
+        return {
+            "id": file["id"],
+            "name": file["name"],
+            "size": file["size"],
+            "supplied_md5": file["md5"],
+            "computed_md5": file["md5"] if file["complete"] else "",
+            "status": "available" if file["complete"] else "created",
+            "download_url": f"{self.url}files/{file['id']}",
+            "upload_token": token,
+            "upload_url": f"{self.url}upload/{token}",
+        }
+
+
+    def get_figshare_article(self, dataset: Dict) -> Dict:
+        id = dataset["id"]
+        article = {
+            "id": id,
+            "title": dataset["title"],
+            "doi": "" if dataset["draft"] else f"10.6084/m9.figshare.{id}",
+            "status": "draft" if dataset["draft"] else "public",
+            "is_embargoed": False,
+            "is_confidential": False,
+            "embargo_date": None,
+            "embargo_options": [],
+            "created_date": f"{dataset['created']}Z",
+            "modified_date": f"{dataset['modified']}Z",
+            "url_public_html": f"{self.url}figshare/articles/{id}",
+            "url_private_html": f"{self.url}figshare/account/articles/{id}",
+            "authors": [{"id": 1, "full_name": "Jane Doe"}],
+            "tags": ["mock", "benchmark"],
+            "description": "Mock dataset",
+            "license": {"value": 1, "name": "CC BY 4.0", "url": "https://creativecommons.org/licenses/by/4.0/"},
+            "defined_type_name": "dataset",
+            "categories": [{"id": 1, "title": "Category"}],
+            "timeline": {"firstOnline": "2022-01-01T00:00:00"},
+            "files": [self.get_figshare_file(file) for file in dataset["files"] if file["complete"]],
+        }
+        article.update(dataset["metadata"])
+        return article
+
+
+    def figshare_get_articles(self, request: Request) -> Response:
+        return Response(200, [self.get_figshare_article(dataset) for dataset in self.get_page(request)])
+
+
+    def figshare_create_article(self, request: Request) -> Response:
+        dataset = self.create_dataset(request.json().get("title", ""))
+        return Response(201, {
+            "entity_id": dataset["id"],
+            "location": f"{self.url}figshare/v2/account/articles/{dataset['id']}",
+            "warnings": [],
+        })
+
+
+    def figshare_get_article(self, request: Request) -> Response:
+        # REMARK: Draft articles are available only by the private endpoint
+        dataset = self.get_dataset(int(request.args[1]))
+        if not dataset or (dataset["draft"] and not request.args[0]):
+            return Response(404, {"message": "Entity not found: article"})
+        return Response(200, self.get_figshare_article(dataset))
+
+
+    def figshare_get_versions(self, request: Request) -> Response:
+        dataset = self.get_dataset(int(request.args[0]))
+        if not dataset or dataset["draft"]:
+            return Response(404, {"message": "Entity not found: article"})
+        return Response(200, [{"version": 1, "url": f"{self.url}figshare/v2/articles/{dataset['id']}/versions/1"}])
+
+
+    def figshare_update_article(self, request: Request) -> Response:
+        dataset = self.get_draft(request)
+        if not dataset:
+            return Response(404, {"message": "Entity not found: article"})
+        if request.path.endswith("/authors") or request.path.endswith("/embargo"):
+            return Response(204)
+        data = request.json()
+        with self._lock:
+            dataset["title"] = data.get("title", dataset["title"])
+            dataset["modified"] = datetime.utcnow().isoformat()
+        return Response(205, {"location": f"{self.url}figshare/v2/account/articles/{dataset['id']}"})
+
+
+    def figshare_initiate_upload(self, request: Request) -> Response:
+        dataset = self.get_draft(request)
+        if not dataset:
+            return Response(404, {"message": "Entity not found: article"})
+        data = request.json()
+        file = self.create_file(dataset, data.get("name", ""), size=int(data.get("size", 0)), md5=data.get("md5"))
+        with self._lock:
+            self._uploads[self.get_upload_token(file)] = {"file": file, "parts": {}}
+        return Response(201, {"location": f"{self.url}figshare/v2/account/articles/{dataset['id']}/files/{file['id']}"})
+
+
+    def figshare_get_file(self, request: Request) -> Response:
+        file = self.get_file(int(request.args[1]))
+        if not file:
+            return Response(404, {"message": "Entity not found: file"})
+        return Response(200, self.get_figshare_file(file))
+
+
+    def figshare_complete_upload(self, request: Request) -> Response:
+        file = self.get_file(int(request.args[1]))
+        if not file:
+            return Response(404, {"message": "Entity not found: file"})
+        token = self.get_upload_token(file)
+        with self._lock:
+            upload = self._uploads.get(token)
+        if not upload or len(upload["parts"]) != len(self.get_parts(file)):
+            return Response(400, {"message": "Upload is not completed"})
+        content = b"".join(upload["parts"][number] for number in sorted(upload["parts"]))
+        with self._lock:
+            file["content"] = content
+            file["md5"] = hashlib.md5(content).hexdigest()
+            file["complete"] = True
+            del self._uploads[token]
+        return Response(202, b"")
+
+
+    def figshare_get_licenses(self, request: Request) -> Response:
+        return Response(200, [{"value": 1, "name": "CC BY 4.0", "url": "https://creativecommons.org/licenses/by/4.0/"}])
+
+
+    def figshare_get_categories(self, request: Request) -> Response:
+        return Response(200, [{"id": 1, "title": "Category", "parent_id": 0, "source_id": 1, "is_selectable": True}])
+
+
+    # Figshare upload service
+
+    def get_parts(self, file: Dict) -> List[Tuple[int, int, int]]:
+        """Returns part numbers and byte ranges of a file upload"""
+        return [
+            (number, start, min(start + self.part_size, file["size"]) - 1)
+            for number, start in enumerate(range(0, file["size"], self.part_size), 1)
+        ]
+
+
+    def get_upload(self, request: Request) -> Response:
+        with self._lock:
+            upload = self._uploads.get(request.args[0])
+        if not upload:
+            return Response(404, {"message": "Upload not found"})
+        file = upload["file"]
+        return Response(200, {
+            "token": request.args[0],
+            "name": file["name"],
+            "size": file["size"],
+            "md5": file["md5"],
+            "status": "PENDING",
+            "parts": [{
+                "partNo": number,
+                "startOffset": start,
+                "endOffset": end,
+                "status": "COMPLETE" if number in upload["parts"] else "PENDING",
+                "locked": False,
+            } for number, start, end in self.get_parts(file)],
+        })
+
+
+    def upload_part(self, request: Request) -> Response:
+        with self._lock:
+            upload = self._uploads.get(request.args[0])
+        if not upload:
+            return Response(404, {"message": "Upload not found"})
+        parts = {number: (start, end) for number, start, end in self.get_parts(upload["file"])}
+        number = int(request.args[1])
+        if number not in parts:
+            return Response(404, {"message": "Part not found"})
+        start, end = parts[number]
+        if len(request.body) != end - start + 1:
+            return Response(400, {"message": "Invalid part size"})
+        with self._lock:
+            upload["parts"][number] = request.body
+        return Response(200, b"")
+
+
+class MockHandler(BaseHTTPRequestHandler):
+
+    # REMARK: Persistent connections are required to measure connection reuse
+    protocol_version = "HTTP/1.1"
+
+    # REMARK: Headers and content are sent separately, delayed acknowledgements stall persistent connections otherwise
+    disable_nagle_algorithm = True
+
+
+    def do_GET(self) -> None:
+        self.handle_request()
+
+
+    def do_HEAD(self) -> None:
+        self.handle_request()
+
+
+    def do_POST(self) -> None:
+        self.handle_request()
+
+
+    def do_PUT(self) -> None:
+        self.handle_request()
+
+
+    def do_DELETE(self) -> None:
+        self.handle_request()
+
+
+    def throttle(self, size: int) -> None:
+        """Waits for the transfer time of the specified number of bytes"""
+        bandwidth = self.server.mock.bandwidth
+        if bandwidth:
+            time.sleep(size / bandwidth)
+
+
+    def read_body(self) -> bytes:
+        mock = self.server.mock
+        size = int(self.headers.get("Content-Length") or 0)
+        chunks = []
+        while size > 0:
+            chunk = self.rfile.read(min(size, mock.BLOCK_SIZE))
+            if not chunk:
+                break
+            chunks.append(chunk)
+            size -= len(chunk)
+            self.throttle(len(chunk))
+        body = b"".join(chunks)
+        mock.count("bytes_received", len(body))
+        return body
+
+
+    def handle_request(self) -> None:
+        mock = self.server.mock
+        mock.count("requests")
+
+        # REMARK: Body of a rejected request is read as well to keep the connection usable
+        body = self.read_body()
+
+        fault = mock.get_fault(self.path)
+        if fault == "drop":
+            mock.count("drops")
+            self.close_connection = True
+            return
+
+        if mock.latency:
+            time.sleep(mock.latency)
+
+        accepted, headers = mock.check_rate_limit()
+        if not accepted:
+            mock.count("throttled")
+            response = Response(429, {"message": "Too many requests"})
+        elif fault == "failure":
+            mock.count("failures")
+            response = Response(503, {"message": "Service unavailable"})
+        else:
+            url = urlparse(self.path)
+            request = Request(self.command, url.path, parse_qs(url.query), self.headers, body)
+            try:
+                response = mock.handle(request)
+            except Exception as err:
+                response = Response(500, {"message": str(err)})
+            if self.command == "GET" and response.status == 200 and not isinstance(response.content, bytes):
+                response = mock.check_validators(self.headers, response)
+
+        response.headers.update(headers)
+        self.send(response)
+
+
+    def send(self, response: Response) -> None:
+        content = response.content
+        if content is None:
+            content = b""
+        if isinstance(content, bytes):
+            content_type = "application/octet-stream"
+        else:
+            content_type = "application/json"
+            content = json.dumps(content).encode("utf-8")
+
+        self.send_response(response.status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(content)))
+        for name, val in response.headers.items():
+            self.send_header(name, val)
+        self.end_headers()
+
+        if self.command == "HEAD":
+            return
+
+        mock = self.server.mock
+        for start in range(0, len(content), mock.BLOCK_SIZE):
+            block = content[start:start + mock.BLOCK_SIZE]
+            self.wfile.write(block)
+            self.throttle(len(block))
+        mock.count("bytes_sent", len(content))
+
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mock HTTP server of the repository APIs")
+    parser.add_argument("--port", type=int, default=8000, help="Port number")
+    parser.add_argument("--datasets", type=int, default=1000, help="Number of seeded datasets")
+    parser.add_argument("--files", type=int, default=3, help="Number of files of each seeded dataset")
+    parser.add_argument("--file-size", type=int, default=2**20, help="Size of each seeded file in bytes")
+    parser.add_argument("--part-size", type=int, default=2**20, help="Part size of the Figshare uploads in bytes")
+    parser.add_argument("--latency", type=float, default=0, help="Delay before each response in seconds")
+    parser.add_argument("--bandwidth", type=float, help="Transfer rate of each connection in bytes per second")
+    parser.add_argument("--rate-limit", type=int, help="Maximum number of requests in a rate limit window")
+    parser.add_argument("--rate-window", type=float, default=60, help="Duration of the rate limit window in seconds")
+    parser.add_argument("--failure-rate", type=float, default=0, help="Probability of a 503 response")
+    parser.add_argument("--drop-rate", type=float, default=0, help="Probability of closing the connection without a response")
+    parser.add_argument("--seed", type=int, help="Seed of the injected failures")
+    args = parser.parse_args()
+
+    server = MockServer(
+        port=args.port, datasets=args.datasets, files=args.files, file_size=args.file_size,
+        part_size=args.part_size, latency=args.latency, bandwidth=args.bandwidth,
+        rate_limit=args.rate_limit, rate_window=args.rate_window,
+        failure_rate=args.failure_rate, drop_rate=args.drop_rate, seed=args.seed,
+    )
+    print(f"Serving on {server.url}")
+    print(f"Zenodo API: {server.get_api_url('zenodo')}")
+    print(f"Figshare API: {server.get_api_url('figshare')}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
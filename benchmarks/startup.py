@@ -0,0 +1,172 @@
+"""
+Startup benchmarks of the fairly package
+
+Cold start costs are measured in new interpreter processes:
+
+- import_fairly: Import time of the package
+- get_repositories: First call of fairly.get_repositories()
+- metadata_templates: First call of fairly.metadata_templates()
+- client: First call of fairly.client() for Zenodo
+- first_request: First dataset details request to a mock server
+- warm_request: Following dataset details request on the same client
+- client_memory: Memory allocated per client object
+- dataset_memory: Memory allocated per account dataset object
+
+Results are compared against the stored baseline, and the exit status is 1
+if a metric regresses more than the tolerance or exceeds its budget.
+
+Usage:
+    python benchmarks/startup.py [--repeat N] [--save] [--budget import_fairly=300]
+    python benchmarks/startup.py --profile-imports
+"""
+from typing import Dict
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from common import add_arguments, median, report
+from server import MockServer, create_client
+
+SUITE = "startup"
+
+
+def measure_import_fairly(url: str) -> float:
+    start = time.perf_counter()
+    import fairly
+    return (time.perf_counter() - start) * 1000
+
+
+def measure_get_repositories(url: str) -> float:
+    import fairly
+    start = time.perf_counter()
+    fairly.get_repositories()
+    return (time.perf_counter() - start) * 1000
+
+
+def measure_metadata_templates(url: str) -> float:
+    import fairly
+    start = time.perf_counter()
+    fairly.metadata_templates()
+    return (time.perf_counter() - start) * 1000
+
+
+def measure_client(url: str) -> float:
+    import fairly
+    start = time.perf_counter()
+    fairly.client("zenodo")
+    return (time.perf_counter() - start) * 1000
+
+
+def measure_first_request(url: str) -> float:
+    client = create_client(url, "zenodo")
+    start = time.perf_counter()
+    client.get_details({"id": "1"})
+    return (time.perf_counter() - start) * 1000
+
+
+def measure_warm_request(url: str) -> float:
+    client = create_client(url, "zenodo")
+    client.get_details({"id": "1"})
+    start = time.perf_counter()
+    client.get_details({"id": "2"})
+    return (time.perf_counter() - start) * 1000
+
+
+def measure_client_memory(url: str) -> float:
+    import tracemalloc
+    import fairly
+    # REMARK: Client class is imported before measurement
+    cls = fairly.get_clients()["zenodo"]
+    count = 100
+    tracemalloc.start()
+    clients = [cls() for _ in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / count / 1024
+
+
+def measure_dataset_memory(url: str) -> float:
+    import tracemalloc
+    client = create_client(url, "zenodo", token="token")
+    tracemalloc.start()
+    datasets = client.get_account_datasets()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / len(datasets) / 1024
+
+
+METRICS = {
+    "import_fairly": ("ms", measure_import_fairly),
+    "get_repositories": ("ms", measure_get_repositories),
+    "metadata_templates": ("ms", measure_metadata_templates),
+    "client": ("ms", measure_client),
+    "first_request": ("ms", measure_first_request),
+    "warm_request": ("ms", measure_warm_request),
+    "client_memory": ("KiB", measure_client_memory),
+    "dataset_memory": ("KiB", measure_dataset_memory),
+}
+
+
+def run_metric(name: str, url: str) -> float:
+    """Measures a metric in a new interpreter process"""
+    output = subprocess.check_output(
+        [sys.executable, __file__, "--measure", name, "--url", url],
+        cwd=os.path.dirname(__file__),
+    )
+    return json.loads(output)
+
+
+def profile_imports(count: int=20) -> None:
+    """Prints the slowest imports of the package by cumulative import time"""
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import fairly"],
+        stderr=subprocess.PIPE, universal_newlines=True, check=True,
+    ).stderr
+
+    items = []
+    for line in output.splitlines():
+        match = re.match(r"^import time:\s*(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)", line)
+        if match:
+            items.append((int(match.group(2)), int(match.group(1)), match.group(4)))
+
+    items.sort(reverse=True)
+    print(f"{'cumulative (ms)':>16}{'self (ms)':>12}  module")
+    for cumulative, self, module in items[:count]:
+        print(f"{cumulative / 1000:>16.1f}{self / 1000:>12.1f}  {module}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Startup benchmarks of the fairly package")
+    add_arguments(parser)
+    parser.add_argument("--profile-imports", action="store_true", help="Print the slowest imports")
+    parser.add_argument("--measure", help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # Measure a metric in the current process
+    if args.measure:
+        print(json.dumps(METRICS[args.measure][1](args.url)))
+        return 0
+
+    if args.profile_imports:
+        profile_imports()
+        return 0
+
+    results: Dict = {}
+    with MockServer(datasets=1000) as server:
+        for name, (unit, _) in METRICS.items():
+            value = median(lambda: run_metric(name, server.url), args.repeat)
+            results[name] = {"value": value, "unit": unit}
+
+    return report(SUITE, results, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
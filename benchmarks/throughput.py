@@ -0,0 +1,215 @@
+"""
+Throughput benchmarks of the transfer paths
+
+Transfers are measured against an in-process mock server for the
+following paths:
+
+- download: Client.download_file() for each file of a Zenodo dataset
+- store: RemoteDataset.store() of a Zenodo dataset
+- store_extract: RemoteDataset.store(extract=True) of a Zenodo dataset of a ZIP archive
+- upload: LocalDataset.upload() to Zenodo
+- figshare_upload: LocalDataset.upload() to Figshare, i.e. part uploads
+
+Each path is measured for the following file size profiles:
+
+- tiny: 256 files of 4 KiB
+- small: 64 files of 64 KiB
+- medium: 16 files of 1 MiB
+- large: 1 file of 32 MiB, downloaded in byte ranges
+
+Throughput of each measurement is reported in MB/s of the file contents
+(``<path>_<profile>``) and in requests per second received by the server
+(``<path>_<profile>_requests``). Results are compared against the stored
+baseline, and the exit status is 1 if a metric regresses more than the
+tolerance or falls below its budget.
+
+Usage:
+    python benchmarks/throughput.py [--repeat N] [--save] [--output results.json]
+    python benchmarks/throughput.py --profile large --path download --chunk-size 1048576
+    python benchmarks/throughput.py --latency 0.05 --bandwidth 10485760 --baseline other.json
+"""
+from typing import Callable, Dict, Tuple
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from common import add_arguments, report
+from server import MockServer
+
+SUITE = "throughput"
+
+# Number of files and file size of the profiles
+PROFILES = {
+    "tiny": (256, 2**12),
+    "small": (64, 2**16),
+    "medium": (16, 2**20),
+    "large": (1, 2**25),
+}
+
+# Transfer paths
+PATHS = ["download", "store", "store_extract", "upload", "figshare_upload"]
+
+# Metadata of the uploaded datasets
+METADATA = {
+    "title": "Throughput benchmark",
+    "type": "dataset",
+    "authors": ["Doe, Jane"],
+    "description": "Throughput benchmark",
+    "access_type": "open",
+}
+
+# License of the uploaded datasets by client identifier
+LICENSES = {
+    "zenodo": "CC-BY-4.0",
+    "figshare": "CC BY 4.0",
+}
+
+
+def get_files(profile: str) -> Dict[str, bytes]:
+    """Returns file contents of a profile by file name"""
+    count, size = PROFILES[profile]
+    files = {}
+    for i in range(count):
+        # REMARK: Contents are different to have different checksums
+        pattern = bytes((i + j) % 256 for j in range(256))
+        files[f"file_{i:04d}.bin"] = (pattern * (size // len(pattern) + 1))[:size]
+    return files
+
+
+def get_archive(files: Dict[str, bytes]) -> bytes:
+    """Returns an uncompressed ZIP archive of the files"""
+    stream = io.BytesIO()
+    with zipfile.ZipFile(stream, "w", zipfile.ZIP_STORED) as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+    return stream.getvalue()
+
+
+def setup_download(server: MockServer, id: int) -> Callable:
+    client = server.create_client("zenodo", token="token")
+    dataset = client.get_dataset(id=str(id))
+    files = list(dataset.files.values())
+
+    def _setup(path: str) -> Callable:
+        def _run() -> None:
+            for file in files:
+                client.download_file(file, path)
+        return _run
+
+    return _setup
+
+
+def setup_store(server: MockServer, id: int, extract: bool=False) -> Callable:
+    client = server.create_client("zenodo", token="token")
+    dataset = client.get_dataset(id=str(id))
+    # REMARK: Metadata and files are retrieved before the measurement
+    dataset.metadata
+    dataset.files
+
+    def _setup(path: str) -> Callable:
+        return lambda: dataset.store(os.path.join(path, "dataset"), extract=extract)
+
+    return _setup
+
+
+def setup_upload(server: MockServer, files: Dict[str, bytes], client_id: str) -> Callable:
+    import fairly
+
+    client = server.create_client(client_id, token="token")
+
+    def _setup(path: str) -> Callable:
+        for name, content in files.items():
+            with open(os.path.join(path, name), "wb") as file:
+                file.write(content)
+
+        dataset = fairly.dataset(path)
+        dataset.set_metadata(**METADATA, license=LICENSES[client_id])
+        dataset.save_metadata()
+        dataset.includes.extend(files)
+        dataset.save_files()
+
+        return lambda: dataset.upload(client)
+
+    return _setup
+
+
+def measure(server: MockServer, setup: Callable, size: int, repeat: int) -> Tuple[float, float]:
+    """Measures throughput of a transfer path.
+
+    Args:
+        server (MockServer): Mock server
+        setup (Callable): Function preparing a measurement in a temporary
+            directory, returns the function to be measured
+        size (int): Total size of the transferred files in bytes
+        repeat (int): Number of repetitions
+
+    Returns:
+        Best throughput in MB/s and requests per second of the repetitions
+    """
+    throughputs = []
+    rates = []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as path:
+            run = setup(path)
+            server.reset_stats()
+            start = time.perf_counter()
+            run()
+            duration = time.perf_counter() - start
+        throughputs.append(size / duration / 10**6)
+        rates.append(server.stats["requests"] / duration)
+        # REMARK: Uploaded datasets are deleted to limit memory usage of the server
+        server.delete_drafts()
+    # REMARK: Short transfers are slowed down by unrelated activity, therefore best results are more stable than medians
+    return max(throughputs), max(rates)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Throughput benchmarks of the transfer paths")
+    add_arguments(parser)
+    parser.add_argument("--profile", action="append", choices=list(PROFILES), help="File size profile to measure (default = all)")
+    parser.add_argument("--path", action="append", choices=PATHS, help="Transfer path to measure (default = all)")
+    parser.add_argument("--chunk-size", type=int, help="Chunk size of the clients in bytes")
+    parser.add_argument("--latency", type=float, default=0, help="Latency of the server in seconds")
+    parser.add_argument("--bandwidth", type=float, help="Bandwidth of each connection in bytes per second")
+    # REMARK: Transfer rates are more sensitive to the load of the machine than the startup costs
+    parser.set_defaults(tolerance=0.4)
+    args = parser.parse_args()
+
+    from fairly.client import Client
+    if args.chunk_size:
+        Client.CHUNK_SIZE = args.chunk_size
+
+    results: Dict = {}
+    with MockServer(datasets=0, latency=args.latency, bandwidth=args.bandwidth) as server:
+        for profile in args.profile or PROFILES:
+            files = get_files(profile)
+            size = sum(len(content) for content in files.values())
+            id = server.add_dataset(files)
+            archive_id = server.add_dataset({"archive.zip": get_archive(files)})
+
+            paths = {
+                "download": lambda: setup_download(server, id),
+                "store": lambda: setup_store(server, id),
+                "store_extract": lambda: setup_store(server, archive_id, extract=True),
+                "upload": lambda: setup_upload(server, files, "zenodo"),
+                "figshare_upload": lambda: setup_upload(server, files, "figshare"),
+            }
+            for path, setup in paths.items():
+                if args.path and path not in args.path:
+                    continue
+                throughput, rate = measure(server, setup(), size, args.repeat)
+                results[f"{path}_{profile}"] = {"value": throughput, "unit": "MB/s"}
+                results[f"{path}_{profile}_requests"] = {"value": rate, "unit": "req/s"}
+
+    return report(SUITE, results, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
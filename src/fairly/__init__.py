@@ -1,7 +1,7 @@
 """
 fairly
 """
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List, Mapping, Tuple
 
 import os
 import json
@@ -9,13 +9,59 @@ import pkgutil
 import importlib
 import shutil
 import glob
+import threading
 from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from .client import Client
 from .dataset import Dataset
 from .dataset.local import LocalDataset
 from .file import File
 
+# Shared client objects by client arguments
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def _get_config_signature(filename: str) -> Tuple:
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=1)
+def _read_config(filename: str, signature: Tuple) -> Dict:
+    """Reads the user configuration file.
+
+    REMARK: Signature (modification time and size) of the file is used as the
+    cache key, therefore the file is read again only if it is modified.
+    """
+    if signature is None:
+        return {}
+    try:
+        with open(filename, "r") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+
+
+# REMARK: @cache decorator can be used for Python 3.9+
+@lru_cache(maxsize=None)
+def _get_environ_config() -> Dict:
+    """Returns configuration parameters of the environmental variables by prefix."""
+    index = {}
+    for key, val in os.environ.items():
+        if not key.startswith("FAIRLY_"):
+            continue
+        # REMARK: Prefixes might include underscores, therefore all splits are indexed
+        name = key[7:]
+        for i, char in enumerate(name):
+            if char == "_" and 0 < i < len(name) - 1:
+                index.setdefault(name[:i], {})[name[i + 1:].lower()] = val
+    return index
+
 
 def get_config(prefix: str) -> Dict:
     """Returns configuration parameters for the specified prefix.
@@ -25,6 +71,10 @@ def get_config(prefix: str) -> Dict:
     1. Configuration file of the user located at ``~/.fairly/config.json``.
     2. Environmental variables of the user.
 
+    The configuration file is read again only if it is modified. The
+    environmental variables are read once, use :func:`reload_config` if they
+    are modified.
+
     .. Attention:: Global and user-defined repository configuration files are not considered by this method.
 
     Args:
@@ -40,56 +90,132 @@ def get_config(prefix: str) -> Dict:
     config = {}
 
     # Read configuration from the user configuration file
-    try:
-        with open(os.path.expanduser("~/.fairly/config.json"), "r") as file:
-            attrs = json.load(file)
-            if prefix in attrs and isinstance(attrs[prefix], dict):
-                config.update(attrs[prefix])
-    except FileNotFoundError:
-        pass
+    filename = os.path.expanduser("~/.fairly/config.json")
+    attrs = _read_config(filename, _get_config_signature(filename))
+    if prefix in attrs and isinstance(attrs[prefix], dict):
+        config.update(attrs[prefix])
 
     # Read configuration from the environmental variables
-    prefix = "FAIRLY_" + prefix.upper() + "_"
-    start = len(prefix)
-    for key, val in os.environ.items():
-        if not key.startswith(prefix):
-            continue
-        key = key[start:].lower()
-        config[key] = val
+    config.update(_get_environ_config().get(prefix.upper(), {}))
 
     return config
 
 
+def reload_config() -> None:
+    """Reloads configuration parameters and recognized repositories.
+
+    Examples:
+        >>> os.environ["FAIRLY_ZENODO_TOKEN"] = "token"
+        >>> fairly.reload_config()
+    """
+    _read_config.cache_clear()
+    _get_environ_config.cache_clear()
+    get_repositories.cache_clear()
+
+
 # REMARK: @cache decorator can be used for Python 3.9+
 @lru_cache(maxsize=None)
-def get_clients() -> Dict:
+def get_clients() -> Mapping:
     """Returns available clients.
 
+    Client modules are imported only when their client classes are accessed.
+
     Returns:
         Dictionary of the available clients. Keys are client identifiers (str), values are client classes (Client).
 
     Raises:
-        AttributeError: If a client module is not valid.
+        AttributeError: If a client module is not valid (when the client class is accessed).
 
     Examples:
         >>> fairly.get_clients()
         >>> {'figshare': <class 'fairly.client.figshare.FigshareClient'>, ...}
     """
-    clients = {}
+    return ClientRegistry(_get_client_modules())
 
-    # For each client module
+
+# REMARK: @cache decorator can be used for Python 3.9+
+@lru_cache(maxsize=None)
+def _get_client_modules() -> Dict:
+    """Returns import paths of the available client modules by client identifier.
+
+    REMARK: Client modules are found without importing them.
+    """
+    modules = {}
     for _, id, _ in pkgutil.iter_modules([os.path.join(__path__[0], "client")]):
-        # Load module
-        client = importlib.import_module(f"fairly.client.{id}")
-        # Get client class name
-        classname = client.CLASS_NAME
-        if not classname:
-            raise AttributeError(f"Invalid client module: {id}")
-        # Set client class
-        clients[id] = getattr(client, classname)
+        modules[id] = f"fairly.client.{id}"
+    return modules
 
-    # Return
-    return clients
+
+class ClientRegistry(Mapping):
+    """Dictionary of client classes importing client modules on first access.
+
+    Attributes:
+        _modules (Dict): Import paths of the client modules by client identifier
+        _classes (Dict): Imported client classes by client identifier
+        _repositories (Dict): Repositories to be configured by client identifier
+        _lock (Lock): Lock of the imports
+    """
+
+    def __init__(self, modules: Dict):
+        self._modules = modules
+        self._classes = {}
+        self._repositories = {}
+        self._lock = threading.Lock()
+
+
+    def __getitem__(self, id: str) -> type:
+        if id not in self._modules:
+            raise KeyError(id)
+        with self._lock:
+            if id not in self._classes:
+                # Load module
+                client = importlib.import_module(self._modules[id])
+                # Get client class name
+                classname = getattr(client, "CLASS_NAME", None)
+                if not classname:
+                    raise AttributeError(f"Invalid client module: {id}")
+                cls = getattr(client, classname)
+                # Set client specific configuration of the repositories
+                for repository, attrs in self._repositories.pop(id, {}).values():
+                    repository.update(cls.get_config(**attrs))
+                # Set client class
+                self._classes[id] = cls
+            return self._classes[id]
+
+
+    def configure(self, repository: Dict, attrs: Dict) -> None:
+        """Sets client specific configuration of a repository.
+
+        Configuration is set when the client class is accessed, if the client
+        module is not imported yet.
+
+        Args:
+            repository (Dict): Repository dictionary
+            attrs (Dict): Repository attributes
+        """
+        id = repository["client_id"]
+        with self._lock:
+            cls = self._classes.get(id)
+            if cls is None:
+                self._repositories.setdefault(id, {})[repository["id"]] = (repository, attrs)
+                return
+        repository.update(cls.get_config(**attrs))
+
+
+    def __contains__(self, id) -> bool:
+        return id in self._modules
+
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._modules)
+
+
+    def __len__(self) -> int:
+        return len(self._modules)
+
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
 
 
 # REMARK: @cache decorator can be used for Python 3.9+
@@ -97,6 +223,10 @@ def get_clients() -> Dict:
 def get_repositories() -> Dict:
     """Returns recognized repositories.
 
+    Client specific parameters (e.g. token) of a repository are set when its
+    client class is accessed, so that client modules are imported only if
+    required.
+
     Returns:
         Dictionary of the recognized repositories. Keys are repository identifiers (str), values are repository
         dictionaries (Dict).
@@ -136,8 +266,10 @@ def get_repositories() -> Dict:
             raise AttributeError(f"Invalid client_id: {id}")
         else:
             repository["client_id"] = attrs["client_id"]
-        client = clients[repository["client_id"]]
-        repository.update(client.get_config(**attrs))
+        repository.update(Client.get_config(**attrs))
+        # REMARK: Client specific parameters (e.g. token) are set when the client class is loaded,
+        # therefore client modules are not imported
+        clients.configure(repository, attrs)
         repositories[id] = repository
 
     # Return
@@ -195,13 +327,34 @@ def get_repository(uid: str) -> Dict:
     return None
 
 
+def _get_key(*args) -> str:
+    # REMARK: Values that cannot be serialized are represented by their string representations
+    return json.dumps(args, sort_keys=True, default=repr)
+
+
 def client(id: str, **kwargs) -> Client:
-    """Creates client object from a client or repository identifier.
+    """Returns client object of a client or repository identifier.
 
     Identifier is first checked within recognized repository identifiers. If
     no match is found, it is regarded as a client identifier. Additional
     client arguments (e.g. API URL address) might be necessary for the later.
 
+    Client objects are shared within the process. The same client object is
+    returned for the same identifier and arguments as long as the effective
+    configuration is not changed, so that sessions and caches are reused.
+    Shared client objects can be used by multiple threads, and their sessions
+    are created once on first use. Shared client objects can be discarded by
+    :func:`clear_clients`.
+
+    Dataset objects are also reused by the shared client objects, therefore
+    details retrieved once are not updated if the dataset is modified at the
+    repository. Use ``get_dataset(id, refresh=True)`` of the client to
+    retrieve the dataset again.
+
+    Configuration file of the user is checked on each call, and a new client
+    object is created if the effective configuration is modified. Use
+    :func:`reload_config` if the environmental variables are modified.
+
     Args:
         id (str): Client or repository identifier.
         **kwargs: Other client arguments.
@@ -229,7 +382,69 @@ def client(id: str, **kwargs) -> Client:
     if id not in clients:
         raise ValueError(f"Invalid client id: {id}")
 
-    return clients[id](**kwargs)
+    cls = clients[id]
+    key = (id, kwargs.get("repository_id"), _get_key(kwargs))
+    config = _get_key(cls.collect_config(**kwargs))
+
+    with _clients_lock:
+        if key in _clients:
+            client_config, client = _clients[key]
+            if client_config == config:
+                return client
+        client = cls(**kwargs)
+        _clients[key] = (config, client)
+        return client
+
+
+def clear_clients(id: str = None) -> None:
+    """Discards shared client objects.
+
+    Args:
+        id (str): Client or repository identifier (optional). All shared client
+            objects are discarded if not specified.
+
+    Examples:
+        >>> fairly.clear_clients("zenodo")
+    """
+    with _clients_lock:
+        if id is None:
+            _clients.clear()
+        else:
+            for key in [key for key in _clients if id in key[:2]]:
+                del _clients[key]
+
+
+def _resolve_dataset_id(id: str) -> Tuple[str, Dict]:
+    """Resolves repository of a dataset identifier.
+
+    Args:
+        id (str): Dataset identifier.
+
+    Returns:
+        Tuple of repository identifier and dataset identifier arguments.
+        Repository identifier is ``None`` for a local dataset.
+
+    Raises:
+        ValueError: If unknown dataset identifier.
+    """
+    key, val = Client.parse_id(id)
+
+    if key == "url":
+        for repository_id, repository in get_repositories().items():
+            url = repository.get("url")
+            if url and val.startswith(url):
+                return repository_id, {"url": val}
+
+    elif key == "doi":
+        for repository_id, repository in get_repositories().items():
+            for prefix in repository.get("doi_prefixes", []):
+                if prefix and val.startswith(prefix):
+                    return repository_id, {"doi": val}
+
+    else:
+        return None, {"path": id}
+
+    raise ValueError(f"Unknown dataset identifier: {id}")
 
 
 def dataset(id: str) -> Dataset:
@@ -243,6 +458,10 @@ def dataset(id: str) -> Dataset:
     Repository of the dataset is automatically detected by checking the URL
     addresses and the DOI prefixes of the recognized repositories.
 
+    Remote datasets are retrieved by the shared client objects (see
+    :func:`client`), therefore the same dataset object is returned for the
+    same dataset and its details are not updated afterwards.
+
     Args:
         id (str): Dataset identifier.
 
@@ -256,24 +475,81 @@ def dataset(id: str) -> Dataset:
         >>> dataset = fairly.dataset("10.5281/zenodo.6026285")
         >>> dataset = fairly.dataset("https://zenodo.org/record/6026285")
     """
-    key, val = Client.parse_id(id)
+    repository_id, kwargs = _resolve_dataset_id(id)
 
-    if key == "url":
-        for repository_id, repository in get_repositories().items():
-            url = repository.get("url")
-            if url and val.startswith(url):
-                return client(repository_id).get_dataset(url=url)
+    if repository_id is None:
+        return LocalDataset(kwargs["path"])
 
-    elif key == "doi":
-        for repository_id, repository in get_repositories().items():
-            for prefix in repository.get("doi_prefixes", []):
-                if prefix and val.startswith(prefix):
-                    return client(repository_id).get_dataset(doi=doi)
+    return client(repository_id).get_dataset(**kwargs)
 
-    else:
-        return LocalDataset(id)
 
-    raise ValueError(f"Unknown dataset identifier: {id}")
+def datasets(ids: Iterable[str], workers: int = 8) -> Iterator[Tuple[str, Dataset, Exception]]:
+    """Creates dataset objects from multiple dataset identifiers.
+
+    Identifiers are grouped by repository and a single client is used for
+    each repository. Details and metadata of the datasets are retrieved
+    concurrently, and the results are returned in the order of completion.
+
+    Args:
+        ids (Iterable[str]): Dataset identifiers (see :func:`dataset`).
+        workers (int): Maximum number of concurrent retrievals (default = 8).
+
+    Yields:
+        Tuple of dataset identifier, dataset object and exception. Dataset
+        object is ``None`` if an error occurred while retrieving the dataset,
+        exception is ``None`` otherwise.
+
+    Examples:
+        >>> for id, dataset, error in fairly.datasets(["10.5281/zenodo.6026285", ...]):
+        >>>     if error is None:
+        >>>         print(id, dataset.metadata["title"])
+    """
+    clients = {}
+
+    def _get_dataset(id: str, repository_id: str, kwargs: Dict) -> Dataset:
+        if repository_id is None:
+            return LocalDataset(kwargs["path"])
+        dataset = clients[repository_id].get_dataset(**kwargs)
+        # Retrieve details and metadata
+        dataset.title
+        dataset.metadata
+        return dataset
+
+    # Group identifiers by repository
+    groups = {}
+    for id in ids:
+        try:
+            repository_id, kwargs = _resolve_dataset_id(id)
+        except ValueError as err:
+            yield id, None, err
+            continue
+        groups.setdefault(repository_id, []).append((id, kwargs))
+
+    # Create a client for each repository
+    for repository_id in list(groups):
+        if repository_id is None:
+            continue
+        try:
+            clients[repository_id] = client(repository_id)
+        except Exception as err:
+            for id, _ in groups.pop(repository_id):
+                yield id, None, err
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {}
+        for repository_id, items in groups.items():
+            for id, kwargs in items:
+                futures[executor.submit(_get_dataset, id, repository_id, kwargs)] = id
+        try:
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result(), None
+                except Exception as err:
+                    yield futures[future], None, err
+        finally:
+            # REMARK: Pending retrievals are cancelled if iteration is stopped
+            for future in futures:
+                future.cancel()
 
 
 def init_dataset(path: str, template: str = "default", manifest_file: str = "manifest.yaml", create: bool = True) -> LocalDataset:
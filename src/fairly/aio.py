@@ -0,0 +1,489 @@
+"""
+Asynchronous client interface
+
+Requires the optional ``httpx`` package (``pip install fairly[async]``).
+
+Examples:
+    >>> async with fairly.aio.AsyncClient("zenodo") as client:
+    >>>     datasets = await asyncio.gather(*[client.get_dataset(id) for id in ids])
+"""
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+from .client import Client
+from .dataset.remote import RemoteDataset
+from .file.local import LocalFile
+from .file.remote import RemoteFile
+from .metadata import Metadata
+from .ratelimit import get_rate_limiter
+from . import metrics
+
+import os
+import asyncio
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import requests
+from requests.structures import CaseInsensitiveDict
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+class AsyncClient:
+    """Asynchronous interface of a repository client.
+
+    Dataset details, metadata and files are retrieved, and files are
+    downloaded, by a pooled asynchronous HTTP client, therefore many requests
+    share a single event loop. Responses are parsed by the synchronous client.
+    Versions, account datasets and uploads are not supported by the
+    asynchronous HTTP client yet, and run the methods of the synchronous
+    client in worker threads.
+
+    Attributes:
+        client (Client): Synchronous client
+        _http (httpx.AsyncClient): Asynchronous HTTP client
+        _executor (ThreadPoolExecutor): Worker threads of the synchronous client methods
+        _metadata_prepared (bool): True if the lists required to parse the metadata are retrieved
+        _metadata_lock (asyncio.Lock): Lock of the metadata preparation
+    """
+
+    # Maximum number of concurrent connections
+    MAX_CONNECTIONS = 100
+
+    # Maximum number of concurrent synchronous client methods
+    MAX_WORKERS = 16
+
+
+    def __init__(self, client: Union[Client, str], **kwargs):
+        """Initializes AsyncClient object.
+
+        Args:
+            client: Synchronous client object, or client or repository identifier
+            **kwargs: Other client arguments if identifier is specified
+
+        Raises:
+            ImportError: If httpx is not installed
+        """
+        if httpx is None:
+            raise ImportError("httpx is required for the asynchronous client")
+
+        if isinstance(client, str):
+            import fairly
+            client = fairly.client(client, **kwargs)
+
+        self.client = client
+        self._http = None
+        self._executor = None
+        self._metadata_prepared = False
+        self._metadata_lock = None
+
+
+    async def __aenter__(self) -> "AsyncClient":
+        return self
+
+
+    async def __aexit__(self, *args) -> None:
+        await self.aclose()
+
+
+    async def aclose(self) -> None:
+        """Closes connections of the asynchronous HTTP client and stops the worker threads"""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+        if self._executor is not None:
+            executor = self._executor
+            self._executor = None
+            # REMARK: Worker threads are joined without blocking the event loop
+            await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+
+
+    def _get_http(self) -> "httpx.AsyncClient":
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.MAX_CONNECTIONS,
+                    max_keepalive_connections=self.MAX_CONNECTIONS,
+                ),
+                timeout=httpx.Timeout(None),
+                follow_redirects=True,
+            )
+        return self._http
+
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.MAX_WORKERS)
+        return self._executor
+
+
+    def _get_headers(self, headers: Dict=None) -> Dict:
+        """Returns session headers of the synchronous client merged with the request headers"""
+        _headers = dict(self.client._get_session().headers)
+        if headers:
+            _headers.update(headers)
+        return _headers
+
+
+    @staticmethod
+    def _create_response(response: "httpx.Response", content: bytes=b"") -> requests.Response:
+        """Creates requests response object of a httpx response"""
+        _response = requests.Response()
+        _response.url = str(response.url)
+        _response.status_code = response.status_code
+        _response.reason = response.reason_phrase
+        _response.headers = CaseInsensitiveDict(response.headers)
+        _response._content = content
+        _response.encoding = requests.utils.get_encoding_from_headers(_response.headers)
+        return _response
+
+
+    async def _run(self, method: Callable, *args, **kwargs) -> Any:
+        """Runs a method of the synchronous client in a worker thread
+
+        Args:
+            method (Callable): Synchronous client method
+            *args: Method arguments
+            **kwargs: Method keyword arguments
+
+        Returns:
+            Return value of the method
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), partial(method, *args, **kwargs))
+
+
+    async def _send_request(self, method: str, url: str, headers: Dict=None, event: metrics.RequestEvent=None) -> requests.Response:
+        """Sends a HTTP request with retries by the asynchronous HTTP client
+
+        Retries and rate limits are applied as specified by the synchronous
+        client.
+
+        Args:
+            method (str): HTTP method
+            url (str): URL address
+            headers (Dict): Request headers (optional)
+            event (RequestEvent): Request event to count the tries (optional)
+
+        Returns:
+            Response of the last try
+        """
+        client = self.client
+        rate_limiter = get_rate_limiter(client.config["api_url"])
+        idempotent = method.upper() in client.IDEMPOTENT_METHODS
+
+        tries = 0
+        while True:
+            tries += 1
+            if event and tries > 1:
+                event.tries += 1
+
+            sleep = rate_limiter.reserve()
+            if sleep > 0:
+                await asyncio.sleep(sleep)
+
+            try:
+                response = await self._get_http().request(method, url, headers=self._get_headers(headers))
+            except httpx.TransportError:
+                if not idempotent or tries >= client.RETRY_TRIES:
+                    raise
+                await asyncio.sleep(client._get_retry_sleep(tries))
+                continue
+
+            rate_limiter.update(response.headers, response.status_code)
+            response = self._create_response(response, response.content)
+
+            if response.status_code not in client.RETRY_STATUS_CODES or tries >= client.RETRY_TRIES:
+                return response
+            if not idempotent and response.status_code != 429:
+                return response
+
+            await asyncio.sleep(client._get_retry_sleep(tries, response))
+
+
+    async def _request(self, endpoint: str) -> Tuple[Any, requests.Response]:
+        """Sends a GET request to an end-point and returns the result
+
+        Persistent cache of the synchronous client is used if the end-point
+        is cacheable.
+
+        Args:
+            endpoint (str): Request end-point
+
+        Returns:
+            Returned content and response
+
+        Raises:
+            ValueError("No API URL address")
+            HTTPError
+        """
+        client = self.client
+        if not client.config["api_url"]:
+            raise ValueError("No API URL address")
+
+        url = client.config["api_url"] + endpoint
+
+        headers = {}
+        if client.REQUEST_FORMAT == "json":
+            headers["Accept"] = "application/json"
+
+        loop = asyncio.get_running_loop()
+
+        with metrics.record(client.client_id, "GET", url, client.config["api_url"]) as event:
+            response = None
+            cache = None
+            ttl = client._get_cache_ttl(endpoint)
+            if ttl:
+                # REMARK: Cache files are accessed by the default executor not to block the event loop
+                cache = client._get_http_cache()
+                key = cache.get_key(url, self._get_headers().get("Authorization"))
+                entry = await loop.run_in_executor(None, cache.get, key)
+                if entry:
+                    if cache.is_fresh(entry, ttl):
+                        response = cache.create_response(entry)
+                        event.cache = "hit"
+                    else:
+                        headers.update(cache.get_validators(entry))
+
+            if response is None:
+                response = await self._send_request("GET", url, headers, event)
+                event.status = response.status_code
+                event.bytes_received = len(response.content)
+
+                if cache:
+                    event.cache = "miss"
+                    if response.status_code == 304 and entry:
+                        await loop.run_in_executor(None, cache.refresh, key, entry)
+                        response = cache.create_response(entry)
+                        event.cache = "revalidated"
+                    elif response.status_code == 200:
+                        await loop.run_in_executor(None, cache.set, key, response)
+            else:
+                event.status = response.status_code
+
+            response.raise_for_status()
+
+        if response.content:
+            if client.REQUEST_FORMAT == "json":
+                content = response.json()
+            else:
+                content = response.content
+        else:
+            content = None
+
+        return content, response
+
+
+    async def _get_dataset_details(self, id: Dict) -> Dict:
+        """Retrieves dataset details and stores them in the details cache of the synchronous client
+
+        Args:
+            id (Dict): Standard dataset id
+
+        Returns:
+            Dictionary of dataset details
+
+        Raises:
+            ValueError("Invalid dataset id")
+            HTTPError
+        """
+        client = self.client
+        details = client._get_details(id)
+        if details:
+            return details
+
+        details = None
+        for endpoint in client._get_details_endpoints(id):
+            try:
+                details, _ = await self._request(endpoint)
+                break
+            except requests.HTTPError as err:
+                if err.response.status_code not in client.DETAILS_SKIPPED_STATUS_CODES:
+                    raise
+
+        if not details:
+            raise ValueError("Invalid dataset id")
+
+        client._set_details(id, details)
+
+        return details
+
+
+    async def _prepare_metadata(self) -> None:
+        """Retrieves lists required to parse the metadata once (e.g. licenses)"""
+        if self._metadata_prepared:
+            return
+
+        # REMARK: Lock is created by the running event loop
+        if self._metadata_lock is None:
+            self._metadata_lock = asyncio.Lock()
+
+        async with self._metadata_lock:
+            if not self._metadata_prepared:
+                await self._run(self.client._prepare_metadata)
+                self._metadata_prepared = True
+
+
+    async def get_dataset(self, id=None, refresh: bool=False, **kwargs) -> RemoteDataset:
+        """Returns the dataset with its details retrieved
+
+        Args:
+            id: Dataset identifier
+            refresh (bool): Set True to refresh the dataset (default = False)
+            **kwargs: Other identifier arguments
+
+        Returns:
+            Dataset
+        """
+        dataset = self.client.get_dataset(id, refresh=refresh, **kwargs)
+        await self._get_dataset_details(dataset.id)
+        # REMARK: Details are parsed by the synchronous client without awaiting, therefore they are still cached
+        dataset.title
+        return dataset
+
+
+    async def get_versions(self, id, refresh: bool=False, **kwargs) -> List[RemoteDataset]:
+        """Returns datasets of all available versions of the specified dataset
+
+        REMARK: Version queries are run by the synchronous client in a worker thread
+        """
+        return await self._run(self.client.get_versions, id, refresh, **kwargs)
+
+
+    async def get_account_datasets(self, refresh: bool=False) -> List[RemoteDataset]:
+        """Returns datasets of the account
+
+        REMARK: Account pages are retrieved by the synchronous client in a worker thread
+        """
+        return await self._run(self.client.get_account_datasets, refresh)
+
+
+    async def get_details(self, id: Dict) -> Dict:
+        """Returns standard details of the specified dataset"""
+        await self._get_dataset_details(id)
+        return self.client.get_details(id)
+
+
+    async def get_metadata(self, id: Dict) -> Metadata:
+        """Returns standard metadata of the specified dataset"""
+        await self._prepare_metadata()
+        await self._get_dataset_details(id)
+        return self.client.get_metadata(id)
+
+
+    async def get_files(self, id: Dict) -> List[RemoteFile]:
+        """Returns files of the specified dataset"""
+        await self._get_dataset_details(id)
+        return self.client.get_files(id)
+
+
+    async def download_file(self, file: RemoteFile, path: str=None, name: str=None, notify: Callable=None) -> LocalFile:
+        """Downloads the specified remote file
+
+        Data is downloaded to a partial file with the ``.part`` extension,
+        which is renamed after the download is completed and verified.
+        Download is restarted on connection errors and temporary server errors
+        as specified by the retry settings of the synchronous client.
+
+        Args:
+            file (RemoteFile): Remote file
+            path (str): Path of the directory to download to (default = current working directory)
+            name (str): Name of the local file (default = name of the remote file)
+            notify (Callable): Notification callback function
+
+        Returns:
+            Local file
+
+        Raises:
+            ValueError("No URL address")
+            IOError("Incomplete download")
+            IOError("Invalid MD5 checksum")
+        """
+        if not file.url:
+            raise ValueError("No URL address")
+        if not path:
+            path = os.getcwd()
+        if not name:
+            name = file.name
+        fullpath = os.path.join(path, name)
+        partpath = f"{fullpath}.part"
+
+        os.makedirs(os.path.dirname(fullpath), exist_ok=True)
+
+        client = self.client
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        rate_limiter = get_rate_limiter(client.config["api_url"])
+
+        def _write(local_file, md5, chunk: bytes) -> None:
+            local_file.write(chunk)
+            md5.update(chunk)
+
+        try:
+            with metrics.record(client.client_id, "GET", file.url) as event:
+                tries = 0
+                while True:
+                    tries += 1
+                    event.tries = tries
+
+                    sleep = rate_limiter.reserve()
+                    if sleep > 0:
+                        await asyncio.sleep(sleep)
+
+                    md5 = hashlib.md5()
+                    current_size = 0
+                    try:
+                        async with self._get_http().stream("GET", file.url, headers=self._get_headers()) as response:
+                            rate_limiter.update(response.headers, response.status_code)
+                            event.status = response.status_code
+                            if response.status_code in client.RETRY_STATUS_CODES and tries < client.RETRY_TRIES:
+                                await asyncio.sleep(client._get_retry_sleep(tries, self._create_response(response)))
+                                continue
+                            if response.status_code >= 400:
+                                self._create_response(response).raise_for_status()
+
+                            # REMARK: Disk writes and hashing are run by the worker threads
+                            with open(partpath, "wb") as local_file:
+                                async for chunk in response.aiter_bytes(client.CHUNK_SIZE):
+                                    await loop.run_in_executor(executor, _write, local_file, md5, chunk)
+                                    current_size += len(chunk)
+                                    event.bytes_received = current_size
+                                    if notify:
+                                        notify(file, current_size)
+                        break
+
+                    except httpx.TransportError:
+                        if tries >= client.RETRY_TRIES:
+                            raise
+                        await asyncio.sleep(client._get_retry_sleep(tries))
+
+            try:
+                size = int(file.size)
+            except (TypeError, ValueError):
+                size = None
+            if size is not None and current_size != size:
+                raise IOError("Incomplete download")
+
+            md5 = md5.hexdigest()
+            if file.md5 and file.md5 != md5:
+                raise IOError("Invalid MD5 checksum")
+
+            os.replace(partpath, fullpath)
+
+        except:
+            if os.path.isfile(partpath):
+                os.remove(partpath)
+            raise
+
+        return LocalFile(fullpath, basepath=path, md5=md5)
+
+
+    async def upload_file(self, dataset, file, notify: Callable=None) -> RemoteFile:
+        """Uploads the specified file to the dataset
+
+        REMARK: File is uploaded by the synchronous client in a worker thread
+        """
+        return await self._run(self.client.upload_file, dataset, file, notify)
@@ -0,0 +1,287 @@
+from typing import Any, Dict, Hashable
+
+from collections import OrderedDict
+from requests.structures import CaseInsensitiveDict
+import requests
+import os
+import json
+import base64
+import hashlib
+import tempfile
+import threading
+import time
+
+
+class Cache:
+    """Thread-safe in-memory cache with expiration and LRU eviction.
+
+    Attributes:
+        max_size (int): Maximum number of items, None for no limit
+        ttl (float): Lifetime of the items in seconds, None for no expiration
+        _items (OrderedDict): Cached items and their expiration times
+        _lock (Lock): Lock of the cached items
+    """
+
+    def __init__(self, max_size: int=None, ttl: float=None):
+        """Initializes Cache object.
+
+        Args:
+            max_size (int): Maximum number of items (optional)
+            ttl (float): Lifetime of the items in seconds (optional)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+    def get(self, key: Hashable, default: Any=None) -> Any:
+        """Returns the cached item.
+
+        Args:
+            key (Hashable): Item key
+            default (Any): Default value if the item is not cached or expired
+
+        Returns:
+            Cached item if valid, default value otherwise
+        """
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return default
+
+            val, expires = item
+            if expires is not None and time.monotonic() > expires:
+                del self._items[key]
+                return default
+
+            # Mark item as recently used
+            self._items.move_to_end(key)
+
+            return val
+
+
+    def set(self, key: Hashable, val: Any) -> None:
+        """Stores an item in the cache.
+
+        Least recently used items are removed if the cache is full.
+
+        Args:
+            key (Hashable): Item key
+            val (Any): Item value
+        """
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+
+        with self._lock:
+            self._items[key] = (val, expires)
+            self._items.move_to_end(key)
+
+            if self.max_size is not None:
+                while len(self._items) > self.max_size:
+                    self._items.popitem(last=False)
+
+
+    def delete(self, key: Hashable) -> None:
+        """Removes an item from the cache.
+
+        Args:
+            key (Hashable): Item key
+        """
+        with self._lock:
+            self._items.pop(key, None)
+
+
+    def clear(self) -> None:
+        """Removes all items from the cache."""
+        with self._lock:
+            self._items.clear()
+
+
+class HTTPCache:
+    """Persistent cache of HTTP responses stored on the disk.
+
+    Each response is stored as a JSON file named by the hash of its key.
+    Least recently used responses are removed if the total size of the cache
+    exceeds the maximum size. Files are replaced atomically, therefore the
+    cache can be shared by concurrent processes.
+
+    Attributes:
+        path (str): Path of the cache directory
+        max_size (int): Maximum total size of the cached responses in bytes
+    """
+
+    PATH = "~/.fairly/cache"
+
+    MAX_SIZE = 2**28
+
+    # REMARK: Headers are not valid for the decoded content
+    IGNORED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+    def __init__(self, path: str=None, max_size: int=None):
+        """Initializes HTTPCache object.
+
+        Args:
+            path (str): Path of the cache directory (default = ~/.fairly/cache)
+            max_size (int): Maximum total size of the cached responses in bytes (optional)
+        """
+        self.path = os.path.expanduser(path if path else self.PATH)
+        self.max_size = max_size if max_size is not None else self.MAX_SIZE
+
+
+    @staticmethod
+    def get_key(url: str, auth: str=None) -> str:
+        """Returns cache key of a request.
+
+        Args:
+            url (str): URL address of the request
+            auth (str): Authorization header of the request (optional)
+
+        Returns:
+            Cache key
+        """
+        # REMARK: Responses of different users are stored separately
+        return hashlib.sha256(f"{url}\n{auth or ''}".encode("utf-8")).hexdigest()
+
+
+    def _get_filename(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}.json")
+
+
+    def get(self, key: str) -> Dict:
+        """Returns the cached response entry.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            Response entry if cached, None otherwise
+        """
+        filename = self._get_filename(key)
+        try:
+            with open(filename, "r") as file:
+                entry = json.load(file)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        # Mark entry as recently used
+        try:
+            os.utime(filename)
+        except OSError:
+            pass
+
+        return entry
+
+
+    def set(self, key: str, response: requests.Response) -> Dict:
+        """Stores a response in the cache.
+
+        Args:
+            key (str): Cache key
+            response (Response): Response to be stored
+
+        Returns:
+            Response entry
+        """
+        entry = {
+            "url": response.url,
+            "status_code": response.status_code,
+            "headers": {
+                name: val for name, val in response.headers.items() if name.lower() not in self.IGNORED_HEADERS
+            },
+            "content": base64.b64encode(response.content).decode("ascii"),
+            "time": time.time(),
+        }
+        self._save(key, entry)
+        self._prune()
+        return entry
+
+
+    def refresh(self, key: str, entry: Dict) -> None:
+        """Marks a cached response as validated by the server.
+
+        Args:
+            key (str): Cache key
+            entry (Dict): Response entry
+        """
+        entry["time"] = time.time()
+        self._save(key, entry)
+
+
+    def _save(self, key: str, entry: Dict) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        fd, temppath = tempfile.mkstemp(suffix=".tmp", dir=self.path)
+        try:
+            with os.fdopen(fd, "w") as file:
+                json.dump(entry, file)
+            os.replace(temppath, self._get_filename(key))
+        except:
+            try:
+                os.remove(temppath)
+            except FileNotFoundError:
+                pass
+            raise
+
+
+    def _prune(self) -> None:
+        """Removes least recently used responses if the cache is full."""
+        entries = []
+        total_size = 0
+        with os.scandir(self.path) as items:
+            for item in items:
+                if not item.name.endswith(".json"):
+                    continue
+                try:
+                    stat = item.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, item.path))
+                total_size += stat.st_size
+
+        if total_size <= self.max_size:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_size -= size
+            if total_size <= self.max_size:
+                break
+
+
+    @staticmethod
+    def is_fresh(entry: Dict, ttl: float) -> bool:
+        """Checks if a cached response can be used without validation."""
+        return time.time() - entry["time"] < ttl
+
+
+    @staticmethod
+    def get_validators(entry: Dict) -> Dict:
+        """Returns conditional request headers of a cached response."""
+        headers = {}
+        for name, val in entry["headers"].items():
+            if name.lower() == "etag":
+                headers["If-None-Match"] = val
+            elif name.lower() == "last-modified":
+                headers["If-Modified-Since"] = val
+        return headers
+
+
+    @staticmethod
+    def create_response(entry: Dict) -> requests.Response:
+        """Creates response object of a cached response."""
+        response = requests.Response()
+        response.url = entry["url"]
+        response.status_code = entry["status_code"]
+        response.reason = "OK"
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response._content = base64.b64decode(entry["content"])
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        return response
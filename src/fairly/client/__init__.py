@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Any, Dict, List, Tuple, Union
+from typing import Any, Callable, Dict, Iterator, List, Tuple, Union
 from abc import ABC, abstractmethod
 
 import fairly
@@ -7,6 +7,11 @@ from ..dataset.remote import RemoteDataset
 from ..file.local import LocalFile
 from ..file.remote import RemoteFile
 from ..metadata import Metadata
+from ..cache import Cache, HTTPCache
+from ..ratelimit import get_rate_limiter, get_retry_after
+from ..transport import TransportAdapter
+from .. import metrics
+from ..metrics import RequestEvent
 
 import os
 import os.path
@@ -14,7 +19,11 @@ import re
 import json
 import requests
 import hashlib
-import http.client
+import random
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
 
 class Client(ABC):
     """
@@ -22,9 +31,12 @@ class Client(ABC):
     Attributes:
         config (dict): Configuration options
         _session (Session): HTTP session object
+        _session_lock (Lock): Lock of the session and persistent cache creation
         _datasets (dict): Public dataset cache
         _account_datasets (List): Account dataset cache
         _licenses (List): Licenses cache
+        _details (Cache): Dataset details cache
+        _http_cache (HTTPCache): Persistent HTTP response cache
     """
 
     REGEXP_URL = re.compile(r"^[(http(s)?):\/\/(www\.)?a-zA-Z0-9@:%._\+~#=]{2,256}\.[a-z]{2,6}\b([-a-zA-Z0-9@:%_\+.~#?&//=]*)$", re.IGNORECASE)
@@ -33,40 +45,66 @@ class Client(ABC):
 
     CHUNK_SIZE = 2**16
 
+    PART_SIZE = 2**23
+
+    DOWNLOAD_CONNECTIONS = 4
+
+    DOWNLOAD_WORKERS = 4
+
+    UPLOAD_WORKERS = 4
+
+    # Maximum number of concurrent page and dataset retrievals
+    PAGE_WORKERS = 4
+
+    # Socket buffer size in bytes, None to use the operating system defaults
+    SOCKET_BUFFER_SIZE = None
+
+    # Number of connection pools (hosts) and maximum connections per pool
+    POOL_CONNECTIONS = 4
+    POOL_MAXSIZE = 16
+
+    # Lifetime of the cached dataset details in seconds
+    KEEP_ALIVE = 10
+
+    DETAILS_CACHE_SIZE = 256
+
+    # Maximum number of tries of a failed request
+    RETRY_TRIES = 5
+
+    # Initial and maximum waiting times between the tries in seconds
+    RETRY_SLEEP = 1
+    RETRY_MAX_SLEEP = 60
+
+    RETRY_STATUS_CODES = [429, 500, 502, 503, 504]
+
+    # REMARK: Other requests are retried only if rejected by the rate limit
+    IDEMPOTENT_METHODS = ["GET", "HEAD", "PUT", "DELETE", "OPTIONS"]
+
+    # Status codes of the dataset details end-points that are skipped to try the next one
+    DETAILS_SKIPPED_STATUS_CODES = [404]
+
+    # Lifetimes of the persistently cached GET requests in seconds
+    # REMARK: List of (endpoint regular expression, lifetime) tuples
+    CACHE_TTL = []
+
 
     def __init__(self, repository_id: str=None, **kwargs):
         # Get client id
         self._client_id = self.__module__.split(".")[-1]
 
-        # Get configuration from environmental variables by client id
-        config = fairly.get_config(self._client_id)
-
-        # Check if repository id is specified
-        if repository_id:
-            repository = fairly.get_repository(repository_id)
-            if repository:
-                if repository["client_id"] != self._client_id:
-                    raise ValueError("Repository id mismatch")
-                # Append configuration from repository
-                config.update(repository)
-                # Append configuration from environmental variables
-                # REMARK: Required even if client id equal to repository id
-                config.update(fairly.get_config(repository_id))
-            elif re.match(Client.REGEXP_URL, repository_id):
-                kwargs["api_url"] = repository_id
         self._repository_id = repository_id
 
-        # Append named arguments
-        config.update(kwargs)
-
         # Set configuration
-        self.config = type(self).get_config(**config)
+        self.config = type(self).get_config(**type(self).collect_config(repository_id, **kwargs))
 
         # Initialize attributes
         self._session = None
+        self._session_lock = threading.Lock()
         self._datasets = {}
         self._account_datasets = None
         self._licenses = None
+        self._details = self._create_details_cache()
+        self._http_cache = None
 
 
     @property
@@ -81,6 +119,49 @@ class Client(ABC):
         return self._repository_id
 
 
+    @classmethod
+    def collect_config(cls, repository_id: str=None, **kwargs) -> Dict:
+        """Returns configuration parameters collected from all sources
+
+        Parameters are collected from the user configuration of the client,
+        repository configuration, user configuration of the repository and
+        the named arguments, respectively. Parameters are not validated.
+
+        Args:
+            repository_id (str): Repository identifier or API URL address (optional)
+            **kwargs: Named arguments
+
+        Returns:
+            Dictionary of configuration parameters
+
+        Raises:
+            ValueError("Repository id mismatch")
+        """
+        client_id = cls.__module__.split(".")[-1]
+
+        # Get configuration from environmental variables by client id
+        config = fairly.get_config(client_id)
+
+        # Check if repository id is specified
+        if repository_id:
+            repository = fairly.get_repository(repository_id)
+            if repository:
+                if repository["client_id"] != client_id:
+                    raise ValueError("Repository id mismatch")
+                # Append configuration from repository
+                config.update(repository)
+                # Append configuration from environmental variables
+                # REMARK: Required even if client id equal to repository id
+                config.update(fairly.get_config(repository_id))
+            elif re.match(Client.REGEXP_URL, repository_id):
+                kwargs["api_url"] = repository_id
+
+        # Append named arguments
+        config.update(kwargs)
+
+        return config
+
+
     @classmethod
     def get_config_parameters(cls) -> Dict:
         """Returns configuration parameters
@@ -97,6 +178,7 @@ class Client(ABC):
             "url": "URL address of the repository.",
             "api_url": "API end-point URL address of the repository.",
             "doi_prefixes": "DOI prefixes of the repository.",
+            "cache": "Set true to cache read-only metadata requests on the disk.",
         }
 
 
@@ -118,6 +200,8 @@ class Client(ABC):
                 if not isinstance(val, list):
                     raise ValueError("Invalid DOI prefixes")
                 config["doi_prefixes"] = val
+            elif key == "cache":
+                config["cache"] = val is True or str(val).lower() in ["1", "true", "yes", "on"]
             else:
                 pass
         return config
@@ -229,6 +313,63 @@ class Client(ABC):
         raise NotImplementedError
 
 
+    def _create_details_cache(self) -> Cache:
+        """Creates dataset details cache
+
+        Subclasses can override this method to use a different cache.
+
+        Returns:
+            Dataset details cache
+        """
+        return Cache(max_size=self.DETAILS_CACHE_SIZE, ttl=self.KEEP_ALIVE)
+
+
+    def _set_details(self, id: Dict, details: Dict) -> None:
+        """Stores dataset details in the cache.
+
+        Args:
+            id (Dict): Standard dataset id.
+            details (Dict): Dataset details. Set None to clear the cached details.
+
+        Returns:
+            None
+        """
+        hash = self._get_dataset_hash(id)
+
+        if details:
+            self._details.set(hash, details)
+
+        else:
+            self._details.delete(hash)
+
+
+    def _get_details(self, id: Dict) -> Dict:
+        """Returns cached dataset details.
+
+        Args:
+            id (Dict): Standard dataset id.
+
+        Returns:
+            Dataset details dictionary if cache is valid, None otherwise.
+        """
+        return self._details.get(self._get_dataset_hash(id))
+
+
+    def _get_details_endpoints(self, id: Dict) -> List[str]:
+        """Returns end-points of the dataset details in order of preference
+
+        The first end-point that does not respond with one of the
+        ``DETAILS_SKIPPED_STATUS_CODES`` provides the details.
+
+        Args:
+            id (Dict): Standard dataset id
+
+        Returns:
+            List of end-points
+        """
+        raise NotImplementedError
+
+
     @classmethod
     def normalize(cls, name: str, val) -> Any:
         """Normalized metadata attribute value
@@ -301,8 +442,142 @@ class Client(ABC):
         return dataset
 
 
-    def _create_session(self) -> Session:
-        return requests.Session()
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+
+        # REMARK: Transport adapter sets block size without patching http.client globally
+        # ref: https://stackoverflow.com/questions/72977722/python-requests-post-very-slow
+        adapter = TransportAdapter(
+            blocksize=self.CHUNK_SIZE,
+            buffer_size=self.SOCKET_BUFFER_SIZE,
+            pool_connections=self.POOL_CONNECTIONS,
+            pool_maxsize=self.POOL_MAXSIZE,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        return session
+
+
+    def _get_session(self) -> requests.Session:
+        """Returns HTTP session object
+
+        REMARK: Session is created once even if the client is used by multiple threads
+
+        Returns:
+            Session object shared by the requests
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._create_session()
+
+        return self._session
+
+
+    def _get_cache_ttl(self, endpoint: str) -> float:
+        """Returns lifetime of the persistently cached responses of an endpoint
+
+        Args:
+            endpoint (str): Request end-point
+
+        Returns:
+            Lifetime in seconds if the endpoint is cacheable, None otherwise
+        """
+        if not self.config.get("cache"):
+            return None
+
+        for pattern, ttl in self.CACHE_TTL:
+            if re.match(pattern, endpoint):
+                return ttl
+
+        return None
+
+
+    def _get_http_cache(self) -> HTTPCache:
+        """Returns persistent HTTP response cache"""
+        if self._http_cache is None:
+            with self._session_lock:
+                if self._http_cache is None:
+                    self._http_cache = HTTPCache()
+
+        return self._http_cache
+
+
+    def _get_retry_sleep(self, tries: int, response: requests.Response=None) -> float:
+        """Returns waiting time before retrying a request
+
+        Waiting time specified by the server is used if available. Otherwise,
+        exponential backoff with jitter is applied.
+
+        Args:
+            tries (int): Number of tries so far
+            response (Response): Response of the failed request (optional)
+
+        Returns:
+            Waiting time in seconds
+        """
+        if response is not None and response.status_code in [429, 503]:
+            sleep = get_retry_after(response.headers)
+            if sleep is not None:
+                return min(sleep, self.RETRY_MAX_SLEEP)
+
+        sleep = min(self.RETRY_SLEEP * 2 ** (tries - 1), self.RETRY_MAX_SLEEP)
+        return random.uniform(sleep / 2, sleep)
+
+
+    def _send_request(self, method: str, url: str, headers: Dict, data=None, event: RequestEvent=None, stream: bool=False) -> requests.Response:
+        """Sends a HTTP request with retries
+
+        Idempotent requests are retried on connection errors and temporary
+        server errors, other requests only if rejected by the rate limit.
+        Requests are delayed if the rate limit of the repository is reached.
+
+        Args:
+            method (str): HTTP method
+            url (str): URL address
+            headers (Dict): Request headers
+            data: Request body (optional)
+            event (RequestEvent): Request event to count the tries (optional)
+            stream (bool): Set True to retrieve the response body as a stream (default = False)
+
+        Returns:
+            Response of the last try
+        """
+        rate_limiter = get_rate_limiter(self.config["api_url"])
+
+        # REMARK: Streamed request bodies cannot be sent again
+        if data is None or isinstance(data, (str, bytes, dict)):
+            max_tries = self.RETRY_TRIES
+        else:
+            max_tries = 1
+
+        idempotent = method.upper() in self.IDEMPOTENT_METHODS
+
+        tries = 0
+        while True:
+            tries += 1
+            if event and tries > 1:
+                event.tries += 1
+            rate_limiter.acquire()
+            try:
+                response = self._get_session().request(method, url, headers=headers, data=data, stream=stream)
+            except (requests.ConnectionError, requests.Timeout):
+                if not idempotent or tries >= max_tries:
+                    raise
+                time.sleep(self._get_retry_sleep(tries))
+                continue
+
+            rate_limiter.update(response.headers, response.status_code)
+
+            if response.status_code not in self.RETRY_STATUS_CODES or tries >= max_tries:
+                return response
+            if not idempotent and response.status_code != 429:
+                return response
+
+            # REMARK: Connection of a streamed response is released before the next try
+            response.close()
+            time.sleep(self._get_retry_sleep(tries, response))
 
 
     def _request(self, endpoint: str, method: str="GET", headers: dict=None, data=None, format: str=None, serialize: bool=True) -> Tuple(Any, requests.Response):
@@ -313,14 +588,6 @@ class Client(ABC):
 
         """
 
-        if not getattr(fairly, "TESTING", False):
-            # Patch HTTPConnection block size to improve connection speed
-            # ref: https://stackoverflow.com/questions/72977722/python-requests-post-very-slow
-            http.client.HTTPConnection.__init__.__defaults__ = tuple(
-                x if x != 8192 else self.CHUNK_SIZE
-                for x in http.client.HTTPConnection.__init__.__defaults__
-            )
-
         # Set default data format
         if not format:
             format = self.REQUEST_FORMAT
@@ -331,8 +598,7 @@ class Client(ABC):
                 data = json.dumps(data)
 
         # Create session if required
-        if self._session is None:
-            self._session = self._create_session()
+        self._get_session()
 
         # Build URL address
         if not self.config["api_url"]:
@@ -347,8 +613,41 @@ class Client(ABC):
             if "Content-Type" not in _headers:
                 _headers["Content-Type"] = "application/json"
 
-        response = self._session.request(method, url, headers=_headers, data=data)
-        response.raise_for_status()
+        with metrics.record(self.client_id, method, url, self.config["api_url"]) as event:
+            # Check persistent cache if the endpoint is cacheable
+            response = None
+            cache = None
+            ttl = self._get_cache_ttl(endpoint) if method == "GET" else None
+            if ttl:
+                cache = self._get_http_cache()
+                key = cache.get_key(url, self._session.headers.get("Authorization"))
+                entry = cache.get(key)
+                if entry:
+                    if cache.is_fresh(entry, ttl):
+                        response = cache.create_response(entry)
+                        event.cache = "hit"
+                    else:
+                        # REMARK: Stale response is validated by a conditional request
+                        _headers.update(cache.get_validators(entry))
+
+            if response is None:
+                event.bytes_sent = metrics.get_body_size(data)
+                response = self._send_request(method, url, _headers, data, event)
+                event.status = response.status_code
+                event.bytes_received = len(response.content)
+
+                if cache:
+                    event.cache = "miss"
+                    if response.status_code == 304 and entry:
+                        cache.refresh(key, entry)
+                        response = cache.create_response(entry)
+                        event.cache = "revalidated"
+                    elif response.status_code == 200:
+                        cache.set(key, response)
+            else:
+                event.status = response.status_code
+
+            response.raise_for_status()
 
         if response.content:
             if format == "json":
@@ -387,19 +686,166 @@ class Client(ABC):
 
 
     @abstractmethod
-    def _get_account_datasets(self) -> List[RemoteDataset]:
+    def _iter_account_datasets(self) -> Iterator[RemoteDataset]:
+        """Retrieves datasets of the account page by page
+
+        Yields:
+            Datasets related to the account
+        """
         raise NotImplementedError
 
 
-    def get_account_datasets(self, refresh: bool=False) -> List[RemoteDataset]:
-        if self._account_datasets is None or refresh:
-            datasets = self._get_account_datasets()
-            for dataset in datasets:
-                id = dataset.id
-                hash = self._get_dataset_hash(id)
-                self._datasets[hash] = dataset
-            self._account_datasets = datasets
-        return self._account_datasets
+    def _get_account_datasets(self) -> List[RemoteDataset]:
+        return list(self._iter_account_datasets())
+
+
+    @staticmethod
+    def _get_page_count(response: requests.Response, page_size: int) -> int:
+        """Returns total number of pages from the headers of a paginated response
+
+        Args:
+            response (Response): Response of a page
+            page_size (int): Page size
+
+        Returns:
+            Total number of pages, None if unknown
+        """
+        if response is None:
+            return None
+
+        total = response.headers.get("X-Total-Count")
+        if total and total.isnumeric() and page_size:
+            return -(-int(total) // page_size)
+
+        last = response.links.get("last")
+        if last:
+            match = re.search(r"[?&]page=(\d+)", last.get("url", ""))
+            if match:
+                return int(match.group(1))
+
+        return None
+
+
+    def _iter_pages(self, get_page: Callable, page_size: int=None, read_ahead: int=None) -> Iterator[List]:
+        """Retrieves pages of a paginated endpoint
+
+        Following pages are retrieved in the background while the current page
+        is processed. Pages are retrieved until an empty page, a page smaller
+        than the page size, or the last page if total number of pages is known.
+
+        Args:
+            get_page (Callable): Function returning items of a page and total
+                number of pages (None if unknown) by page number
+            page_size (int): Page size, None if the last page is not detected by size
+            read_ahead (int): Maximum number of pages retrieved in the background (default = PAGE_WORKERS)
+
+        Yields:
+            List of items of each page
+        """
+        if read_ahead is None:
+            read_ahead = self.PAGE_WORKERS
+
+        page = 1
+        items, page_count = get_page(page)
+
+        executor = ThreadPoolExecutor(max_workers=read_ahead) if read_ahead > 0 else None
+        futures = deque()
+
+        try:
+            while items:
+                last = (page_size and len(items) < page_size) or (page_count and page >= page_count)
+
+                # Request following pages in the background
+                if executor and not last:
+                    while len(futures) < read_ahead:
+                        next_page = page + len(futures) + 1
+                        if page_count and next_page > page_count:
+                            break
+                        futures.append(executor.submit(get_page, next_page))
+
+                yield items
+
+                if last:
+                    break
+
+                page += 1
+                items, _ = futures.popleft().result() if futures else get_page(page)
+
+        finally:
+            for future in futures:
+                future.cancel()
+            if executor:
+                executor.shutdown(wait=True)
+
+
+    def _map(self, function: Callable, items: List, workers: int=None) -> List:
+        """Calls a function for each item concurrently.
+
+        Args:
+            function (Callable): Function to be called
+            items (List): Function arguments
+            workers (int): Maximum number of concurrent calls (default = PAGE_WORKERS)
+
+        Returns:
+            List of the return values in the order of the items
+        """
+        items = list(items)
+        if workers is None:
+            workers = self.PAGE_WORKERS
+        if workers <= 1 or len(items) <= 1:
+            return [function(item) for item in items]
+
+        with ThreadPoolExecutor(max_workers=min(workers, len(items))) as executor:
+            futures = [executor.submit(function, item) for item in items]
+            try:
+                return [future.result() for future in futures]
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+
+    def iter_account_datasets(self, refresh: bool=False) -> Iterator[RemoteDataset]:
+        """Returns datasets of the account as they are retrieved
+
+        Args:
+            refresh (bool): Set True to refresh the account datasets (default = False)
+
+        Yields:
+            Account datasets
+        """
+        if self._account_datasets is not None and not refresh:
+            yield from self._account_datasets
+            return
+
+        datasets = []
+        for dataset in self._iter_account_datasets():
+            hash = self._get_dataset_hash(dataset.id)
+            self._datasets[hash] = dataset
+            datasets.append(dataset)
+            yield dataset
+
+        # REMARK: Account datasets are stored only if all of them are retrieved
+        self._account_datasets = datasets
+
+
+    def get_account_datasets(self, refresh: bool=False, warm: bool=False, workers: int=None) -> List[RemoteDataset]:
+        """Returns datasets of the account
+
+        Args:
+            refresh (bool): Set True to refresh the account datasets (default = False)
+            warm (bool): Set True to retrieve metadata and files of the datasets in advance (default = False)
+            workers (int): Maximum number of concurrent retrievals to warm the datasets (default = PAGE_WORKERS)
+
+        Returns:
+            List of account datasets
+        """
+        datasets = list(self.iter_account_datasets(refresh))
+
+        if warm:
+            self._map(lambda dataset: (dataset.metadata, dataset.files), datasets, workers)
+
+        return datasets
 
 
     def get_dataset(self, id=None, refresh: bool=False, **kwargs) -> RemoteDataset:
@@ -415,6 +861,9 @@ class Client(ABC):
         hash = self._get_dataset_hash(id)
         # Fetch dataset if required
         if hash not in self._datasets or refresh:
+            # REMARK: Cached details are cleared to retrieve the details again
+            if refresh:
+                self._set_details(id, None)
             self._datasets[hash] = RemoteDataset(self, id, {
                 "url": kwargs.get("url"),
                 "doi": kwargs.get("doi"),
@@ -480,6 +929,19 @@ class Client(ABC):
         raise NotImplementedError
 
 
+    def _prepare_metadata(self) -> None:
+        """Retrieves client-specific lists required to parse the metadata
+
+        Subclasses override this method if their metadata refers to other
+        lists of the repository (e.g. licenses), so that the lists can be
+        retrieved in advance.
+
+        Returns:
+            None
+        """
+        pass
+
+
     def get_metadata(self, id: Dict) -> Metadata:
         """Returns standard metadata of the specified dataset
 
@@ -534,41 +996,505 @@ class Client(ABC):
         raise NotImplementedError
 
 
-    def download_file(self, file: RemoteFile, path: str=None, name: str=None, notify: Callable=None) -> LocalFile:
+    def _get_range_size(self, file: RemoteFile) -> int:
+        """Returns size of the remote file if it can be downloaded in byte ranges
+
+        Args:
+            file (RemoteFile): Remote file
+
+        Returns:
+            Size of the file in bytes if range requests are supported and the
+            file is large enough to be split into parts, None otherwise.
+        """
+        try:
+            size = int(file.size)
+        except (TypeError, ValueError):
+            return None
+
+        # REMARK: Range requests are not worth the overhead for small files
+        if size < 2 * self.PART_SIZE:
+            return None
+
+        with metrics.record(self.client_id, "HEAD", file.url) as event:
+            response = self._send_request("HEAD", file.url, None, event=event)
+            event.status = response.status_code
+        if not response.ok:
+            return None
+
+        if response.headers.get("Accept-Ranges", "").lower() != "bytes":
+            return None
+
+        length = response.headers.get("Content-Length")
+        if length and int(length) != size:
+            return None
+
+        return size
+
+
+    def _get_download_state(self, file: RemoteFile, partpath: str, statepath: str) -> Dict:
+        """Returns saved state of an incomplete download
+
+        Args:
+            file (RemoteFile): Remote file
+            partpath (str): Path of the partial file
+            statepath (str): Path of the download state file
+
+        Returns:
+            Download state dictionary if the partial download can be resumed,
+            None otherwise.
+        """
+        try:
+            with open(statepath, "r") as stream:
+                state = json.load(stream)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        if state.get("url") != file.url or state.get("md5") != file.md5:
+            return None
+
+        try:
+            size = int(file.size)
+        except (TypeError, ValueError):
+            size = None
+        if state.get("size") != size:
+            return None
+
+        if not os.path.isfile(partpath):
+            return None
+
+        return state
+
+
+    def _save_download_state(self, state: Dict, statepath: str) -> None:
+        """Saves state of an incomplete download
+
+        State file is replaced atomically to keep it consistent if the process
+        is interrupted.
+
+        Args:
+            state (Dict): Download state dictionary
+            statepath (str): Path of the download state file
+
+        Returns:
+            None
+        """
+        temppath = f"{statepath}.tmp"
+        with open(temppath, "w") as stream:
+            json.dump(state, stream)
+        os.replace(temppath, statepath)
+
+
+    def _get_downloaded_file(self, file: RemoteFile, fullpath: str, basepath: str) -> LocalFile:
+        """Returns local file if the remote file is already downloaded
+
+        Args:
+            file (RemoteFile): Remote file
+            fullpath (str): Full path of the local file
+            basepath (str): Base path of the local file
+
+        Returns:
+            Local file if it is complete and verified, None otherwise.
+        """
+        if not os.path.isfile(fullpath):
+            return None
+
+        try:
+            size = int(file.size)
+        except (TypeError, ValueError):
+            size = None
+
+        # REMARK: Local file cannot be verified without size or checksum
+        if size is None and not file.md5:
+            return None
+
+        if size is not None and os.path.getsize(fullpath) != size:
+            return None
+
+        local_file = LocalFile(fullpath, basepath=basepath)
+        if file.md5 and local_file.md5 != file.md5:
+            return None
+
+        return local_file
+
+
+    def _download_stream(self, file: RemoteFile, partpath: str, state: Dict, notify: Callable=None, save: Callable=None) -> str:
+        """Downloads the remote file as a single stream
+
+        Download continues from the end of the partial file if the server
+        supports range requests. Otherwise, it starts over. Interrupted
+        transfers are continued the same way.
+
+        Args:
+            file (RemoteFile): Remote file
+            partpath (str): Path of the partial file
+            state (Dict): Download state dictionary
+            notify (Callable): Notification callback function
+            save (Callable): Download state callback function
+
+        Returns:
+            MD5 hash of the downloaded file
+
+        Raises:
+            IOError("Incomplete download")
+        """
+        part = state["parts"][0]
+
+        # Check if all data is already downloaded
+        if part[2] and part[2] == state["size"]:
+            return LocalFile(partpath).md5
+
+        tries = 0
+        with metrics.record(self.client_id, "GET", file.url) as event:
+            while True:
+                headers = {"Range": f"bytes={part[2]}-"} if part[2] else None
+                md5 = hashlib.md5()
+                with self._send_request("GET", file.url, headers, event=event, stream=True) as response:
+                    event.status = response.status_code
+                    response.raise_for_status()
+                    if part[2] and response.status_code == 206:
+                        # REMARK: Hash state cannot be stored, therefore downloaded part is hashed again
+                        with open(partpath, "r+b", buffering=0) as local_file:
+                            local_file.truncate(part[2])
+                            while chunk := local_file.read(self.CHUNK_SIZE):
+                                md5.update(chunk)
+                    else:
+                        part[2] = 0
+                    size = part[2]
+                    error = None
+                    with open(partpath, "ab" if part[2] else "wb", buffering=0) as local_file:
+                        saved_size = part[2]
+                        try:
+                            for chunk in response.iter_content(self.CHUNK_SIZE):
+                                local_file.write(chunk)
+                                md5.update(chunk)
+                                part[2] += len(chunk)
+                                event.bytes_received += len(chunk)
+                                if save and part[2] - saved_size >= self.PART_SIZE:
+                                    save()
+                                    saved_size = part[2]
+                                if notify:
+                                    notify(file, part[2])
+                        except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as err:
+                            error = err
+                # REMARK: Connection might be closed before all data is received
+                if error is None:
+                    if state["size"] is None or part[2] == state["size"]:
+                        return md5.hexdigest()
+                    error = IOError("Incomplete download")
+                tries = self._get_transfer_tries(tries, part[2] > size, error)
+                event.tries += 1
+                time.sleep(self._get_retry_sleep(tries))
+
+
+    def _get_transfer_tries(self, tries: int, progress: bool, error: Exception) -> int:
+        """Returns number of tries of an interrupted transfer
+
+        Tries are counted again if the interrupted try transferred any data.
+
+        Args:
+            tries (int): Number of tries without progress so far
+            progress (bool): True if the interrupted try transferred any data
+            error (Exception): Error interrupting the transfer
+
+        Returns:
+            Number of tries without progress
+
+        Raises:
+            Error interrupting the transfer if there are too many tries
+        """
+        tries = 1 if progress else tries + 1
+        if tries >= self.RETRY_TRIES:
+            raise error
+        return tries
+
+
+    def _download_ranges(self, file: RemoteFile, partpath: str, state: Dict, connections: int, notify: Callable=None, save: Callable=None) -> str:
+        """Downloads the remote file in byte ranges over multiple connections
+
+        The partial file is preallocated and each range is written directly to
+        its position in the file. Downloaded bytes of each range are tracked in
+        the download state to resume incomplete ranges. Failed range requests
+        are retried, and interrupted ranges are continued from their last
+        written byte.
+
+        Args:
+            file (RemoteFile): Remote file
+            partpath (str): Path of the partial file
+            state (Dict): Download state dictionary
+            connections (int): Maximum number of concurrent connections
+            notify (Callable): Notification callback function
+            save (Callable): Download state callback function
+
+        Returns:
+            MD5 hash of the downloaded file
+
+        Raises:
+            IOError("Range request is not supported")
+            IOError("Invalid range response")
+            IOError("Incomplete download")
+        """
+        # Preallocate partial file if required
+        if not os.path.isfile(partpath):
+            with open(partpath, "wb") as local_file:
+                local_file.truncate(state["size"])
+
+        lock = threading.Lock()
+        stop = threading.Event()
+        current_size = sum(part[2] for part in state["parts"])
+        saved_size = current_size
+
+        def _download(part: List) -> None:
+            nonlocal current_size, saved_size
+            start, end, _ = part
+            tries = 0
+            with metrics.record(self.client_id, "GET", file.url) as event:
+                while True:
+                    # REMARK: Only the bytes not written yet are requested
+                    size = part[2]
+                    headers = {"Range": f"bytes={start + size}-{end}"}
+                    with self._send_request("GET", file.url, headers, event=event, stream=True) as response:
+                        event.status = response.status_code
+                        response.raise_for_status()
+                        # REMARK: Server might ignore the range and return the complete file
+                        if response.status_code != 206:
+                            raise IOError("Range request is not supported")
+                        error = None
+                        with open(partpath, "r+b", buffering=0) as local_file:
+                            local_file.seek(start + size)
+                            try:
+                                for chunk in response.iter_content(self.CHUNK_SIZE):
+                                    if stop.is_set():
+                                        return
+                                    if start + part[2] + len(chunk) > end + 1:
+                                        raise IOError("Invalid range response")
+                                    local_file.write(chunk)
+                                    event.bytes_received += len(chunk)
+                                    with lock:
+                                        part[2] += len(chunk)
+                                        current_size += len(chunk)
+                                        if save and current_size - saved_size >= self.PART_SIZE:
+                                            save()
+                                            saved_size = current_size
+                                        if notify:
+                                            notify(file, current_size)
+                            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as err:
+                                error = err
+                    if error is None:
+                        if start + part[2] == end + 1:
+                            return
+                        error = IOError("Incomplete download")
+                    tries = self._get_transfer_tries(tries, part[2] > size, error)
+                    event.tries += 1
+                    time.sleep(self._get_retry_sleep(tries))
+
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            futures = [
+                executor.submit(_download, part)
+                for part in state["parts"] if part[0] + part[2] <= part[1]
+            ]
+            try:
+                for future in as_completed(futures):
+                    future.result()
+            except:
+                # Stop remaining downloads
+                # REMARK: Downloaded bytes of the stopped ranges are kept in the download state
+                stop.set()
+                for future in futures:
+                    future.cancel()
+                raise
+
+        # REMARK: Ranges complete out of order, therefore hash is calculated afterwards
+        return LocalFile(partpath).md5
+
+
+    def download_file(self, file: RemoteFile, path: str=None, name: str=None, notify: Callable=None, connections: int=None, resume: bool=False) -> LocalFile:
+        """Downloads the specified remote file
+
+        Large files are downloaded in byte ranges over multiple connections if
+        the server supports range requests. Otherwise, the file is downloaded
+        as a single stream.
+
+        Data is downloaded to a partial file with the ``.part`` extension,
+        which is renamed after the download is completed and verified. If a
+        download fails after some data is received, the partial file is kept
+        together with the state of the download in a ``.part.json`` file next
+        to it. If resume is enabled, an already downloaded and verified file is
+        not downloaded again, and an incomplete download is resumed from its
+        saved state.
+
+        Args:
+            file (RemoteFile): Remote file
+            path (str): Path of the directory to download to (default = current working directory)
+            name (str): Name of the local file (default = name of the remote file)
+            notify (Callable): Notification callback function
+            connections (int): Maximum number of concurrent connections (default = DOWNLOAD_CONNECTIONS)
+            resume (bool): Set True to resume incomplete downloads (default = False)
+
+        Returns:
+            Local file
+
+        Raises:
+            ValueError("No URL address")
+            IOError("Invalid MD5 checksum")
+        """
         if not file.url:
             raise ValueError("No URL address")
         if not path:
             path = os.getcwd()
         if not name:
             name = file.name
+        if connections is None:
+            connections = self.DOWNLOAD_CONNECTIONS
         fullpath = os.path.join(path, name)
-        current_size = 0
-        md5 = hashlib.md5()
-        if self._session is None:
-            self._session = self._create_session()
+        partpath = f"{fullpath}.part"
+        statepath = f"{partpath}.json"
+
+        # Skip download if already downloaded
+        if resume:
+            local_file = self._get_downloaded_file(file, fullpath, path)
+            if local_file:
+                return local_file
+
+        state = self._get_download_state(file, partpath, statepath) if resume else None
+        save = (lambda: self._save_download_state(state, statepath)) if resume else None
         try:
-            with self._session.get(file.url, stream=True) as response:
-                response.raise_for_status()
+            if not state:
+                try:
+                    size = int(file.size)
+                except (TypeError, ValueError):
+                    size = None
+                ranged = connections > 1 and self._get_range_size(file) is not None
+                if ranged:
+                    parts = [[start, min(start + self.PART_SIZE, size) - 1, 0] for start in range(0, size, self.PART_SIZE)]
+                else:
+                    parts = [[0, None, 0]]
+                state = {"url": file.url, "size": size, "md5": file.md5, "ranged": ranged, "parts": parts}
                 os.makedirs(os.path.dirname(fullpath), exist_ok=True)
-                with open(fullpath, "wb") as local_file:
-                    for chunk in response.iter_content(self.CHUNK_SIZE):
-                        local_file.write(chunk)
-                        md5.update(chunk)
-                        current_size += len(chunk)
-                        if notify:
-                            notify(file, current_size)
-            md5 = md5.hexdigest()
+                if os.path.isfile(partpath):
+                    os.remove(partpath)
+            if state["ranged"]:
+                md5 = self._download_ranges(file, partpath, state, connections, notify, save)
+            else:
+                md5 = self._download_stream(file, partpath, state, notify, save)
             if file.md5 and file.md5 != md5:
+                # REMARK: Corrupted data cannot be resumed
+                state = None
                 raise IOError("Invalid MD5 checksum")
+            os.replace(partpath, fullpath)
+            if os.path.isfile(statepath):
+                os.remove(statepath)
         except:
-            # Clean up if incomplete download
+            # Keep partial download if it can be resumed, clean up otherwise
             # TODO: Remove created directories
-            if os.path.isfile(fullpath):
-                os.remove(fullpath)
+            if state and os.path.isfile(partpath) and any(part[2] for part in state["parts"]):
+                self._save_download_state(state, statepath)
+            else:
+                for temppath in [partpath, statepath]:
+                    if os.path.isfile(temppath):
+                        os.remove(temppath)
             raise
         return LocalFile(fullpath, basepath=path, md5=md5)
 
 
+    def download_files(self, files: List[RemoteFile], path: str=None, notify: Callable=None, workers: int=None, max_bytes: int=None, resume: bool=False) -> List[LocalFile]:
+        """Downloads the specified remote files concurrently
+
+        Files are downloaded by a pool of workers sharing the session of the
+        client. Aggregate progress is reported by calling the notification
+        callback function with the following arguments:
+
+        - file (RemoteFile): Remote file
+        - current_size (int): Downloaded size of the file
+        - total_size (int): Total size of the files (None if unknown)
+        - current_total_size (int): Downloaded size of all files
+
+        Args:
+            files (List[RemoteFile]): Remote files
+            path (str): Path of the directory to download to (default = current working directory)
+            notify (Callable): Notification callback function
+            workers (int): Maximum number of concurrent downloads (default = DOWNLOAD_WORKERS)
+            max_bytes (int): Maximum total size of the files downloaded at
+                the same time. A file larger than the limit is downloaded
+                alone (default = no limit)
+            resume (bool): Set True to resume incomplete downloads (default = False)
+
+        Returns:
+            List of local files in the order of the remote files
+        """
+        if workers is None:
+            workers = self.DOWNLOAD_WORKERS
+
+        sizes = []
+        for file in files:
+            try:
+                sizes.append(int(file.size))
+            except (TypeError, ValueError):
+                sizes.append(None)
+        total_size = None if None in sizes else sum(sizes)
+
+        lock = threading.Condition()
+        progress = [0] * len(files)
+        current_total_size = 0
+        current_bytes = 0
+        stop = threading.Event()
+
+        def _notify(index: int, file: RemoteFile, current_size: int) -> None:
+            nonlocal current_total_size
+            with lock:
+                current_total_size += current_size - progress[index]
+                progress[index] = current_size
+                if notify:
+                    notify(file, current_size, total_size, current_total_size)
+
+        def _download(index: int) -> LocalFile:
+            nonlocal current_bytes
+            file = files[index]
+            try:
+                if stop.is_set():
+                    return None
+                local_file = self.download_file(
+                    file,
+                    path,
+                    notify=lambda file, current_size: _notify(index, file, current_size),
+                    resume=resume
+                )
+                # Report skipped downloads
+                if progress[index] != local_file.size:
+                    _notify(index, file, local_file.size)
+                return local_file
+            except:
+                stop.set()
+                raise
+            finally:
+                with lock:
+                    current_bytes -= sizes[index] or 0
+                    lock.notify_all()
+
+        local_files = [None] * len(files)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {}
+            try:
+                for index, size in enumerate(sizes):
+                    with lock:
+                        # Wait until the byte budget allows the download
+                        if max_bytes:
+                            lock.wait_for(lambda: current_bytes == 0 or current_bytes + (size or 0) <= max_bytes or stop.is_set())
+                        if stop.is_set():
+                            break
+                        current_bytes += size or 0
+                    futures[executor.submit(_download, index)] = index
+                for future in as_completed(futures):
+                    local_files[futures[future]] = future.result()
+            except:
+                # Stop remaining downloads
+                stop.set()
+                for future in futures:
+                    future.cancel()
+                raise
+
+        return local_files
+
+
     @abstractmethod
     def _upload_file(self, id: Dict, file: LocalFile, notify: Callable=None) -> RemoteFile:
         raise NotImplementedError
@@ -589,6 +1515,85 @@ class Client(ABC):
         return remote_file
 
 
+    def upload_files(self, dataset, files: List, notify: Callable=None, workers: int=None) -> List[RemoteFile]:
+        """Uploads the specified local files concurrently
+
+        Files are uploaded by a pool of workers sharing the session of the
+        client. File list of the dataset is refreshed once after all uploads
+        are completed. Aggregate progress is reported by calling the
+        notification callback function with the following arguments:
+
+        - file (LocalFile): Local file
+        - current_size (int): Uploaded size of the file
+        - total_size (int): Total size of the files
+        - current_total_size (int): Uploaded size of all files
+
+        Args:
+            dataset: Dataset or dataset identifier
+            files (List): Local files or paths of the local files
+            notify (Callable): Notification callback function
+            workers (int): Maximum number of concurrent uploads (default = UPLOAD_WORKERS)
+
+        Returns:
+            List of remote files in the order of the local files
+        """
+        if not isinstance(dataset, RemoteDataset):
+            dataset = self.get_dataset(dataset)
+
+        files = [file if isinstance(file, LocalFile) else LocalFile(file) for file in files]
+
+        if workers is None:
+            workers = self.UPLOAD_WORKERS
+
+        lock = threading.Lock()
+        total_size = sum(file.size for file in files)
+        progress = [0] * len(files)
+        current_total_size = 0
+        stop = threading.Event()
+
+        def _notify(index: int, file: LocalFile, current_size: int) -> None:
+            nonlocal current_total_size
+            # REMARK: Reported size might include encoding overhead
+            current_size = min(current_size, file.size)
+            with lock:
+                current_total_size += current_size - progress[index]
+                progress[index] = current_size
+                if notify:
+                    notify(file, current_size, total_size, current_total_size)
+
+        def _upload(index: int) -> RemoteFile:
+            if stop.is_set():
+                return None
+            try:
+                return self._upload_file(
+                    dataset.id,
+                    files[index],
+                    lambda file, current_size: _notify(index, file, current_size)
+                )
+            except:
+                stop.set()
+                raise
+
+        remote_files = [None] * len(files)
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(_upload, index): index for index in range(len(files))}
+                try:
+                    for future in as_completed(futures):
+                        remote_files[futures[future]] = future.result()
+                except:
+                    # Stop remaining uploads
+                    stop.set()
+                    for future in futures:
+                        future.cancel()
+                    raise
+        finally:
+            # REMARK: File list is refreshed once, even if some uploads failed
+            dataset.get_files(refresh=True)
+
+        return remote_files
+
+
     @abstractmethod
     def _delete_file(self, id: Dict, file: RemoteFile) -> None:
         raise NotImplementedError
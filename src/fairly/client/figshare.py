@@ -1,4 +1,4 @@
-from typing import Any, List, Dict, Callable
+from typing import Iterator, List, Dict, Tuple, Callable
 
 from . import Client
 from ..metadata import Metadata
@@ -9,11 +9,13 @@ from ..file.remote import RemoteFile
 
 import re
 from urllib.parse import urlparse
-import requests
 from requests import Session
-from requests.exceptions import HTTPError
+from requests.exceptions import HTTPError, ConnectionError, Timeout
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import threading
 import time
+import hashlib
 import warnings
 import dateutil.parser
 
@@ -23,8 +25,21 @@ class FigshareClient(Client):
 
     PAGE_SIZE = 25
 
-    LOCKED_SLEEP = 5
-    LOCKED_TRIES = 5
+    CACHE_TTL = [
+        (r"^(account/)?licenses$", 86400),
+        (r"^(account/)?categories$", 86400),
+        (r"^articles/\d+(/versions(/\d+)?)?$", 300),
+    ]
+
+    LOCKED_SLEEP = 1
+    LOCKED_MAX_SLEEP = 30
+    LOCKED_TRIES = 8
+
+    PART_WORKERS = 4
+    PART_TRIES = 3
+
+    # Maximum size of the files read into memory for upload
+    BUFFER_SIZE = 2**25
 
     record_types = {
         "book": "Book",
@@ -54,6 +69,8 @@ class FigshareClient(Client):
 
         # Initialize properties
         self._categories = None
+        self._upload_session = None
+        self._upload_session_lock = threading.Lock()
 
 
     @classmethod
@@ -156,18 +173,14 @@ class FigshareClient(Client):
             return id["id"]
 
 
-    def _get_dataset_details(self, id: Dict) -> Dict:
-        """Retrieves details of the dataset.
+    def _get_details_endpoints(self, id: Dict) -> List[str]:
+        """Returns end-points of the dataset details in order of preference
 
         Args:
             id (Dict): Standard dataset identifier
 
         Returns:
-            Dictionary of dataset details
-
-        Raises:
-            ValueError("Invalid dataset id")
-            HTTPError
+            List of end-points
         """
         endpoints = []
         if id["version"]:
@@ -178,46 +191,65 @@ class FigshareClient(Client):
         if "token" in self.config:
             endpoints.append(f"account/{endpoint}")
 
-        details = None
-        for endpoint in endpoints:
+        return endpoints
+
+
+    def _get_dataset_details(self, id: Dict) -> Dict:
+        """Retrieves details of the dataset.
+
+        Args:
+            id (Dict): Standard dataset identifier
+
+        Returns:
+            Dictionary of dataset details
+
+        Raises:
+            ValueError("Invalid dataset id")
+            HTTPError
+        """
+        details = self._get_details(id)
+        if details:
+            return details
+
+        for endpoint in self._get_details_endpoints(id):
             try:
                 details, _ = self._request(endpoint)
                 break
             except HTTPError as err:
-                if err.response.status_code != 404:
+                if err.response.status_code not in self.DETAILS_SKIPPED_STATUS_CODES:
                     raise
 
         if not details:
             raise ValueError("Invalid dataset id")
 
+        self._set_details(id, details)
+
         return details
 
 
-    def _get_account_datasets(self) -> List[RemoteDataset]:
-        """Retrieves list of account datasets
+    def _iter_account_datasets(self) -> Iterator[RemoteDataset]:
+        """Retrieves account datasets page by page
 
-        Returns:
-            List of datasets related to the account
+        Yields:
+            Datasets related to the account
         """
         if "token" not in self.config:
-            return []
-        datasets = []
-        page = 1
-        while True:
+            return
+
+        def _get_page(page: int) -> Tuple[List[Dict], int]:
             # TODO: Add error handling
-            items, _ = self._request(f"account/articles?page={page}&page_size={self.PAGE_SIZE}")
-            if not items:
-                break
+            items, response = self._request(f"account/articles?page={page}&page_size={self.PAGE_SIZE}")
+            return items or [], self._get_page_count(response, self.PAGE_SIZE)
+
+        # REMARK: Pages are retrieved until a page smaller than the page size
+        for items in self._iter_pages(_get_page, self.PAGE_SIZE):
             for item in items:
                 id = self.get_dataset_id(**item)
-                dataset = RemoteDataset(self, id, {
+                yield RemoteDataset(self, id, {
                     "title": item.get("title"),
                     "url": item.get("url_public_html", item.get("url_private_html")),
                     "doi": item.get("doi"),
                 })
-                datasets.append(dataset)
-            page += 1
-        return datasets
 
 
     def _get_licenses(self) -> Dict:
@@ -290,6 +322,12 @@ class FigshareClient(Client):
         return self.get_categories()
 
 
+    def _prepare_metadata(self) -> None:
+        """Retrieves licenses and categories required to parse the metadata"""
+        self.get_licenses()
+        self.get_categories()
+
+
     def _get_versions(self, id: Dict) -> OrderedDict:
         """Returns standard dataset identifiers of the dataset versions
 
@@ -564,6 +602,9 @@ class FigshareClient(Client):
                 print(err.response.content)
                 raise
 
+        # Invalidate details cache
+        self._set_details(id, None)
+
 
     def validate_metadata(self, metadata: Metadata) -> Dict:
         result = {}
@@ -752,11 +793,35 @@ class FigshareClient(Client):
         return id
 
 
+    def _get_upload_session(self) -> Session:
+        """Returns session of the upload service
+
+        REMARK: Separate session is used, because upload service does not require authentication
+
+        Returns:
+            Session object shared by the uploads
+        """
+        # REMARK: Session is created once even if uploads are started concurrently
+        with self._upload_session_lock:
+            if self._upload_session is None:
+                self._upload_session = super()._create_session()
+
+        return self._upload_session
+
+
     def _upload_file(self, id: Dict, file: LocalFile, notify: Callable=None) -> RemoteFile:
         # REMARK: Figshare does not have a versioned endpoint
         if id["version"]:
             raise ValueError("Uploading file to a versioned dataset is not supported")
 
+        # REMARK: MD5 hash is required before the upload, therefore small files
+        # are read only once into memory for both hashing and uploading parts
+        content = None
+        if file.size <= self.BUFFER_SIZE:
+            with open(file.fullpath, "rb") as stream:
+                content = stream.read()
+            file.md5 = hashlib.md5(content).hexdigest()
+
         # Initiate file upload
         result, _ = self._request(
             endpoint=f"account/articles/{id['id']}/files",
@@ -781,59 +846,81 @@ class FigshareClient(Client):
         # REMARK: Upload URL includes the upload token
         upload_url = result["upload_url"]
 
-        with open(file.fullpath, "rb") as stream:
-
-            tries = 0
-            current_size = 0
-
-            while True:
-                # Get upload information
-                response = requests.get(upload_url)
-                response.raise_for_status()
-
-                info = response.json()
-
-                done = True
-                locked = False
-
-                for part in info["parts"]:
-
-                    if part["status"] == "COMPLETE":
-                        continue
+        session = self._get_upload_session()
 
-                    if part["locked"]:
-                        done = False
-                        locked = True
-                        continue
+        lock = threading.Lock()
+        current_size = 0
 
-                    part_size = part["endOffset"] - part["startOffset"] + 1
+        def _upload_part(part: Dict) -> None:
+            nonlocal current_size
+            part_size = part["endOffset"] - part["startOffset"] + 1
 
+            if content is not None:
+                data = content[part["startOffset"]:part["endOffset"] + 1]
+            else:
+                with open(file.fullpath, "rb") as stream:
                     stream.seek(part["startOffset"])
                     data = stream.read(part_size)
 
-                    response = requests.put(f"{upload_url}/{part['partNo']}", data=data)
-                    response.raise_for_status()
+            # Retry failed part with exponential backoff
+            tries = 0
+            while True:
+                tries += 1
+                response = None
+                try:
+                    response = session.put(f"{upload_url}/{part['partNo']}", data=data)
+                    if response.status_code not in self.RETRY_STATUS_CODES or tries >= self.PART_TRIES:
+                        response.raise_for_status()
+                        break
+                except (ConnectionError, Timeout):
+                    if tries >= self.PART_TRIES:
+                        raise
+                # REMARK: Waiting time specified by the server is used if available
+                time.sleep(self._get_retry_sleep(tries, response))
+
+            with lock:
+                current_size += part_size
+                if notify:
+                    notify(file, current_size)
+
+        tries = 0
+        while True:
+            # Get upload information
+            response = session.get(upload_url)
+            response.raise_for_status()
+
+            info = response.json()
 
-                    current_size += part_size
+            parts = [part for part in info["parts"] if part["status"] != "COMPLETE"]
+            if not parts:
+                break
 
-                    if notify:
-                        notify(file, current_size)
+            # Upload unlocked parts concurrently
+            unlocked_parts = [part for part in parts if not part["locked"]]
+            if unlocked_parts:
+                with ThreadPoolExecutor(max_workers=self.PART_WORKERS) as executor:
+                    for future in [executor.submit(_upload_part, part) for part in unlocked_parts]:
+                        future.result()
 
-                if done:
-                    break
+            # REMARK: Upload information is required again only if there are locked parts
+            if len(unlocked_parts) == len(parts):
+                break
 
-                if locked:
-                    time.sleep(self.LOCKED_SLEEP)
-                    tries += 1
-                    if tries == self.LOCKED_TRIES:
-                        # TODO: Clean up (e.g. remove uploaded parts)
-                        raise IOError("Too many tries to upload a part")
+            # Wait for locked parts with exponential backoff
+            time.sleep(min(self.LOCKED_SLEEP * 2 ** tries, self.LOCKED_MAX_SLEEP))
+            tries += 1
+            if tries == self.LOCKED_TRIES:
+                # TODO: Clean up (e.g. remove uploaded parts)
+                raise IOError("Too many tries to upload a part")
 
         # REMARK: POST request does not return a valid JSON content, therefore raw content is used
         result, response = self._request(f"account/articles/{id['id']}/files/{file_id}", "POST", format="raw")
         if response.status_code != 202:
             raise IOError("File upload cannot be completed")
 
+        # Invalidate details cache
+        self._set_details(id, None)
+
         result, _ = self._request(f"account/articles/{id['id']}/files/{file_id}")
 
         remote_file = RemoteFile(
@@ -857,6 +944,9 @@ class FigshareClient(Client):
 
         result, response = self._request(f"account/articles/{id['id']}/files/{file.id}", "DELETE")
 
+        # Invalidate details cache
+        self._set_details(id, None)
+
 
     def _delete_dataset(self, id: Dict) -> None:
         """Deletes dataset specified by the standard identifier from the repository
@@ -892,6 +982,11 @@ class FigshareClient(Client):
                 raise ValueError("Invalid dataset id")
             raise
 
+        # Invalidate details cache
+        self._set_details(id, None)
+        if id.get("version"):
+            self._set_details({"id": id["id"], "version": None}, None)
+
 
     def get_details(self, id: Dict) -> Dict:
         """Returns standard details of the specified dataset.
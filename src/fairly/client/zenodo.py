@@ -1,10 +1,10 @@
-from typing import Dict, List, Callable
+from typing import Dict, Iterator, List, Tuple, Callable
 
 from . import Client
 from ..metadata import Metadata
 from ..person import Person
 from ..dataset.remote import RemoteDataset
-from ..file.local import LocalFile
+from ..file.local import LocalFile, MD5Reader
 from ..file.remote import RemoteFile
 
 from urllib.parse import urlparse
@@ -13,19 +13,28 @@ from requests.exceptions import HTTPError
 from collections import OrderedDict
 from requests_toolbelt.multipart.encoder import MultipartEncoderMonitor
 from datetime import datetime
+import re
+import time
 
 CLASS_NAME = "ZenodoClient"
 
 class ZenodoClient(Client):
 
-    """
-    Attributes:
-        _details (Dict): Record details cache
-    """
-
     PAGE_SIZE = 100
 
-    KEEP_ALIVE = 10
+    # Status codes of the rejected file uploads that are sent again
+    # REMARK: Uploads are not idempotent, therefore only requests that are not processed are retried
+    UPLOAD_RETRY_STATUS_CODES = [429, 503]
+
+    # REMARK: Deposition end-point is not accessible if the dataset is not owned by the user
+    DETAILS_SKIPPED_STATUS_CODES = [401, 403, 404]
+
+    CACHE_TTL = [
+        (r"^licenses\b", 86400),
+        (r"^communities\b", 86400),
+        (r"^funders\b", 86400),
+        (r"^records/\d+$", 300),
+    ]
 
     record_types = {
         "dataset": "Dataset",
@@ -132,12 +141,6 @@ class ZenodoClient(Client):
     }
 
 
-    def __init__(self, repository_id: str=None, **kwargs):
-        super().__init__(repository_id, **kwargs)
-
-        self._details = {}
-
-
     @classmethod
     def get_config_parameters(cls) -> Dict:
         """Returns configuration parameters
@@ -203,9 +206,13 @@ class ZenodoClient(Client):
             else:
                 raise ValueError("Invalid URL address")
         elif "doi" in kwargs:
-            # TODO: Find id from DOI
-            # https://docs.figshare.com/#private_articles_search
-            raise NotImplementedError
+            # REMARK: Zenodo DOIs end with the record id (e.g. 10.5281/zenodo.6026285)
+            match = re.search(r"zenodo\.(\d+)$", kwargs["doi"], re.IGNORECASE)
+            if match:
+                id = match.group(1)
+            else:
+                # TODO: Find id from DOI
+                raise NotImplementedError
         else:
             raise ValueError("No identifier")
         return {"id": id}
@@ -223,49 +230,6 @@ class ZenodoClient(Client):
         return id["id"]
 
 
-    def _set_details(self, id: Dict, details: Dict) -> None:
-        """Stores dataset details in the cache.
-
-        Args:
-            id (Dict): Standard dataset id.
-            details (Dict): Dataset details. Set None to clear the cached details.
-
-        Returns:
-            None
-        """
-        hash = self._get_dataset_hash(id)
-
-        if details:
-            self._details[hash] = [details, datetime.now()]
-
-        else:
-            if hash in self._details:
-                del self._details[hash]
-
-
-    def _get_details(self, id: Dict) -> Dict:
-        """Returns cached dataset details.
-
-        Args:
-            id (Dict): Standard dataset id.
-
-        Returns:
-            Dataset details dictionary if cache is valid, None otherwise.
-        """
-        hash = self._get_dataset_hash(id)
-
-        if hash not in self._details:
-            return None
-
-        details, time = self._details[hash]
-
-        if (datetime.now() - time).total_seconds() > self.KEEP_ALIVE:
-            del self._details[hash]
-            return None
-
-        return details
-
-
     def _create_dataset(self, metadata: Metadata) -> Dict:
         """Creates a dataset with the specified standard metadata
 
@@ -304,8 +268,8 @@ class ZenodoClient(Client):
         return id
 
 
-    def _get_entities(self, endpoint: str, page_size: int=None, key: str=None, process: Callable=None):
-        """Retrieves all entities available at the specified endpoint
+    def iter_entities(self, endpoint: str, page_size: int=None, process: Callable=None, read_ahead: int=None) -> Iterator:
+        """Retrieves entities available at the specified endpoint page by page
 
         Args:
             endpoint (str): Path of the endpoint
@@ -315,9 +279,14 @@ class ZenodoClient(Client):
 
             process (Callable): Callback function to process each entity.
                 Retrieved entity is provided as the argument and returned value
-                is stored as the entity. Retrieval is terminated if returned
+                is yielded as the entity. Retrieval is terminated if returned
                 value is False.
 
+            read_ahead (int): Maximum number of pages retrieved in the
+                background (default = PAGE_WORKERS)
+
+        Yields:
+            Entities
         """
         # Set argument separator
         sep = "&" if "?" in endpoint else "?"
@@ -326,85 +295,102 @@ class ZenodoClient(Client):
         if page_size is None or page_size < 0:
             page_size = self.PAGE_SIZE
 
-        page = 1
-        entities = {} if key else []
-
-        while True:
-
+        def _get_page(page: int) -> Tuple[List, int]:
             try:
-                content, _ = self._request(f"{endpoint}{sep}page={page}&size={page_size}")
+                content, response = self._request(f"{endpoint}{sep}page={page}&size={page_size}")
 
             except HTTPError as err:
                 if page > 1 and err.response.status_code in [400, 403, 404]:
-                    break
+                    return [], None
                 raise
 
             if not content:
-                break
+                return [], None
 
             if isinstance(content, list):
-                items = content
-            elif not content["hits"] or not content["hits"]["hits"]:
-                break
-            else:
-                items = content["hits"]["hits"]
+                return content, self._get_page_count(response, page_size)
+
+            if not content["hits"] or not content["hits"]["hits"]:
+                return [], None
+
+            total = content["hits"].get("total")
+            if isinstance(total, dict):
+                total = total.get("value")
+            page_count = -(-total // page_size) if isinstance(total, int) else None
+
+            return content["hits"]["hits"], page_count
 
+        for items in self._iter_pages(_get_page, page_size, read_ahead):
             for item in items:
                 if process:
-                    entity = process(item)
+                    item = process(item)
                     if item is False:
-                        break
-                else:
-                    entity = item
+                        return
+                yield item
 
-                if key:
-                    entities[entity[key]] = entity
-                else:
-                    entities.append(entity)
 
-            else:
-                if len(entities) < page_size:
-                    break
+    def _get_entities(self, endpoint: str, page_size: int=None, key: str=None, process: Callable=None):
+        """Retrieves all entities available at the specified endpoint
 
-                page += 1
-                continue
-            break
+        Args:
+            endpoint (str): Path of the endpoint
 
-        return entities
+            page_size (int): Page size for each retrieval step. Default page
+                size is used if set to None.
 
+            key (str): Key of the entities to return a dictionary (optional)
 
-    def _get_account_datasets(self) -> List[RemoteDataset]:
-        if "token" not in self.config:
-            return []
+            process (Callable): Callback function to process each entity.
+                Retrieved entity is provided as the argument and returned value
+                is stored as the entity. Retrieval is terminated if returned
+                value is False.
 
-        datasets = []
-        page = 1
-        while True:
-            # TODO: Add error handling
-            items, _ = self._request(f"deposit/depositions?page={page}&page_size={self.PAGE_SIZE}")
+        """
+        entities = self.iter_entities(endpoint, page_size, process)
+        if key:
+            return {entity[key]: entity for entity in entities}
+        return list(entities)
 
-            if not items:
-                break
 
+    def _iter_account_datasets(self) -> Iterator[RemoteDataset]:
+        if "token" not in self.config:
+            return
+
+        def _get_page(page: int) -> Tuple[List[Dict], int]:
+            try:
+                # TODO: Add error handling
+                items, response = self._request(f"deposit/depositions?page={page}&page_size={self.PAGE_SIZE}")
+            except HTTPError as err:
+                if page > 1 and err.response.status_code in [400, 404]:
+                    return [], None
+                raise
+            return items or [], self._get_page_count(response, self.PAGE_SIZE)
+
+        for items in self._iter_pages(_get_page, self.PAGE_SIZE):
             for item in items:
                 id = self.get_dataset_id(**item)
-                dataset = RemoteDataset(self, id)
-                datasets.append(dataset)
 
                 # Store details
                 self._set_details(id, item)
 
-                # Prevent unnecessary requests by triggering the use of available details
-                dataset.title
-                dataset.metadata
-                dataset.files
+                # REMARK: Standard details are available in the page content, no additional request is required
+                yield RemoteDataset(self, id, self._get_standard_details(item))
 
-            if len(items) < self.PAGE_SIZE:
-                break
 
-            page += 1
+    def _get_details_endpoints(self, id: Dict) -> List[str]:
+        """Returns end-points of the dataset details in order of preference
 
-        return datasets
+        Args:
+            id (Dict): Standard dataset id
+
+        Returns:
+            List of end-points
+        """
+        endpoints = [f"records/{id['id']}"]
+        if "token" in self.config:
+            endpoints.insert(0, f"deposit/depositions/{id['id']}")
+
+        return endpoints
 
 
     def _get_dataset_details(self, id: Dict) -> Dict:
@@ -423,17 +409,13 @@ class ZenodoClient(Client):
         if details:
             return details
 
-        endpoints = [f"records/{id['id']}"]
-        if "token" in self.config:
-            endpoints.insert(0, f"deposit/depositions/{id['id']}")
-
         details = None
-        for endpoint in endpoints:
+        for endpoint in self._get_details_endpoints(id):
             try:
                 details, _ = self._request(endpoint)
                 break
             except HTTPError as err:
-                if err.response.status_code in [401, 403, 404]:
+                if err.response.status_code in self.DETAILS_SKIPPED_STATUS_CODES:
                     continue
                 raise
 
@@ -950,21 +932,41 @@ class ZenodoClient(Client):
             if notify:
                 notify(file, monitor.bytes_read)
 
-        encoder = MultipartEncoderMonitor.from_fields(
-            fields={
-                'file': (file.path, open(file.fullpath, 'rb'), file.type),
-            },
-            callback=_notify
-        )
+        tries = 0
+        while True:
+            tries += 1
+
+            # REMARK: MD5 hash is computed from the streamed data to read the file only once
+            # REMARK: Streamed data cannot be sent again, therefore reader and encoder are created for each try
+            with MD5Reader(file) as reader:
+                encoder = MultipartEncoderMonitor.from_fields(
+                    fields={
+                        'file': (file.path, reader, file.type),
+                    },
+                    callback=_notify
+                )
 
-        # TODO: Add IO error handling
-        result, _ = self._request(
-            endpoint=f"deposit/depositions/{id['id']}/files",
-            method="POST",
-            data=encoder,
-            serialize=False,
-            headers={'Content-Type': encoder.content_type},
-        )
+                # TODO: Add IO error handling
+                try:
+                    result, _ = self._request(
+                        endpoint=f"deposit/depositions/{id['id']}/files",
+                        method="POST",
+                        data=encoder,
+                        serialize=False,
+                        headers={'Content-Type': encoder.content_type},
+                    )
+
+                except HTTPError as err:
+                    if err.response.status_code not in self.UPLOAD_RETRY_STATUS_CODES or tries >= self.RETRY_TRIES:
+                        raise
+                    sleep = self._get_retry_sleep(tries, err.response)
+
+                else:
+                    if reader.complete:
+                        file.md5 = reader.md5
+                    break
+
+            time.sleep(sleep)
 
         remote_file = RemoteFile(
             url=result["links"]["download"],
@@ -1050,8 +1052,18 @@ class ZenodoClient(Client):
         Returns:
             Details dictionary of the dataset.
         """
-        details = self._get_dataset_details(id)
+        return self._get_standard_details(self._get_dataset_details(id))
+
 
+    def _get_standard_details(self, details: Dict) -> Dict:
+        """Returns standard details from the raw dataset details.
+
+        Args:
+            details (Dict): Raw dataset details
+
+        Returns:
+            Details dictionary of the dataset.
+        """
         statuses = {
             "inprogress": "draft",
             "unsubmitted": "draft",
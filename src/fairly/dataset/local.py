@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import List, Dict, Set
+from typing import List, Dict, Set, Callable, Iterator
 
 from . import Dataset
 from ..metadata import Metadata
@@ -12,7 +12,120 @@ import re
 import csv
 import datetime
 import platform
+import tempfile
+import threading
 from functools import cached_property
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+class RuleMatcher:
+    """Compiled matcher of file rules.
+
+    Rules are compiled into a single case-insensitive regular expression.
+    Wildcards of the path part of a rule match the path separator, wildcards
+    of the file name part do not. Literal path prefixes of the rules are used
+    to decide if a directory may contain matching files.
+
+    Attributes:
+        _regexp (re.Pattern): Combined regular expression of the rules
+        _dir_regexp (re.Pattern): Combined regular expression of the
+            directories fully matched by the rules
+        _prefixes (list): Lower case literal path prefixes of the rules
+    """
+
+    def __init__(self, rules: List):
+        patterns = []
+        dir_patterns = []
+        self._prefixes = []
+
+        for rule in rules:
+            # REMARK: Extracted archive items are matched literally
+            if isinstance(rule, dict):
+                for items in rule.values():
+                    for item in items:
+                        self._add_rule(item, patterns, dir_patterns, literal=True)
+            else:
+                self._add_rule(rule, patterns, dir_patterns)
+
+        self._regexp = self._compile(patterns)
+        self._dir_regexp = self._compile(dir_patterns)
+
+
+    @staticmethod
+    def _compile(patterns: List) -> re.Pattern:
+        if not patterns:
+            return None
+        return re.compile("(?:" + "|".join(patterns) + ")", re.IGNORECASE)
+
+
+    @staticmethod
+    def _normalize(path: str) -> str:
+        if os.sep != "/":
+            path = path.replace(os.sep, "/")
+        if os.altsep and os.altsep != "/":
+            path = path.replace(os.altsep, "/")
+        return path
+
+
+    def _add_rule(self, rule: str, patterns: List, dir_patterns: List, literal: bool=False) -> None:
+        head, tail = os.path.split(rule)
+
+        # REMARK: Rules without a file name part cannot match files
+        if not tail:
+            return
+
+        head = self._normalize(head)
+
+        if literal:
+            head_pattern = re.escape(head)
+            tail_pattern = re.escape(tail)
+        else:
+            head_pattern = re.escape(head).replace("\\*", ".*").replace("\\?", ".")
+            tail_pattern = re.escape(tail).replace("\\*", "[^/]*").replace("\\?", "[^/]")
+
+        # REMARK: Rules without a path part match files of the top directory only
+        if not head:
+            patterns.append(tail_pattern)
+            return
+
+        patterns.append(f"{head_pattern}/{tail_pattern}")
+
+        # Get literal prefix of the rule
+        prefix = f"{head}/{tail}"
+        if not literal:
+            for i, char in enumerate(prefix):
+                if char in "*?":
+                    prefix = prefix[:i]
+                    break
+        self._prefixes.append(prefix.lower())
+
+        # REMARK: Sub-directories also match if the path part ends with an asterisk
+        if tail == "*" and head.endswith("*") and not literal:
+            dir_patterns.append(head_pattern)
+
+
+    def match(self, path: str) -> bool:
+        """Tests if a relative file path matches any of the rules"""
+        if not self._regexp:
+            return False
+        return self._regexp.fullmatch(self._normalize(path)) is not None
+
+
+    def match_dir(self, path: str) -> bool:
+        """Tests if all files under a relative directory path match the rules"""
+        if not self._dir_regexp:
+            return False
+        return self._dir_regexp.fullmatch(self._normalize(path)) is not None
+
+
+    def may_match_dir(self, path: str) -> bool:
+        """Tests if any file under a relative directory path might match the rules"""
+        path = self._normalize(path).lower() + "/"
+        for prefix in self._prefixes:
+            if prefix.startswith(path) or path.startswith(prefix):
+                return True
+        return False
+
 
 class LocalDataset(Dataset):
     """
@@ -25,10 +138,12 @@ class LocalDataset(Dataset):
         _md5s (dict): MD5 hash cache of the files
 
     Class Attributes:
-        _regexps (dict): Regular expression cache of the file rules
+        _matchers (dict): Compiled matcher cache of the file rules
     """
 
-    _regexps: Dict = {}
+    _matchers: Dict = {}
+
+    MD5_FILE = ".fairly_md5"
 
     def __init__(self, path: str, manifest_file: str="manifest.yaml"):
         """Initializes LocalDataset object.
@@ -164,6 +279,19 @@ class LocalDataset(Dataset):
         self._set_manifest(manifest)
 
 
+    def _get_matcher(self, rules: List) -> RuleMatcher:
+        """Returns cached compiled matcher of the file rules"""
+        key = tuple(
+            tuple((path, tuple(items)) for path, items in rule.items()) if isinstance(rule, dict) else rule
+            for rule in rules
+        )
+        matcher = self._matchers.get(key)
+        if matcher is None:
+            matcher = RuleMatcher(rules)
+            self._matchers[key] = matcher
+        return matcher
+
+
     def _match_rule(self, name: str, rule: str) -> bool:
         """Tests if a file name matches the specified rule.
 
@@ -171,7 +299,7 @@ class LocalDataset(Dataset):
         The asterisk matches any sequence of characters.
         The question mark matches any single character.
         Relative path and file name are handled separately to support path rules.
-        Cached regular expressions are created for each rule internally.
+        Cached compiled matchers are created for each rule internally.
 
         Examples rules:
         *            : All files
@@ -194,91 +322,214 @@ class LocalDataset(Dataset):
             None
 
         """
-        if not rule in self._regexps:
-            regexps = []
-            for part in os.path.split(rule):
-                if part:
-                    pattern = re.escape(part).replace("\*", ".*").replace("\?", ".")
-                    regexp = re.compile(f"^{pattern}$", re.IGNORECASE)
-                else:
-                    regexp = None
-                regexps.append(regexp)
-            self._regexps[rule] = regexps
-        for i, part in enumerate(os.path.split(name)):
-            regexp = self._regexps[rule][i]
-            if part:
-                if not regexp or not regexp.match(part):
-                    return False
-            elif regexp:
-                return False
-        return True
+        return self._get_matcher([rule]).match(name)
 
 
-    def _get_files(self) -> List[LocalFile]:
-        files = []
-        excludes = self.excludes
-        includes = self.includes
-        dirs = [self.path]
+    def iter_files(self) -> Iterator[LocalFile]:
+        """Iterates over the dataset files
+
+        Directories are walked breadth first. Stat results of the directory
+        entries are reused, and directories that cannot contain included
+        files or that are fully excluded are not walked.
+
+        Yields:
+            Files of the dataset matching the inclusion and exclusion rules
+        """
+        if not self.includes:
+            return
+        includes = self._get_matcher(self.includes)
+        excludes = self._get_matcher(self.excludes)
+
+        dirs = deque([""])
         while dirs:
-            dir = dirs.pop(0)
-            for file in os.listdir(dir):
-                fullpath = os.path.join(dir, file)
-                if os.path.isdir(fullpath):
-                    dirs.append(fullpath)
-                else:
-                    path = os.path.relpath(fullpath, self.path)
-
-                    if fullpath == self._manifest_path:
+            dir = dirs.popleft()
+            with os.scandir(os.path.join(self.path, dir) if dir else self.path) as entries:
+                for entry in entries:
+                    path = os.path.join(dir, entry.name) if dir else entry.name
+
+                    if entry.is_dir():
+                        if includes.may_match_dir(path) and not excludes.match_dir(path):
+                            dirs.append(path)
+                        continue
+
+                    # REMARK: Temporary cache files are also skipped
+                    if not dir and (entry.path == self._manifest_path or entry.name.startswith(self.MD5_FILE)):
                         continue
 
-                    if includes:
-                        matched = False
-                        for rule in includes:
-                            if self._match_rule(path, rule):
-                                matched = True
-                                break
-                        if not matched:
-                            continue
-                    else:
+                    if not includes.match(path) or excludes.match(path):
                         continue
 
-                    if excludes:
-                        matched = False
-                        for rule in excludes:
-                            if self._match_rule(path, rule):
-                                matched = True
-                                break
-                        if matched:
-                            continue
+                    # REMARK: Stat result is cached by the directory entry
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
 
-                    size = None
+                    # Use cached MD5 hash if the file is not modified
                     md5 = None
                     if path in self._md5s:
                         date, size, md5 = self._md5s[path]
-                        if not date or date != os.path.getmtime(fullpath) or size != os.path.getsize(fullpath):
-                            size = None
+                        if date != stat.st_mtime or size != stat.st_size:
                             md5 = None
-                    file = LocalFile(
-                        fullpath,
+
+                    yield LocalFile(
+                        entry.path,
                         basepath = self.path,
-                        md5 = md5
+                        md5 = md5,
+                        md5_callback = self._set_md5,
+                        stat = stat,
                     )
-                    files.append(file)
-        return files
 
 
-    def _load_md5s(self) -> None:
-        """Loads MD5 hashes stored in the dataset directory"""
-        self._md5s = {}
-        path = os.path.join(self.path, ".fairly_md5")
+    def _get_files(self) -> List[LocalFile]:
+        return list(self.iter_files())
+
+
+    def _read_md5s(self) -> Dict:
+        """Reads MD5 hashes stored in the dataset directory
+
+        Returns:
+            Dictionary of (modification time, size, MD5 hash) tuples by file path
+        """
+        md5s = {}
+        path = os.path.join(self.path, self.MD5_FILE)
         try:
-            with open(path, "r") as file:
+            with open(path, "r", newline="") as file:
                 reader = csv.reader(file)
-                for name, date, size, md5 in reader:
-                    self._md5s[name] = (date, size, md5)
-        except FileNotFoundError:
+                for row in reader:
+                    try:
+                        name, date, size, md5 = row
+                        md5s[name] = (float(date), int(size), md5)
+                    except ValueError:
+                        continue
+        except OSError:
             pass
 
+        return md5s
+
+
+    def _load_md5s(self) -> None:
+        """Loads MD5 hashes stored in the dataset directory"""
+        self._md5s = self._read_md5s()
+        self._md5s_changed = set()
+        self._md5s_lock = threading.Lock()
+
+
+    def _set_md5(self, file: LocalFile) -> None:
+        """Records MD5 hash of a dataset file
+
+        MD5 hash is appended to the cache file immediately to keep it even if
+        the cache is not saved afterwards. Appended hashes replace the earlier
+        ones of the same file when the cache is read, and the cache file is
+        compacted when it is saved. Hash is kept in memory only if the cache
+        file cannot be written (e.g. read-only dataset directory).
+
+        Args:
+            file (LocalFile): Dataset file with a known MD5 hash
+        """
+        entry = (file.mtime, file.size, file.md5)
+        with self._md5s_lock:
+            if self._md5s.get(file.path) == entry:
+                return
+            self._md5s[file.path] = entry
+            self._md5s_changed.add(file.path)
+            # REMARK: Appending a row avoids rewriting the cache file for each file of large datasets
+            try:
+                with open(os.path.join(self.path, self.MD5_FILE), "a", newline="") as stream:
+                    csv.writer(stream).writerow([file.path, *entry])
+            except OSError:
+                pass
+
+
+    def _save_md5s(self) -> None:
+        """Compacts the cache file with the changed MD5 hashes
+
+        Cache file is merged with the hashes stored by other processes and
+        replaced atomically. Changed hashes are kept in memory if the cache
+        file cannot be written.
+        """
+        if not self._md5s_changed:
+            return
+
+        # REMARK: Hashes stored by other processes are kept, concurrent
+        # updates can only cause cache misses
+        md5s = self._read_md5s()
+        for name in self._md5s_changed:
+            md5s[name] = self._md5s[name]
+
+        try:
+            fd, temppath = tempfile.mkstemp(prefix=f"{self.MD5_FILE}.", dir=self.path)
+            try:
+                with os.fdopen(fd, "w", newline="") as file:
+                    writer = csv.writer(file)
+                    for name, (date, size, md5) in md5s.items():
+                        writer.writerow([name, date, size, md5])
+                os.replace(temppath, os.path.join(self.path, self.MD5_FILE))
+            except:
+                try:
+                    os.remove(temppath)
+                except FileNotFoundError:
+                    pass
+                raise
+        except OSError:
+            # REMARK: Cache is optional, therefore hashes are not lost because of an unwritable cache file
+            return
+
+        self._md5s = md5s
+        self._md5s_changed = set()
+
+
+    def save_md5s(self) -> None:
+        """Compacts the MD5 cache file of the dataset"""
+        with self._md5s_lock:
+            self._save_md5s()
+
+
+    def compute_checksums(self, workers: int=None, notify: Callable=None) -> Dict[str, LocalFile]:
+        """Computes MD5 hashes of the dataset files in parallel
+
+        Files are hashed by a pool of threads, largest files first. Cached
+        hashes of the unmodified files are not computed again, and computed
+        hashes are stored in the MD5 cache of the dataset.
+
+        Args:
+            workers (int): Maximum number of concurrent hashing threads (default = number of CPUs)
+            notify (Callable): Notification callback function called after each
+                file as notify(file, file_size, total_size, current_total_size)
+
+        Returns:
+            Dictionary of files of the dataset (key = path, value = LocalFile object)
+        """
+        files = self.get_files()
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        # REMARK: Largest files are scheduled first to balance the load
+        pending = sorted(files.values(), key=lambda file: file.size, reverse=True)
+        total_size = sum(file.size for file in pending)
+        current_total_size = 0
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, min(workers, len(pending)))) as executor:
+                futures = {executor.submit(lambda file: file.md5, file): file for file in pending}
+                try:
+                    for future in as_completed(futures):
+                        future.result()
+                        file = futures[future]
+                        current_total_size += file.size
+                        if notify:
+                            notify(file, file.size, total_size, current_total_size)
+                except:
+                    # Stop remaining hashing
+                    for future in futures:
+                        future.cancel()
+                    raise
+        finally:
+            self.save_md5s()
+
+        return files
+
 
     def save_files(self) -> None:
         manifest = self._get_manifest()
@@ -289,7 +540,23 @@ class LocalDataset(Dataset):
         self._set_manifest(manifest)
 
 
-    def upload(self, repository, notify: Callable=None) -> RemoteDataset:
+    def upload(self, repository, notify: Callable=None, workers: int=None) -> RemoteDataset:
+        """Uploads the dataset to the specified repository
+
+        A new remote dataset is created and the files are uploaded
+        concurrently. Remote dataset is deleted if an upload fails.
+
+        Args:
+            repository: Repository identifier or client object
+            notify (Callable): Notification callback function
+            workers (int): Maximum number of concurrent uploads (default = client default)
+
+        Returns:
+            Remote dataset
+
+        Raises:
+            ValueError("Invalid repository")
+        """
         import fairly
         from ..client import Client
 
@@ -306,14 +573,16 @@ class LocalDataset(Dataset):
 
         try:
             # Upload files
-            files = self.get_files(refresh=True)
-            for path, file in files.items():
-                client.upload_file(dataset, file, notify)
+            files = list(self.get_files(refresh=True).values())
+            client.upload_files(dataset, files, notify, workers)
 
         except:
             client.delete_dataset(dataset.id)
             raise
 
+        # REMARK: MD5 hashes are computed during the upload
+        self.save_md5s()
+
         return dataset
 
 
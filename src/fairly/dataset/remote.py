@@ -74,13 +74,36 @@ class RemoteDataset(Dataset):
         return self.client.get_versions(self.id)
 
 
-    def _download_file(self, file: RemoteFile, path: str=None, name: str=None, notify: Callable=None) -> LocalFile:
-        return self.client.download_file(file, path, name, notify)
+    def _download_file(self, file: RemoteFile, path: str=None, name: str=None, notify: Callable=None, resume: bool=False) -> LocalFile:
+        return self.client.download_file(file, path, name, notify, resume=resume)
 
 
-    def store(self, path: str, notify: Callable=None, extract: bool=False) -> LocalDataset:
+    def store(self, path: str, notify: Callable=None, extract: bool=False, resume: bool=False, workers: int=None, max_bytes: int=None) -> LocalDataset:
+        """Stores the dataset in the specified directory
+
+        Files are downloaded concurrently. Aggregate progress is reported by
+        calling the notification callback function with four arguments, i.e.
+        file, current size, total size, and current total size.
+
+        Args:
+            path (str): Path of the directory to store the dataset
+            notify (Callable): Notification callback function
+            extract (bool): Set True to extract simple archive files (default = False)
+            resume (bool): Set True to resume an incomplete store operation.
+                Already downloaded and verified files are skipped, and
+                incomplete downloads are resumed (default = False)
+            workers (int): Maximum number of concurrent downloads (default = client default)
+            max_bytes (int): Maximum total size of the files downloaded at
+                the same time (default = no limit)
+
+        Returns:
+            Local dataset
+
+        Raises:
+            ValueError("Directory is not empty.")
+        """
         os.makedirs(path, exist_ok=True)
-        if os.listdir(path):
+        if os.listdir(path) and not resume:
             raise ValueError("Directory is not empty.")
 
         dataset = LocalDataset(path)
@@ -90,8 +113,11 @@ class RemoteDataset(Dataset):
         dataset.save_metadata()
 
         includes = dataset.includes
-        for name, file in self.files.items():
-            local_file = self._download_file(file, path, notify=notify)
+        # REMARK: Inclusion rules of an incomplete store operation are replaced
+        includes.clear()
+        remote_files = list(self.files.values())
+        local_files = self.client.download_files(remote_files, path, notify=notify, workers=workers, max_bytes=max_bytes, resume=resume)
+        for file, local_file in zip(remote_files, local_files):
             if extract and local_file.is_archive() and local_file.is_simple():
                 files = local_file.extract(path, notify=notify)
                 includes.append({file.path: files})
@@ -9,25 +9,84 @@ import zipfile
 import tarfile
 
 
+class MD5Reader:
+    """File reader computing MD5 hash of the data while it is being read.
+
+    Hash is valid only if the file is read sequentially until the end, which
+    can be checked by the ``complete`` attribute.
+    """
+
+    def __init__(self, file: "LocalFile"):
+        self._file = open(file.fullpath, "rb")
+        self._size = file.size
+        self._md5 = hashlib.md5()
+        self._current_size = 0
+
+    def __enter__(self) -> "MD5Reader":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def md5(self) -> str:
+        return self._md5.hexdigest()
+
+    @property
+    def complete(self) -> bool:
+        return self._current_size == self._size
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._file.read(size)
+        self._md5.update(data)
+        self._current_size += len(data)
+        return data
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+    def fileno(self) -> int:
+        return self._file.fileno()
+
+    def close(self) -> None:
+        self._file.close()
+
+
 class LocalFile(File):
 
     CHUNK_SIZE = 2**16
 
-    def __init__(self, fullpath: str, basepath: str = None, md5: str = None):
-        if not os.path.isfile(fullpath):
-            raise ValueError("Invalid file path")
+    # REMARK: Large buffers are used for hashing, because hashlib releases the GIL
+    HASH_BUFFER_SIZE = 2**20
+
+    def __init__(self, fullpath: str, basepath: str = None, md5: str = None, md5_callback: Callable = None,
+                 stat: os.stat_result = None):
+        if stat is None:
+            if not os.path.isfile(fullpath):
+                raise ValueError("Invalid file path")
+            stat = os.stat(fullpath)
         self._fullpath = fullpath
         self._path = os.path.relpath(
             fullpath, basepath) if basepath else fullpath
         self._name = os.path.basename(fullpath)
-        self._size = os.path.getsize(fullpath)
+        self._size = stat.st_size
+        self._mtime = stat.st_mtime
         self._type = None
         self._md5 = md5
+        # REMARK: Callback is called with the file object when the MD5 hash is set
+        self._md5_callback = md5_callback
 
     @property
     def fullpath(self) -> str:
         return self._fullpath
 
+    @property
+    def mtime(self) -> float:
+        """
+        Modification time of the file when the object was created.
+        """
+        return self._mtime
+
     @property
     def type(self) -> str:
         if self._type is None:
@@ -37,13 +96,23 @@ class LocalFile(File):
     @property
     def md5(self) -> str:
         if self._md5 is None:
-            with open(self.fullpath, "rb") as file:
-                md5 = hashlib.md5()
-                while chunk := file.read(self.CHUNK_SIZE):
-                    md5.update(chunk)
+            md5 = hashlib.md5()
+            buffer = bytearray(min(self.HASH_BUFFER_SIZE, max(self.size, 1)))
+            view = memoryview(buffer)
+            with open(self.fullpath, "rb", buffering=0) as file:
+                while size := file.readinto(buffer):
+                    md5.update(view[:size])
             self._md5 = md5.hexdigest()
+            if self._md5_callback:
+                self._md5_callback(self)
         return self._md5
 
+    @md5.setter
+    def md5(self, val: str) -> None:
+        self._md5 = val
+        if self._md5_callback:
+            self._md5_callback(self)
+
     def match(self, val: str) -> bool:
         return True if self.fullpath == val else super().match(val)
 
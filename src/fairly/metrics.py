@@ -0,0 +1,332 @@
+"""
+Request instrumentation
+
+Clients emit an event for each HTTP request of their API calls and file
+downloads. Events are passed to the registered listeners, which can be any
+callable or a RequestMetrics aggregator.
+
+Examples:
+    >>> with fairly.metrics.RequestMetrics() as metrics:
+    >>>     dataset.metadata
+    >>> metrics.print_summary()
+"""
+from typing import Callable, Dict, Iterator, List, TextIO
+
+from contextlib import contextmanager
+from urllib.parse import urlparse
+import re
+import sys
+import threading
+import time
+
+
+class RequestEvent:
+    """Event of a HTTP request sent by a client.
+
+    Attributes:
+        client (str): Client identifier
+        method (str): HTTP method
+        url (str): URL address
+        endpoint (str): Endpoint template of the URL address
+        status (int): Status code, None if no response is received
+        bytes_sent (int): Size of the request body in bytes, None if unknown
+        bytes_received (int): Size of the received response body in bytes
+        duration (float): Duration of the request in seconds
+        tries (int): Number of tries
+        cache (str): Response cache status ("hit", "miss", "revalidated"),
+            None if the response is not cacheable
+        error (Exception): Exception raised by the request, None if successful
+    """
+
+    def __init__(self, client: str, method: str, url: str):
+        self.client = client
+        self.method = method.upper()
+        self.url = url
+        self.endpoint = None
+        self.status = None
+        self.bytes_sent = None
+        self.bytes_received = 0
+        self.duration = None
+        self.tries = 1
+        self.cache = None
+        self.error = None
+
+
+    def __repr__(self) -> str:
+        return f"RequestEvent({self.method} {self.endpoint or self.url}, status={self.status}, duration={self.duration})"
+
+
+    @property
+    def retries(self) -> int:
+        """Number of retries"""
+        return self.tries - 1
+
+
+_listeners: List[Callable] = []
+_listeners_lock = threading.Lock()
+
+# REMARK: Numeric and token-like path segments are replaced to group the requests by endpoint
+REGEXP_ID = re.compile(r"^\d+$")
+REGEXP_TOKEN = re.compile(r"^[0-9a-f]{8}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{12}$|^[0-9a-f]{32,}$", re.IGNORECASE)
+
+
+def add_listener(listener: Callable) -> None:
+    """Registers a listener of the request events.
+
+    Args:
+        listener (Callable): Function called with each request event
+    """
+    with _listeners_lock:
+        _listeners.append(listener)
+
+
+def remove_listener(listener: Callable) -> None:
+    """Unregisters a listener of the request events.
+
+    Args:
+        listener (Callable): Registered listener
+
+    Raises:
+        ValueError: If listener is not registered
+    """
+    with _listeners_lock:
+        _listeners.remove(listener)
+
+
+def get_endpoint(url: str, api_url: str=None) -> str:
+    """Returns endpoint template of a URL address.
+
+    Query string is removed, and numeric and token-like path segments are
+    replaced by placeholders, e.g. ``deposit/depositions/{id}/files``.
+
+    Args:
+        url (str): URL address
+        api_url (str): API URL address the endpoints are relative to (optional)
+
+    Returns:
+        Endpoint template
+    """
+    if api_url and url.startswith(api_url):
+        path = url[len(api_url):]
+    else:
+        path = urlparse(url).path
+    path = path.split("?", 1)[0]
+
+    segments = []
+    for segment in path.split("/"):
+        if REGEXP_ID.match(segment):
+            segment = "{id}"
+        elif REGEXP_TOKEN.match(segment):
+            segment = "{token}"
+        segments.append(segment)
+
+    return "/".join(segments)
+
+
+def emit(event: RequestEvent) -> None:
+    """Passes a request event to the listeners."""
+    with _listeners_lock:
+        listeners = list(_listeners)
+    for listener in listeners:
+        listener(event)
+
+
+@contextmanager
+def record(client: str, method: str, url: str, api_url: str=None) -> Iterator[RequestEvent]:
+    """Records a request and emits its event when the block is exited.
+
+    Details of the request (e.g. status, bytes) are set to the yielded event
+    by the block. Duration and error are set automatically. Events are not
+    emitted if there are no listeners.
+
+    Args:
+        client (str): Client identifier
+        method (str): HTTP method
+        url (str): URL address
+        api_url (str): API URL address the endpoints are relative to (optional)
+
+    Yields:
+        Request event
+    """
+    event = RequestEvent(client, method, url)
+    start = time.perf_counter()
+    try:
+        yield event
+    except Exception as err:
+        event.error = err
+        raise
+    finally:
+        if _listeners:
+            event.duration = time.perf_counter() - start
+            event.endpoint = get_endpoint(url, api_url)
+            emit(event)
+
+
+def get_body_size(data) -> int:
+    """Returns size of a request body in bytes, None if unknown"""
+    if data is None:
+        return 0
+    if isinstance(data, bytes):
+        return len(data)
+    if isinstance(data, str):
+        return len(data.encode("utf-8"))
+    # REMARK: Streamed bodies (e.g. multipart encoders) might specify their size
+    size = getattr(data, "len", None)
+    return size if isinstance(size, int) else None
+
+
+class RequestMetrics:
+    """Aggregator of the request events by method and endpoint template.
+
+    Aggregator is registered as a listener while it is used as a context
+    manager, or between the calls of start() and stop().
+
+    Attributes:
+        _stats (Dict): Statistics by method and endpoint
+        _lock (Lock): Lock of the statistics
+    """
+
+    # Upper bounds of the duration histogram buckets in seconds
+    BUCKETS = [0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+
+    # Width of the histogram bars in characters
+    BAR_WIDTH = 40
+
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+
+
+    def __call__(self, event: RequestEvent) -> None:
+        self.add(event)
+
+
+    def __enter__(self) -> "RequestMetrics":
+        return self.start()
+
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+
+    def start(self) -> "RequestMetrics":
+        """Starts collecting the request events."""
+        add_listener(self)
+        return self
+
+
+    def stop(self) -> None:
+        """Stops collecting the request events."""
+        remove_listener(self)
+
+
+    def reset(self) -> None:
+        """Discards the collected statistics."""
+        with self._lock:
+            self._stats = {}
+
+
+    def add(self, event: RequestEvent) -> None:
+        """Adds a request event to the statistics."""
+        key = (event.method, event.endpoint)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = {
+                    "count": 0,
+                    "errors": 0,
+                    "retries": 0,
+                    "bytes_sent": 0,
+                    "bytes_received": 0,
+                    "statuses": {},
+                    "cache": {},
+                    "durations": [],
+                }
+            stats["count"] += 1
+            if event.error is not None or event.status is None or event.status >= 400:
+                stats["errors"] += 1
+            stats["retries"] += event.retries
+            stats["bytes_sent"] += event.bytes_sent or 0
+            stats["bytes_received"] += event.bytes_received or 0
+            stats["statuses"][event.status] = stats["statuses"].get(event.status, 0) + 1
+            if event.cache:
+                stats["cache"][event.cache] = stats["cache"].get(event.cache, 0) + 1
+            stats["durations"].append(event.duration)
+
+
+    def get_histogram(self, durations: List[float]) -> List[int]:
+        """Returns number of durations in each bucket, the last bucket is unbounded"""
+        histogram = [0] * (len(self.BUCKETS) + 1)
+        for duration in durations:
+            for i, bound in enumerate(self.BUCKETS):
+                if duration <= bound:
+                    histogram[i] += 1
+                    break
+            else:
+                histogram[-1] += 1
+        return histogram
+
+
+    def get_summary(self) -> Dict:
+        """Returns statistics of the requests by endpoint.
+
+        Returns:
+            Dictionary of the statistics by "<method> <endpoint>", including
+            number of requests, errors and retries, bytes sent and received,
+            status code and cache status counts, total, mean, median, 95th
+            percentile and maximum durations in seconds, and duration
+            histogram counts of the buckets.
+        """
+        with self._lock:
+            items = [(key, dict(stats, durations=sorted(stats["durations"]))) for key, stats in self._stats.items()]
+
+        summary = {}
+        for (method, endpoint), stats in sorted(items, key=lambda item: -item[1]["count"]):
+            durations = stats.pop("durations")
+            stats["duration"] = sum(durations)
+            stats["mean"] = stats["duration"] / len(durations)
+            stats["median"] = durations[(len(durations) - 1) // 2]
+            stats["p95"] = durations[min(len(durations) - 1, int(len(durations) * 0.95))]
+            stats["max"] = durations[-1]
+            stats["histogram"] = self.get_histogram(durations)
+            summary[f"{method} {endpoint}"] = stats
+        return summary
+
+
+    def format_summary(self) -> str:
+        """Returns statistics of the requests as a text report"""
+        lines = []
+        for name, stats in self.get_summary().items():
+            line = (
+                f"{name}: {stats['count']} requests, {stats['errors']} errors, {stats['retries']} retries, "
+                f"{stats['bytes_sent']} bytes sent, {stats['bytes_received']} bytes received"
+            )
+            if stats["cache"]:
+                line += ", cache " + ", ".join(f"{key}={val}" for key, val in sorted(stats["cache"].items()))
+            lines.append(line)
+            lines.append(
+                f"    mean {stats['mean'] * 1000:.1f} ms, median {stats['median'] * 1000:.1f} ms, "
+                f"p95 {stats['p95'] * 1000:.1f} ms, max {stats['max'] * 1000:.1f} ms"
+            )
+
+            histogram = stats["histogram"]
+            top = max(histogram)
+            labels = [f"<= {bound * 1000:g} ms" for bound in self.BUCKETS] + [f"> {self.BUCKETS[-1] * 1000:g} ms"]
+            # REMARK: Empty buckets before the first and after the last durations are skipped
+            first = next(i for i, count in enumerate(histogram) if count)
+            last = len(histogram) - next(i for i, count in enumerate(reversed(histogram)) if count)
+            for label, count in zip(labels[first:last], histogram[first:last]):
+                bar = "#" * max(1 if count else 0, round(count / top * self.BAR_WIDTH))
+                lines.append(f"    {label:>12} {count:>6} {bar}")
+
+        return "\n".join(lines)
+
+
+    def print_summary(self, file: TextIO=None) -> None:
+        """Prints statistics of the requests.
+
+        Args:
+            file (TextIO): Output stream (default = standard output)
+        """
+        print(self.format_summary(), file=file or sys.stdout)
@@ -0,0 +1,153 @@
+from typing import Dict, List, Mapping
+
+from email.utils import parsedate_to_datetime
+import threading
+import time
+
+
+class RateLimiter:
+    """Client-side tracker of a server rate limit.
+
+    Remaining number of requests and reset time of the current rate limit
+    window are read from the response headers. Requests are delayed until the
+    reset time if the remaining requests are reserved, so that the rate limit
+    is not exceeded by the concurrent requests.
+
+    Attributes:
+        _remaining (int): Remaining number of requests of the current window
+        _reset (float): Reset time of the current window (epoch seconds)
+        _lock (Lock): Lock of the rate limit state
+    """
+
+    # Number of requests kept in reserve
+    RESERVE = 1
+
+    # Maximum waiting time in seconds
+    MAX_SLEEP = 300
+
+    # REMARK: Reset values smaller than this are regarded as seconds to reset
+    RESET_EPOCH = 10**9
+
+
+    def __init__(self):
+        self._remaining = None
+        self._reset = None
+        self._lock = threading.Lock()
+
+
+    def reserve(self) -> float:
+        """Reserves a request and returns the waiting time before sending it.
+
+        Returns:
+            Waiting time in seconds
+        """
+        with self._lock:
+            if self._remaining is None or self._reset is None:
+                return 0
+
+            now = time.time()
+            if self._reset <= now:
+                self._remaining = None
+                self._reset = None
+                return 0
+
+            if self._remaining <= self.RESERVE:
+                return min(self._reset - now, self.MAX_SLEEP)
+
+            self._remaining -= 1
+            return 0
+
+
+    def acquire(self) -> None:
+        """Waits until a request can be sent without exceeding the rate limit."""
+        sleep = self.reserve()
+        if sleep > 0:
+            time.sleep(sleep)
+
+
+    def update(self, headers: Mapping, status_code: int=None) -> None:
+        """Updates rate limit state from the response headers.
+
+        Args:
+            headers (Mapping): Response headers
+            status_code (int): Response status code (optional)
+        """
+        remaining = self.get_header(headers, ["X-RateLimit-Remaining", "RateLimit-Remaining"])
+        reset = self.get_header(headers, ["X-RateLimit-Reset", "RateLimit-Reset"])
+
+        now = time.time()
+        if reset is not None and reset < self.RESET_EPOCH:
+            reset += now
+
+        # REMARK: Server rejected the request, therefore no requests are remaining
+        if status_code == 429:
+            remaining = 0
+            if reset is None:
+                delay = get_retry_after(headers)
+                if delay is not None:
+                    reset = now + delay
+
+        with self._lock:
+            if reset is not None and reset > now:
+                self._reset = reset
+                if remaining is not None:
+                    self._remaining = int(remaining)
+            elif reset is not None:
+                self._remaining = None
+                self._reset = None
+
+
+    @staticmethod
+    def get_header(headers: Mapping, names: List[str]) -> float:
+        for name in names:
+            val = headers.get(name)
+            if val is None:
+                continue
+            try:
+                return float(val)
+            except ValueError:
+                continue
+        return None
+
+
+def get_retry_after(headers: Mapping) -> float:
+    """Returns waiting time specified by the Retry-After header.
+
+    Args:
+        headers (Mapping): Response headers
+
+    Returns:
+        Waiting time in seconds if specified, None otherwise
+    """
+    val = headers.get("Retry-After")
+    if not val:
+        return None
+
+    try:
+        return max(0.0, float(val))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(val).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+_rate_limiters: Dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(key: str) -> RateLimiter:
+    """Returns shared rate limiter of the specified key (e.g. API URL address).
+
+    Args:
+        key (str): Rate limiter key
+
+    Returns:
+        Rate limiter object
+    """
+    with _rate_limiters_lock:
+        if key not in _rate_limiters:
+            _rate_limiters[key] = RateLimiter()
+        return _rate_limiters[key]
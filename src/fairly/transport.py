@@ -0,0 +1,89 @@
+from typing import List, Tuple
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.poolmanager import PoolKey, PoolManager, _default_key_normalizer
+from collections import namedtuple
+from functools import partial
+import socket
+
+
+# REMARK: urllib3 < 2 does not include block size in the connection pool keys
+if "key_blocksize" in PoolKey._fields:
+    BlocksizePoolKey = None
+else:
+    BlocksizePoolKey = namedtuple("BlocksizePoolKey", PoolKey._fields + ("key_blocksize",))
+
+
+class TransportAdapter(HTTPAdapter):
+    """HTTP transport adapter tuned for large data transfers.
+
+    Block size of the connections and socket options are set only for the
+    connection pools of the adapter, therefore global state is not modified.
+
+    Attributes:
+        blocksize (int): Block size of the sent data in bytes
+        buffer_size (int): Socket send and receive buffer sizes in bytes,
+            None to use the operating system defaults
+        keepalive (bool): True to enable TCP keep-alive probes
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + ["blocksize", "buffer_size", "keepalive"]
+
+
+    def __init__(self, blocksize: int=2**16, buffer_size: int=None, keepalive: bool=True, **kwargs):
+        """Initializes TransportAdapter object.
+
+        Args:
+            blocksize (int): Block size of the sent data in bytes (default = 64 KiB)
+            buffer_size (int): Socket buffer sizes in bytes (optional)
+            keepalive (bool): True to enable TCP keep-alive probes (default = True)
+            **kwargs: Other HTTPAdapter arguments (e.g. pool_connections, pool_maxsize)
+        """
+        # REMARK: Attributes are required by init_poolmanager() called by the parent
+        self.blocksize = blocksize
+        self.buffer_size = buffer_size
+        self.keepalive = keepalive
+        super().__init__(**kwargs)
+
+
+    def _get_socket_options(self) -> List[Tuple]:
+        """Returns socket options of the connections"""
+        options = list(HTTPConnection.default_socket_options)
+
+        if self.keepalive:
+            options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+
+        # REMARK: Setting buffer sizes disables automatic tuning on some platforms
+        if self.buffer_size:
+            options.append((socket.SOL_SOCKET, socket.SO_SNDBUF, self.buffer_size))
+            options.append((socket.SOL_SOCKET, socket.SO_RCVBUF, self.buffer_size))
+
+        return options
+
+
+    def _get_pool_kwargs(self, pool_kwargs: dict) -> dict:
+        pool_kwargs.setdefault("socket_options", self._get_socket_options())
+        if self.blocksize:
+            pool_kwargs.setdefault("blocksize", self.blocksize)
+        return pool_kwargs
+
+
+    @staticmethod
+    def _set_key_fn(manager: PoolManager) -> PoolManager:
+        if BlocksizePoolKey:
+            manager.key_fn_by_scheme = {
+                scheme: partial(_default_key_normalizer, BlocksizePoolKey) for scheme in ["http", "https"]
+            }
+        return manager
+
+
+    def init_poolmanager(self, connections: int, maxsize: int, block: bool=False, **pool_kwargs) -> None:
+        super().init_poolmanager(connections, maxsize, block, **self._get_pool_kwargs(pool_kwargs))
+        self._set_key_fn(self.poolmanager)
+
+
+    def proxy_manager_for(self, proxy: str, **proxy_kwargs) -> PoolManager:
+        if proxy in self.proxy_manager:
+            return self.proxy_manager[proxy]
+        return self._set_key_fn(super().proxy_manager_for(proxy, **self._get_pool_kwargs(proxy_kwargs)))
@@ -1,5 +1,14 @@
+import os
+import sys
+import threading
 import pytest
 
+from fairly import metrics
+
+# REMARK: Mock repository server of the benchmarks is used for offline testing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+from server import MockServer
+
 
 @pytest.fixture(scope="session")
 def dummy_dataset(tmpdir_factory):
@@ -10,4 +19,40 @@ def dummy_dataset(tmpdir_factory):
         with open(f"{dataset}/file_{i}.txt", "w") as f:
             f.write(f"file_{i}")
     return dataset
-    
\ No newline at end of file
+
+
+@pytest.fixture
+def mock_server():
+    """Create mock repository servers that are stopped after the test"""
+    servers = []
+    def _create(**kwargs):
+        server = MockServer(**kwargs).start()
+        servers.append(server)
+        return server
+    yield _create
+    for server in servers:
+        server.stop()
+
+
+@pytest.fixture
+def mock_client():
+    """Create clients connected to a mock repository server with short retry waits"""
+    def _create(server, client_id: str="zenodo", **kwargs):
+        client = server.create_client(client_id, token="token")
+        client.RETRY_SLEEP = 0.01
+        # Set other client attributes (e.g. PART_SIZE)
+        for key, val in kwargs.items():
+            setattr(client, key, val)
+        return client
+    return _create
+
+
+@pytest.fixture
+def request_threads():
+    """Collect identifiers of the threads sending requests during the test"""
+    threads = set()
+    def _listener(event):
+        threads.add(threading.get_ident())
+    metrics.add_listener(_listener)
+    yield threads
+    metrics.remove_listener(_listener)
@@ -0,0 +1,93 @@
+import os
+import time
+import asyncio
+import threading
+import pytest
+
+pytest.importorskip("httpx")
+
+from fairly import metrics
+from fairly.aio import AsyncClient
+
+# Size of the downloaded files
+FILE_SIZE = 2**18
+
+
+def test_get_datasets(mock_server, mock_client, request_threads):
+    server = mock_server(datasets=8, files=2, file_size=FILE_SIZE, latency=0.01)
+    client = mock_client(server)
+
+    async def _get_datasets():
+        async with AsyncClient(client) as async_client:
+            datasets = await asyncio.gather(*[async_client.get_dataset(id=str(id)) for id in range(1, 9)])
+            files = await asyncio.gather(*[async_client.get_files(dataset.id) for dataset in datasets])
+            return datasets, files, threading.get_ident()
+
+    datasets, files, loop_thread = asyncio.run(_get_datasets())
+    assert [dataset.id["id"] for dataset in datasets] == [str(id) for id in range(1, 9)]
+    assert all(dataset.title for dataset in datasets)
+    assert [len(items) for items in files] == [2] * 8
+    # Requests are sent by the event loop instead of worker threads
+    assert request_threads == {loop_thread}
+    assert server.stats["requests"] == 8
+
+
+@pytest.mark.parametrize("client_id", ["zenodo", "figshare"])
+def test_get_metadata(mock_server, mock_client, client_id):
+    server = mock_server(datasets=4)
+    client = mock_client(server, client_id)
+
+    async def _get_metadata():
+        async with AsyncClient(client) as async_client:
+            ids = [client.get_dataset_id(str(id)) for id in range(1, 5)]
+            return await asyncio.gather(*[async_client.get_metadata(id) for id in ids])
+
+    metadata = asyncio.run(_get_metadata())
+    # Lists required to parse the metadata are retrieved once
+    assert server.stats["requests"] == 4 + (2 if client_id == "figshare" else 0)
+    assert [item["title"] for item in metadata] == [client.get_metadata(client.get_dataset_id(str(id)))["title"] for id in range(1, 5)]
+    assert all(item["title"] for item in metadata)
+
+
+def test_get_datasets_concurrent(mock_server, mock_client):
+    server = mock_server(datasets=48, latency=0.5)
+    client = mock_client(server)
+
+    intervals = []
+    def _listener(event):
+        intervals.append((time.perf_counter() - event.duration, time.perf_counter()))
+
+    async def _get_datasets():
+        async with AsyncClient(client) as async_client:
+            return await asyncio.gather(*[async_client.get_dataset(id=str(id)) for id in range(1, 49)])
+
+    metrics.add_listener(_listener)
+    try:
+        datasets = asyncio.run(_get_datasets())
+    finally:
+        metrics.remove_listener(_listener)
+
+    assert len(datasets) == 48
+    # Concurrent lookups are not limited by the number of worker threads
+    concurrency = max(sum(1 for start, end in intervals if start <= time < end) for time, _ in intervals)
+    assert concurrency > AsyncClient.MAX_WORKERS
+
+
+@pytest.mark.parametrize("failure_rate, drop_rate", [(0, 0), (0.5, 0), (0, 0.5)])
+def test_download_file(mock_server, mock_client, tmp_path, failure_rate, drop_rate):
+    server = mock_server(datasets=1, files=8, file_size=FILE_SIZE, seed=1)
+    client = mock_client(server)
+    client.RETRY_TRIES = 20
+    files = list(client.get_dataset(id="1").files.values())
+
+    async def _download_files():
+        async with AsyncClient(client) as async_client:
+            return await asyncio.gather(*[async_client.download_file(file, str(tmp_path)) for file in files])
+
+    server.failure_rate = failure_rate
+    server.drop_rate = drop_rate
+    local_files = asyncio.run(_download_files())
+    assert [local_file.md5 for local_file in local_files] == [file.md5 for file in files]
+    assert sorted(os.listdir(tmp_path)) == sorted(file.name for file in files)
+    # Failed downloads are restarted
+    assert server.stats["failures"] + server.stats["drops"] > 0 or not (failure_rate or drop_rate)
@@ -0,0 +1,151 @@
+import os
+import time
+import pytest
+import requests
+
+from fairly import metrics
+from fairly.cache import HTTPCache
+
+# Lifetime of the cached records, fresh or stale
+FRESH = [(r"^records/\d+$", 300)]
+STALE = [(r"^records/\d+$", 1e-6)]
+
+
+def create_client(mock_client, server, path, token: str="token"):
+    client = mock_client(server)
+    client.config["cache"] = True
+    client.config["token"] = token
+    client._http_cache = HTTPCache(str(path))
+    return client
+
+
+@pytest.fixture
+def cache_events():
+    """Collect cache statuses of the requests during the test"""
+    events = []
+    def _listener(event):
+        events.append(event.cache)
+    metrics.add_listener(_listener)
+    yield events
+    metrics.remove_listener(_listener)
+
+
+def test_cache_hit(mock_server, mock_client, tmp_path, cache_events):
+    server = mock_server(datasets=1)
+    client = create_client(mock_client, server, tmp_path)
+    client.CACHE_TTL = FRESH
+
+    content, _ = client._request("records/1")
+    server.reset_stats()
+    cached, response = client._request("records/1")
+    assert cached == content
+    assert response.headers["ETag"]
+    # Fresh response is used without a request
+    assert server.stats["requests"] == 0
+    assert cache_events == ["miss", "hit"]
+
+    # Other clients share the cache
+    client = create_client(mock_client, server, tmp_path)
+    client.CACHE_TTL = FRESH
+    assert client._request("records/1")[0] == content
+    assert server.stats["requests"] == 0
+
+
+def test_cache_revalidated(mock_server, mock_client, tmp_path, cache_events):
+    server = mock_server(datasets=1)
+    client = create_client(mock_client, server, tmp_path)
+    client.CACHE_TTL = STALE
+
+    content, _ = client._request("records/1")
+    key = client._http_cache.get_key(client.config["api_url"] + "records/1", "Bearer token")
+    validated = client._http_cache.get(key)["time"]
+
+    # Stale response is validated by a conditional request
+    server.reset_stats()
+    cached, response = client._request("records/1")
+    assert cached == content
+    assert response.status_code == 200
+    assert server.stats["not_modified"] == 1
+    assert cache_events == ["miss", "revalidated"]
+    assert client._http_cache.get(key)["time"] > validated
+
+
+def test_cache_replaced(mock_server, mock_client, tmp_path, cache_events):
+    server = mock_server(datasets=0)
+    id = server.add_dataset({"file.txt": b"content"}, "Title")
+    client = create_client(mock_client, server, tmp_path)
+    client.CACHE_TTL = STALE
+
+    content, _ = client._request(f"records/{id}")
+    assert content["metadata"]["title"] == "Title"
+
+    # Modified response replaces the cached one
+    server.get_dataset(id)["title"] = "Modified"
+    content, _ = client._request(f"records/{id}")
+    assert content["metadata"]["title"] == "Modified"
+    assert server.stats["not_modified"] == 0
+
+    client.CACHE_TTL = FRESH
+    content, _ = client._request(f"records/{id}")
+    assert content["metadata"]["title"] == "Modified"
+    assert cache_events == ["miss", "miss", "hit"]
+
+
+def test_cache_auth(mock_server, mock_client, tmp_path, cache_events):
+    server = mock_server(datasets=1)
+    client = create_client(mock_client, server, tmp_path)
+    client.CACHE_TTL = FRESH
+    client._request("records/1")
+
+    # Responses of different users are cached separately
+    other = create_client(mock_client, server, tmp_path, token="other")
+    other.CACHE_TTL = FRESH
+    other._request("records/1")
+    client._request("records/1")
+    other._request("records/1")
+    assert cache_events == ["miss", "miss", "hit", "hit"]
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_cache_not_cacheable(mock_server, mock_client, tmp_path, cache_events):
+    server = mock_server(datasets=1)
+    client = create_client(mock_client, server, tmp_path)
+    client.CACHE_TTL = FRESH
+
+    # Error responses are not cached
+    with pytest.raises(requests.HTTPError):
+        client._request("records/2")
+    assert os.listdir(tmp_path) == []
+
+    # Responses are not cached if the cache is disabled
+    client.config["cache"] = False
+    client._request("records/1")
+    assert os.listdir(tmp_path) == []
+    assert cache_events == ["miss", None]
+
+
+def test_cache_prune(tmp_path):
+    cache = HTTPCache(str(tmp_path))
+    response = requests.Response()
+    response.url = "http://localhost/"
+    response.status_code = 200
+    response._content = b"x" * 1000
+
+    keys = [cache.get_key(f"http://localhost/{i}") for i in range(4)]
+    for i, key in enumerate(keys):
+        cache.set(key, response)
+        # REMARK: Modification times are set explicitly to order the entries
+        os.utime(cache._get_filename(key), (time.time() - 100 + i, time.time() - 100 + i))
+    size = os.path.getsize(cache._get_filename(keys[0]))
+
+    # Reading an entry marks it as recently used
+    assert cache.get(keys[0])
+
+    # Least recently used entries are removed if the cache is full
+    # REMARK: Sizes of the entries might differ slightly due to the stored times
+    cache.max_size = 3 * size + size // 2
+    cache.set(cache.get_key("http://localhost/4"), response)
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) is None
+    assert cache.get(keys[0]) and cache.get(keys[3])
+    assert len(os.listdir(tmp_path)) == 3
@@ -0,0 +1,150 @@
+import os
+import json
+import time
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+
+import fairly
+
+# Number of datasets of the account and page size
+DATASETS = 95
+PAGE_SIZE = 10
+
+
+@pytest.mark.parametrize("client_id", ["zenodo", "figshare"])
+def test_account_datasets_read_ahead(mock_server, mock_client, request_threads, client_id):
+    server = mock_server(datasets=DATASETS, latency=0.01)
+    client = mock_client(server, client_id)
+    client.PAGE_SIZE = PAGE_SIZE
+    client.PAGE_WORKERS = 4
+
+    datasets = client.get_account_datasets()
+    assert [int(dataset.id["id"]) for dataset in datasets] == list(range(1, DATASETS + 1))
+    # Following pages are retrieved in the background
+    assert len(request_threads) > 1
+
+
+@pytest.mark.parametrize("client_id", ["zenodo", "figshare"])
+def test_account_datasets_last_page(mock_server, mock_client, client_id):
+    server = mock_server(datasets=DATASETS)
+    client = mock_client(server, client_id)
+    client.PAGE_SIZE = PAGE_SIZE
+    client.PAGE_WORKERS = 0
+
+    server.reset_stats()
+    datasets = client.get_account_datasets()
+    assert len(datasets) == DATASETS
+    # Last page is detected by its size without requesting an empty page
+    assert server.stats["requests"] == DATASETS // PAGE_SIZE + 1
+
+
+@pytest.mark.parametrize("client_id", ["zenodo", "figshare"])
+def test_session_concurrent(mock_server, mock_client, client_id):
+    server = mock_server(datasets=8)
+    client = mock_client(server, client_id)
+
+    sessions = []
+    create_session = client._create_session
+    def _create_session():
+        # Delay session creation to overlap the first requests
+        time.sleep(0.05)
+        sessions.append(create_session())
+        return sessions[-1]
+    client._create_session = _create_session
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        datasets = list(executor.map(lambda id: client.get_dataset(id=str(id)).title, range(1, 9)))
+    assert all(datasets)
+    # Session is created once and shared by the threads
+    assert len(sessions) == 1
+
+
+@pytest.fixture
+def repositories(tmp_path, monkeypatch):
+    """Create user repositories and reset the loaded client classes"""
+    os.makedirs(tmp_path / ".fairly")
+    with open(tmp_path / ".fairly" / "repositories.json", "w") as file:
+        json.dump({"myrepo": {
+            "client_id": "figshare",
+            "name": "My Repository",
+            "url": "https://myrepo.org/",
+            "token": "token",
+            "other": "other",
+        }}, file)
+    monkeypatch.setenv("HOME", str(tmp_path))
+    fairly.get_clients.cache_clear()
+    fairly.reload_config()
+    yield fairly.get_repositories()
+    fairly.get_clients.cache_clear()
+    fairly.reload_config()
+
+
+def test_repository_config(repositories):
+    repository = repositories["myrepo"]
+    assert repository["name"] == "My Repository"
+    assert "token" not in repository
+
+    # Client specific configuration is set when the client class is loaded
+    cls = fairly.get_clients()["figshare"]
+    assert repository["token"] == "token"
+    assert "other" not in repository
+    assert fairly.get_repository("myrepo") == {"id": "myrepo", "client_id": "figshare", **cls.get_config(**{
+        "name": "My Repository", "url": "https://myrepo.org/", "token": "token", "other": "other",
+    })}
+
+
+@pytest.fixture
+def user_config(tmp_path, monkeypatch):
+    """Set home directory of the user and reset the loaded configuration"""
+    os.makedirs(tmp_path / ".fairly")
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.delenv("FAIRLY_ZENODO_TOKEN", raising=False)
+    fairly.reload_config()
+    fairly.clear_clients()
+    yield tmp_path / ".fairly" / "config.json"
+    fairly.reload_config()
+    fairly.clear_clients()
+
+
+def test_config_file(user_config):
+    def _write(token: str):
+        with open(user_config, "w") as file:
+            json.dump({"zenodo": {"token": token}}, file)
+
+    _write("first")
+    client = fairly.client("zenodo")
+    assert client.config["token"] == "first"
+
+    # Unmodified configuration file is not read again
+    misses = fairly._read_config.cache_info().misses
+    assert fairly.client("zenodo") is client
+    assert fairly._read_config.cache_info().misses == misses
+
+    # Modified configuration file is read again without reloading
+    _write("second")
+    assert fairly.get_config("zenodo")["token"] == "second"
+    client = fairly.client("zenodo")
+    assert client.config["token"] == "second"
+
+    # Modification time is checked if the size is not changed
+    _write("thirds")
+    stat = os.stat(user_config)
+    os.utime(user_config, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert fairly.client("zenodo").config["token"] == "thirds"
+
+
+def test_config_environ(user_config, monkeypatch):
+    monkeypatch.setenv("FAIRLY_ZENODO_TOKEN", "first")
+    fairly.reload_config()
+    client = fairly.client("zenodo")
+    assert client.config["token"] == "first"
+
+    # Environmental variables are read once
+    monkeypatch.setenv("FAIRLY_ZENODO_TOKEN", "second")
+    assert fairly.get_config("zenodo")["token"] == "first"
+    assert fairly.client("zenodo") is client
+
+    # Modified environmental variables are read if the configuration is reloaded
+    fairly.reload_config()
+    assert fairly.get_config("zenodo")["token"] == "second"
+    assert fairly.client("zenodo").config["token"] == "second"
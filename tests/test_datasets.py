@@ -0,0 +1,102 @@
+import pytest
+
+import fairly
+from server import get_api_url
+
+# Dataset identifiers of the recognized repositories by repository
+IDS = {
+    "zenodo": ["10.5281/zenodo.1", "https://zenodo.org/records/2"],
+    "figshare": ["10.6084/m9.figshare.3", "https://figshare.com/articles/dataset/title/4"],
+}
+
+
+@pytest.fixture
+def shared_clients(mock_server):
+    """Connect shared clients of the recognized repositories to a mock server"""
+    server = mock_server(datasets=4)
+    fairly.clear_clients()
+    for repository_id in IDS:
+        client = fairly.client(repository_id)
+        client.RETRY_SLEEP = 0.01
+        client.config["api_url"] = get_api_url(server.url, repository_id)
+    yield server
+    fairly.clear_clients()
+
+
+def test_resolve_dataset_id(tmp_path):
+    # Dataset URL address is kept instead of the repository URL address
+    assert fairly._resolve_dataset_id("https://zenodo.org/records/2") == ("zenodo", {"url": "https://zenodo.org/records/2"})
+    assert fairly._resolve_dataset_id("10.5281/zenodo.1") == ("zenodo", {"doi": "10.5281/zenodo.1"})
+    assert fairly._resolve_dataset_id("10.4121/12345") == ("4tu", {"doi": "10.4121/12345"})
+    assert fairly._resolve_dataset_id(str(tmp_path)) == (None, {"path": str(tmp_path)})
+
+    with pytest.raises(ValueError):
+        fairly._resolve_dataset_id("10.1234/unknown")
+    with pytest.raises(ValueError):
+        fairly._resolve_dataset_id("https://unknown.org/records/2")
+
+
+@pytest.mark.parametrize("repository_id, id", [(repository_id, id) for repository_id, ids in IDS.items() for id in ids])
+def test_dataset(shared_clients, repository_id, id):
+    dataset = fairly.dataset(id)
+    assert dataset.client is fairly.client(repository_id)
+    assert dataset.id["id"] == id[-1]
+    assert dataset.title == shared_clients.get_dataset(int(id[-1]))["title"]
+
+
+@pytest.mark.parametrize("doi, id", [
+    ("10.5281/zenodo.6026285", "6026285"),
+    ("10.5281/ZENODO.12", "12"),
+    ("https://doi.org/10.5281/zenodo.7", "7"),
+])
+def test_zenodo_doi(doi, id):
+    assert fairly.client("zenodo").get_dataset_id(doi=doi) == {"id": id}
+
+
+def test_zenodo_doi_invalid():
+    with pytest.raises(NotImplementedError):
+        fairly.client("zenodo").get_dataset_id(doi="10.5281/zenodo.6026285.v2")
+
+
+def test_datasets(shared_clients, monkeypatch):
+    created = []
+    create_client = fairly.client
+    def _client(id, **kwargs):
+        created.append(id)
+        return create_client(id, **kwargs)
+    monkeypatch.setattr(fairly, "client", _client)
+
+    ids = [id for items in IDS.values() for id in items]
+    invalid = ["10.1234/unknown", "https://zenodo.org/records/99"]
+    results = {id: (dataset, error) for id, dataset, error in fairly.datasets(ids + invalid, workers=4)}
+    assert set(results) == set(ids + invalid)
+
+    # A single client is used for each repository
+    assert sorted(created) == sorted(IDS)
+    for repository_id, items in IDS.items():
+        for id in items:
+            dataset, error = results[id]
+            assert error is None
+            assert dataset.client is create_client(repository_id)
+            assert dataset.metadata["title"] == shared_clients.get_dataset(int(id[-1]))["title"]
+
+    # Errors are yielded without stopping the other retrievals
+    for id in invalid:
+        dataset, error = results[id]
+        assert dataset is None
+        assert isinstance(error, ValueError)
+
+
+def test_dataset_shared(shared_clients):
+    id = shared_clients.add_dataset({"file.txt": b"content"}, "Title")
+    dataset = fairly.dataset(f"https://zenodo.org/records/{id}")
+    assert dataset.title == "Title"
+
+    # Shared dataset object keeps the retrieved details
+    shared_clients.get_dataset(id)["title"] = "Modified"
+    assert fairly.dataset(f"10.5281/zenodo.{id}") is dataset
+    assert dataset.title == "Title"
+
+    # Dataset is retrieved again if refreshed
+    dataset = fairly.client("zenodo").get_dataset(str(id), refresh=True)
+    assert dataset.title == "Modified"
@@ -0,0 +1,178 @@
+import os
+import json
+import pytest
+import requests
+
+from fairly.metrics import RequestMetrics
+
+# Size of the downloaded files and their byte ranges
+FILE_SIZE = 2**20
+PART_SIZE = 2**16
+
+
+def get_remote_file(client, id: str="1"):
+    return list(client.get_dataset(id=id).files.values())[0]
+
+
+def download_file(client, file, path, **kwargs):
+    """Downloads a file and returns the local file and the number of received bytes"""
+    with RequestMetrics() as metrics:
+        local_file = client.download_file(file, str(path), **kwargs)
+    return local_file, sum(stats["bytes_received"] for stats in metrics.get_summary().values())
+
+
+def test_download_ranges(mock_server, mock_client, tmp_path, request_threads):
+    server = mock_server(datasets=1, files=1, file_size=FILE_SIZE)
+    client = mock_client(server, PART_SIZE=PART_SIZE)
+    file = get_remote_file(client)
+
+    server.reset_stats()
+    local_file = client.download_file(file, str(tmp_path), connections=4)
+    assert local_file.md5 == file.md5
+    # One HEAD request and a GET request for each range
+    assert server.stats["requests"] == 1 + FILE_SIZE // PART_SIZE
+    assert os.listdir(tmp_path) == [file.name]
+    # Ranges are downloaded over multiple connections
+    assert len(request_threads) > 1
+
+
+@pytest.mark.parametrize("failure_rate, drop_rate", [(0.2, 0), (0, 0.2)])
+def test_download_ranges_retry(mock_server, mock_client, tmp_path, failure_rate, drop_rate):
+    server = mock_server(datasets=1, files=1, file_size=FILE_SIZE, seed=1)
+    client = mock_client(server, PART_SIZE=PART_SIZE)
+    file = get_remote_file(client)
+
+    server.failure_rate = failure_rate
+    server.drop_rate = drop_rate
+    server.reset_stats()
+    local_file, size = download_file(client, file, tmp_path, connections=4)
+    assert local_file.md5 == file.md5
+    assert server.stats["failures"] + server.stats["drops"] > 0
+    # Failed ranges are requested again without downloading the completed ones
+    assert size == FILE_SIZE
+
+
+def test_download_stream_retry(mock_server, mock_client, tmp_path):
+    server = mock_server(datasets=1, files=1, file_size=FILE_SIZE, seed=1)
+    client = mock_client(server, PART_SIZE=PART_SIZE)
+    file = get_remote_file(client)
+
+    server.failure_rate = 0.5
+    local_file = client.download_file(file, str(tmp_path), connections=1)
+    assert local_file.md5 == file.md5
+
+
+def test_download_ranges_failure(mock_server, mock_client, tmp_path):
+    server = mock_server(datasets=1, files=1, file_size=FILE_SIZE)
+    client = mock_client(server, PART_SIZE=PART_SIZE)
+    client.RETRY_TRIES = 2
+    file = get_remote_file(client)
+
+    def _notify(file, current_size):
+        # Fail remaining requests after a few ranges are downloaded
+        if current_size >= 4 * PART_SIZE:
+            server.failure_rate = 1
+
+    with pytest.raises(requests.HTTPError):
+        client.download_file(file, str(tmp_path), notify=_notify, connections=2)
+
+    # Completed ranges are kept to resume the download
+    partpath = os.path.join(tmp_path, f"{file.name}.part")
+    with open(f"{partpath}.json", "r") as stream:
+        state = json.load(stream)
+    assert sum(part[2] for part in state["parts"]) >= 4 * PART_SIZE
+    assert not os.path.isfile(os.path.join(tmp_path, file.name))
+
+
+def write_partial_download(server, file, path, size: int, state: dict=None) -> str:
+    partpath = os.path.join(path, f"{file.name}.part")
+    with open(partpath, "wb") as stream:
+        stream.write(server.content[:size])
+    if state is None:
+        state = {"url": file.url, "size": FILE_SIZE, "md5": file.md5, "ranged": False, "parts": [[0, None, size]]}
+    with open(f"{partpath}.json", "w") as stream:
+        json.dump(state, stream)
+    return partpath
+
+
+def test_download_resume(mock_server, mock_client, tmp_path):
+    server = mock_server(datasets=1, files=1, file_size=FILE_SIZE)
+    client = mock_client(server, PART_SIZE=PART_SIZE)
+    client.RETRY_TRIES = 2
+    file = get_remote_file(client)
+
+    def _notify(file, current_size):
+        if current_size >= FILE_SIZE // 2:
+            server.failure_rate = 1
+
+    with pytest.raises(requests.HTTPError):
+        client.download_file(file, str(tmp_path), notify=_notify, connections=2, resume=True)
+
+    # Incomplete ranges are resumed without downloading the completed ones again
+    server.failure_rate = 0
+    local_file, size = download_file(client, file, tmp_path, connections=2, resume=True)
+    assert local_file.md5 == file.md5
+    assert size <= FILE_SIZE // 2
+    assert os.listdir(tmp_path) == [file.name]
+
+    # Verified file is not downloaded again
+    server.reset_stats()
+    local_file = client.download_file(file, str(tmp_path), resume=True)
+    assert local_file.md5 == file.md5
+    assert server.stats["requests"] == 0
+
+
+def test_download_resume_stream(mock_server, mock_client, tmp_path):
+    server = mock_server(datasets=1, files=1, file_size=FILE_SIZE)
+    client = mock_client(server, PART_SIZE=PART_SIZE)
+    file = get_remote_file(client)
+    write_partial_download(server, file, tmp_path, FILE_SIZE // 4)
+
+    local_file, size = download_file(client, file, tmp_path, connections=1, resume=True)
+    assert local_file.md5 == file.md5
+    assert size == FILE_SIZE - FILE_SIZE // 4
+    assert os.listdir(tmp_path) == [file.name]
+
+
+@pytest.mark.parametrize("key, val", [("size", FILE_SIZE // 2), ("md5", "0" * 32), ("url", "http://localhost/files/0")])
+def test_download_resume_invalid_state(mock_server, mock_client, tmp_path, key, val):
+    server = mock_server(datasets=1, files=1, file_size=FILE_SIZE)
+    client = mock_client(server, PART_SIZE=PART_SIZE)
+    file = get_remote_file(client)
+    state = {"url": file.url, "size": FILE_SIZE, "md5": file.md5, "ranged": False, "parts": [[0, None, FILE_SIZE // 4]]}
+    state[key] = val
+    write_partial_download(server, file, tmp_path, FILE_SIZE // 4, state)
+
+    # Partial download of a different file is not resumed
+    local_file, size = download_file(client, file, tmp_path, connections=1, resume=True)
+    assert local_file.md5 == file.md5
+    assert size == FILE_SIZE
+    assert os.listdir(tmp_path) == [file.name]
+
+
+def test_download_resume_corrupted(mock_server, mock_client, tmp_path):
+    server = mock_server(datasets=1, files=1, file_size=FILE_SIZE)
+    client = mock_client(server, PART_SIZE=PART_SIZE)
+    file = get_remote_file(client)
+    partpath = write_partial_download(server, file, tmp_path, FILE_SIZE // 4)
+    with open(partpath, "r+b") as stream:
+        stream.write(b"corrupted")
+
+    # Corrupted partial download fails the checksum and is removed
+    with pytest.raises(IOError, match="Invalid MD5 checksum"):
+        client.download_file(file, str(tmp_path), connections=1, resume=True)
+    assert os.listdir(tmp_path) == []
+
+    local_file = client.download_file(file, str(tmp_path), connections=1, resume=True)
+    assert local_file.md5 == file.md5
+
+
+def test_store_concurrent(mock_server, mock_client, tmp_path, request_threads):
+    server = mock_server(datasets=1, files=8, file_size=PART_SIZE, latency=0.01)
+    client = mock_client(server, PART_SIZE=PART_SIZE)
+    dataset = client.get_dataset(id="1")
+
+    local_dataset = dataset.store(str(tmp_path / "dataset"), workers=4)
+    assert {name: file.md5 for name, file in local_dataset.files.items()} == {name: file.md5 for name, file in dataset.files.items()}
+    # Files are downloaded by multiple workers
+    assert len(request_threads) > 1
@@ -0,0 +1,189 @@
+import os
+import re
+import csv
+import hashlib
+import pytest
+
+from fairly.dataset.local import LocalDataset, RuleMatcher
+
+
+def create_dataset(path, count: int=5):
+    md5s = {}
+    for i in range(count):
+        content = f"file_{i}".encode()
+        with open(os.path.join(path, f"file_{i}.txt"), "wb") as file:
+            file.write(content)
+        md5s[f"file_{i}.txt"] = hashlib.md5(content).hexdigest()
+
+    dataset = LocalDataset(str(path))
+    dataset.includes.append("*.txt")
+    dataset.save_files()
+
+    return dataset, md5s
+
+
+def read_md5_rows(path):
+    with open(os.path.join(path, LocalDataset.MD5_FILE), "r", newline="") as file:
+        return list(csv.reader(file))
+
+
+def test_md5_cache(tmp_path):
+    dataset, md5s = create_dataset(tmp_path)
+    assert {name: file.md5 for name, file in dataset.files.items()} == md5s
+
+    # Hashes are stored without saving the cache explicitly
+    dataset = LocalDataset(str(tmp_path))
+    assert {name: md5 for name, (_, _, md5) in dataset._read_md5s().items()} == md5s
+    for file in dataset.files.values():
+        assert file._md5 == md5s[file.path]
+
+
+def test_md5_cache_modified(tmp_path):
+    dataset, md5s = create_dataset(tmp_path)
+    for file in dataset.files.values():
+        file.md5
+
+    with open(os.path.join(tmp_path, "file_0.txt"), "wb") as file:
+        file.write(b"modified")
+
+    # Cached hash of a modified file is not used
+    dataset = LocalDataset(str(tmp_path))
+    file = dataset.files["file_0.txt"]
+    assert file._md5 is None
+    assert file.md5 == hashlib.md5(b"modified").hexdigest()
+
+    dataset = LocalDataset(str(tmp_path))
+    assert dataset._read_md5s()["file_0.txt"][2] == hashlib.md5(b"modified").hexdigest()
+
+
+def test_md5_cache_save(tmp_path):
+    dataset, md5s = create_dataset(tmp_path)
+    dataset.compute_checksums()
+    with open(os.path.join(tmp_path, "file_0.txt"), "wb") as file:
+        file.write(b"modified")
+    dataset.get_files(refresh=True)["file_0.txt"].md5
+    assert len(read_md5_rows(tmp_path)) == len(md5s) + 1
+
+    # Saved cache file has a single row for each file
+    dataset.save_md5s()
+    rows = read_md5_rows(tmp_path)
+    assert sorted(row[0] for row in rows) == sorted(md5s)
+
+
+def test_md5_cache_readonly(tmp_path, monkeypatch):
+    dataset, md5s = create_dataset(tmp_path)
+    md5path = os.path.join(tmp_path, LocalDataset.MD5_FILE)
+    open(md5path, "w").close()
+
+    # REMARK: Permissions are not checked for root, therefore writes are rejected explicitly
+    _open = open
+    def _readonly_open(file, mode="r", *args, **kwargs):
+        if str(file) == md5path and mode != "r":
+            raise PermissionError(file)
+        return _open(file, mode, *args, **kwargs)
+    def _mkstemp(*args, **kwargs):
+        raise PermissionError(kwargs.get("dir"))
+    monkeypatch.setattr("builtins.open", _readonly_open)
+    monkeypatch.setattr("tempfile.mkstemp", _mkstemp)
+
+    # Hashes are computed and kept in memory if the cache file cannot be written
+    files = dataset.compute_checksums()
+    assert {name: file.md5 for name, file in files.items()} == md5s
+    dataset.save_md5s()
+    assert {name: md5 for name, (_, _, md5) in dataset._md5s.items()} == md5s
+    assert os.path.getsize(md5path) == 0
+
+
+def match_rule(name: str, rule: str) -> bool:
+    # Previous implementation of the rule matching as reference
+    regexps = []
+    for part in os.path.split(rule):
+        if part:
+            pattern = re.escape(part).replace("\\*", ".*").replace("\\?", ".")
+            regexps.append(re.compile(f"^{pattern}$", re.IGNORECASE))
+        else:
+            regexps.append(None)
+    for i, part in enumerate(os.path.split(name)):
+        if part:
+            if not regexps[i] or not regexps[i].match(part):
+                return False
+        elif regexps[i]:
+            return False
+    return True
+
+
+RULES = [
+    "*", "*.txt", "*.TXT", "file_?.txt", "*_1.*", "data/*", "data/*.csv", "DATA/*.CSV",
+    "data/*/*", "data/*/*.csv", "*/*.csv", "*/*", "d?ta/*", "data*/*", "data/sub*/*.txt",
+    "data/sub/", "file.txt", "data/sub/file_1.txt",
+]
+
+PATHS = [
+    "file.txt", "FILE.TXT", "file_1.txt", "file_10.txt", "table.csv", "data", "data/table.csv",
+    "data/file.txt", "Data/Table.CSV", "data/sub/table.csv", "data/sub/file_1.txt",
+    "data/sub/deep/table.csv", "data2/table.csv", "dota/file.txt", "other/file_1.csv",
+]
+
+
+@pytest.mark.parametrize("rule", RULES)
+def test_rule_matcher(rule):
+    matcher = RuleMatcher([rule])
+    for path in PATHS:
+        assert matcher.match(path) == match_rule(path, rule), path
+
+
+def test_rule_matcher_combined():
+    matcher = RuleMatcher(RULES[1:])
+    for path in PATHS:
+        assert matcher.match(path) == any(match_rule(path, rule) for rule in RULES[1:]), path
+
+
+def test_rule_matcher_archive():
+    # Extracted archive items are matched literally
+    matcher = RuleMatcher([{"archive.zip": ["data/table[1].csv", "file_*.txt"]}])
+    assert matcher.match("data/table[1].csv")
+    assert matcher.match("DATA/TABLE[1].CSV")
+    assert matcher.match("file_*.txt")
+    assert not matcher.match("file_1.txt")
+    assert not matcher.match("data/table1.csv")
+
+
+@pytest.mark.parametrize("includes, excludes, pruned", [
+    (["*"], [], ["data", "data2", "other"]),
+    (["*/*"], ["*.bin"], []),
+    (["data/*.csv"], [], ["data2", "other"]),
+    (["data/*/*"], ["data/sub/*.txt"], ["data2", "other"]),
+    (["*.txt", "data*/*"], ["data/sub*/*"], ["data/sub", "other"]),
+    (["d?ta/*", "other/*/*"], ["*/*.csv"], []),
+])
+def test_rule_matcher_files(tmp_path, monkeypatch, includes, excludes, pruned):
+    paths = [
+        "file.txt", "file.bin", "data/table.csv", "data/file.txt", "data/sub/table.csv",
+        "data/sub/file.txt", "data/sub/deep/file.txt", "data2/file.bin", "other/sub/file.txt",
+    ]
+    for path in paths:
+        os.makedirs(os.path.join(tmp_path, os.path.dirname(path)), exist_ok=True)
+        with open(os.path.join(tmp_path, path), "w") as file:
+            file.write(path)
+
+    dataset = LocalDataset(str(tmp_path))
+    dataset.includes.extend(includes)
+    dataset.excludes.extend(excludes)
+
+    scanned = []
+    scandir = os.scandir
+    def _scandir(path):
+        scanned.append(os.path.relpath(path, tmp_path))
+        return scandir(path)
+    monkeypatch.setattr(os, "scandir", _scandir)
+
+    # Files are the same as matching all files with the previous implementation
+    expected = [
+        path for path in paths
+        if any(match_rule(path, rule) for rule in includes) and not any(match_rule(path, rule) for rule in excludes)
+    ]
+    assert sorted(dataset.files) == sorted(expected)
+
+    # Directories that cannot contain matching files are not walked
+    dirs = [".", "data", "data/sub", "data/sub/deep", "data2", "other", "other/sub"]
+    assert sorted(scanned) == [dir for dir in dirs if not any(dir == path or dir.startswith(f"{path}/") for path in pruned)]
@@ -0,0 +1,86 @@
+import time
+import pytest
+import requests
+from email.utils import formatdate
+
+from fairly.ratelimit import RateLimiter, get_rate_limiter, get_retry_after
+
+
+def test_retry_after():
+    assert get_retry_after({}) is None
+    assert get_retry_after({"Retry-After": "30"}) == 30
+    assert get_retry_after({"Retry-After": "-5"}) == 0
+    assert get_retry_after({"Retry-After": "invalid"}) is None
+
+    # HTTP dates are converted to the waiting times
+    assert 25 < get_retry_after({"Retry-After": formatdate(time.time() + 30, usegmt=True)}) <= 30
+    assert get_retry_after({"Retry-After": formatdate(time.time() - 30, usegmt=True)}) == 0
+
+
+def test_rate_limiter():
+    limiter = RateLimiter()
+    assert limiter.reserve() == 0
+
+    # Requests are not delayed while there are remaining requests
+    limiter.update({"X-RateLimit-Remaining": "3", "X-RateLimit-Reset": str(time.time() + 10)})
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == 0
+
+    # Requests are delayed until the reset time if the remaining requests are reserved
+    assert 9 < limiter.reserve() <= 10
+    assert 9 < limiter.reserve() <= 10
+
+
+@pytest.mark.parametrize("headers, status_code, delay", [
+    # Reset time in seconds to reset
+    ({"RateLimit-Remaining": "0", "RateLimit-Reset": "20"}, 200, 20),
+    # Retry-After of a rejected request
+    ({"Retry-After": "15"}, 429, 15),
+    # Reset time has priority over Retry-After
+    ({"X-RateLimit-Reset": "5", "Retry-After": "15"}, 429, 5),
+    # Waiting time is limited
+    ({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(10**6)}, 200, RateLimiter.MAX_SLEEP),
+])
+def test_rate_limiter_update(headers, status_code, delay):
+    limiter = RateLimiter()
+    limiter.update(headers, status_code)
+    assert delay - 1 < limiter.reserve() <= delay
+
+
+def test_rate_limiter_expired():
+    limiter = RateLimiter()
+    limiter.update({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(time.time() + 10)})
+
+    # Rate limit is cleared if the reset time is passed
+    limiter.update({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(time.time() - 10)})
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == 0
+
+
+def test_rate_limit_server(mock_server, mock_client):
+    server = mock_server(datasets=1, rate_limit=5, rate_window=1)
+    client = mock_client(server)
+
+    # Requests are delayed by the client instead of being rejected by the server
+    start = time.perf_counter()
+    for _ in range(12):
+        client._request("records/1")
+    assert server.stats["throttled"] == 0
+    assert time.perf_counter() - start > 1
+
+
+def test_rate_limit_rejected(mock_server, mock_client):
+    server = mock_server(datasets=1, rate_limit=5, rate_window=1)
+    client = mock_client(server)
+    url = f"{client.config['api_url']}records/1"
+
+    # Exhaust the rate limit without the client noticing
+    while requests.get(url).status_code != 429:
+        pass
+
+    # Rejected request is retried after the rate limit window
+    server.reset_stats()
+    content, response = client._request("records/1")
+    assert response.status_code == 200
+    assert server.stats["throttled"] == 1
+    assert get_rate_limiter(client.config["api_url"]).reserve() == 0
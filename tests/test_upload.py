@@ -0,0 +1,92 @@
+import os
+import hashlib
+import pytest
+import requests
+
+import fairly
+
+# Size of the uploaded files and the Figshare upload parts
+FILE_SIZE = 2**18
+PART_SIZE = 2**16
+
+METADATA = {
+    "title": "My fairly test",
+    "type": "dataset",
+    "authors": ["Doe, John"],
+    "description": "My test description",
+    "access_type": "open",
+}
+
+LICENSES = {
+    "zenodo": "CC-BY-4.0",
+    "figshare": "CC BY 4.0",
+}
+
+
+def create_local_dataset(path, client_id: str, count: int):
+    files = {}
+    for i in range(count):
+        content = bytes((i + j) % 256 for j in range(256)) * (FILE_SIZE // 256)
+        with open(os.path.join(path, f"file_{i}.bin"), "wb") as file:
+            file.write(content)
+        files[f"file_{i}.bin"] = hashlib.md5(content).hexdigest()
+
+    dataset = fairly.dataset(str(path))
+    dataset.set_metadata(**METADATA, license=LICENSES[client_id])
+    dataset.save_metadata()
+    dataset.includes.extend(files)
+    dataset.save_files()
+
+    return dataset, files
+
+
+def test_figshare_upload_part_retry(mock_server, mock_client, tmp_path):
+    # Fail part uploads only
+    server = mock_server(datasets=0, part_size=PART_SIZE, failure_rate=0.5, fault_pattern=r"^/upload/\w+/\d+$", seed=1)
+    client = mock_client(server, "figshare")
+    client.PART_TRIES = 10
+    local_dataset, md5s = create_local_dataset(tmp_path, "figshare", 2)
+
+    dataset = local_dataset.upload(client, workers=1)
+    assert {name: file.md5 for name, file in dataset.files.items()} == md5s
+    assert server.stats["failures"] > 0
+
+
+def test_zenodo_upload_retry(mock_server, mock_client, tmp_path):
+    # Reject file uploads only
+    server = mock_server(datasets=0, failure_rate=0.5, fault_pattern=r"^/zenodo/api/deposit/depositions/\d+/files$", seed=1)
+    client = mock_client(server, "zenodo", RETRY_TRIES=10)
+    local_dataset, md5s = create_local_dataset(tmp_path, "zenodo", 4)
+
+    # Rejected uploads are sent again with a new stream
+    dataset = local_dataset.upload(client, workers=1)
+    assert {name: file.md5 for name, file in dataset.files.items()} == md5s
+    assert server.stats["failures"] > 0
+
+
+def test_zenodo_upload_rate_limit(mock_server, mock_client, tmp_path):
+    server = mock_server(datasets=0, rate_limit=5, rate_window=1)
+    client = mock_client(server, "zenodo")
+    local_dataset, md5s = create_local_dataset(tmp_path, "zenodo", 1)
+    dataset = client.create_dataset(local_dataset.metadata)
+
+    # Exhaust the rate limit without the client noticing
+    while requests.get(f"{client.config['api_url']}licenses").status_code != 429:
+        pass
+
+    server.reset_stats()
+    remote_file = client.upload_file(dataset, local_dataset.files["file_0.bin"])
+    assert remote_file.md5 == md5s["file_0.bin"]
+    assert server.stats["throttled"] == 1
+
+
+@pytest.mark.parametrize("client_id", ["zenodo", "figshare"])
+def test_upload_files_concurrent(mock_server, mock_client, tmp_path, request_threads, client_id):
+    server = mock_server(datasets=0, part_size=PART_SIZE, latency=0.01)
+    client = mock_client(server, client_id)
+    local_dataset, md5s = create_local_dataset(tmp_path, client_id, 8)
+
+    dataset = local_dataset.upload(client, workers=4)
+    assert {name: file.md5 for name, file in dataset.files.items()} == md5s
+    # Files are uploaded by multiple workers
+    assert len(request_threads) > 1